@@ -1,269 +1,72 @@
 import os
 import zipfile
 import json
-import re # 단순 검색에는 필요 없지만, 나중을 위해 남겨둘 수 있음
 import random
 import csv
+import time
 from collections import defaultdict
 import logging
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-# 📌 API 카테고리별 목록 정의 (summary.csv 용도 - 실제 코드 검색 패턴 포함)
-# 이 목록은 extract_api_counts 함수에서 사용됨
-API_CATEGORIES = {
-    "Clipboard": [
-        "navigator.clipboard.readText",
-        "navigator.clipboard.writeText",
-        "document.execCommand('paste')",
-        "document.execCommand('copy')"
-    ],
-    "Downloads": [
-        "chrome.downloads.download",
-        "chrome.downloads.search",
-        "chrome.downloads.open",
-        "chrome.downloads.erase",
-        "chrome.downloads.removeFile"
-    ],
-    "Storage": [
-        "chrome.storage.local.get",
-        "chrome.storage.local.set",
-        "chrome.storage.sync.get",
-        "chrome.storage.sync.set",
-        "indexedDB.open",
-        "localStorage.setItem",
-        "sessionStorage.getItem",
-        "navigator.storage.persist"
-    ],
-    "Tabs": [
-        "chrome.tabs.create",
-        "chrome.tabs.query",
-        "chrome.tabs.update",
-        "chrome.tabs.get",
-        "chrome.tabs.remove",
-        "chrome.tabs.executeScript",
-        "chrome.tabs.onUpdated.addListener",
-        "chrome.tabs.onActivated.addListener",
-        "chrome.tabs.captureVisibleTab"
-    ],
-    "Scripting": [
-        "chrome.scripting.executeScript",
-        "chrome.scripting.insertCSS",
-        "chrome.scripting.removeCSS",
-        "chrome.scripting.registerContentScripts"
-    ],
-    "Identity": [
-        "chrome.identity.getAuthToken",
-        "chrome.identity.getProfileUserInfo",
-        "chrome.identity.launchWebAuthFlow"
-    ],
-    "WebRequest": [
-        "chrome.webRequest.onBeforeRequest",
-        "chrome.webRequest.onHeadersReceived",
-        "chrome.webRequest.onCompleted"
-    ],
-    "Bookmarks": [
-        "chrome.bookmarks.create",
-        "chrome.bookmarks.get",
-        "chrome.bookmarks.search",
-        "chrome.bookmarks.update",
-        "chrome.bookmarks.remove"
-    ],
-    "History": [
-        "chrome.history.search",
-        "chrome.history.addUrl",
-        "chrome.history.deleteUrl",
-        "chrome.history.deleteAll"
-    ],
-    "Alarms": [
-        "chrome.alarms.create",
-        "chrome.alarms.get",
-        "chrome.alarms.clear",
-        "chrome.alarms.onAlarm.addListener"
-    ],
-    "Notifications": [
-        "chrome.notifications.create",
-        "chrome.notifications.update",
-        "chrome.notifications.clear",
-        "chrome.notifications.onClicked.addListener"
-    ],
-    "Context Menus": [
-        "chrome.contextMenus.create",
-        "chrome.contextMenus.update",
-        "chrome.contextMenus.remove",
-        "chrome.contextMenus.onClicked.addListener"
-    ],
-    "File System": [
-        "document.querySelector",
-        "file.name",
-        "file.type",
-        "file.size",
-        "file.lastModified",
-        "new Blob",
-        "FileReader.readAsText",
-        "FileReader.readAsDataURL",
-        "FileReader.readAsArrayBuffer",
-        "window.requestFileSystem",
-        "fileEntry.createWriter",
-        "indexedDB.transaction",
-        "store.put",
-        "localStorage.getItem",
-        "sessionStorage.setItem",
-        "document.cookie",
-        "Element.requestPointerLock"
-    ],
-    "Network": [
-        "fetch",
-        "new XMLHttpRequest",
-        "new WebSocket",
-        "navigator.sendBeacon",
-        "new RTCPeerConnection",
-        "chrome.proxy.settings.set",
-        "chrome.dns.resolve",
-        "chrome.mdns.onServiceList",
-        "chrome.signedInDevices.get"
-    ],
-    "Rendering": [
-        "document.createElement",
-        "document.appendChild",
-        "element.innerHTML",
-        "document.getElementById",
-        "element.style",
-        "new MutationObserver",
-        "setTimeout",
-        "setInterval",
-        "canvas.getContext",
-        "CanvasRenderingContext2D.drawImage",
-        "document.designMode",
-        "shadowRoot.attachShadow",
-        "window.open",
-        "chrome.windows.create",
-        "chrome.declarativeContent.onPageChanged"
-    ],
-    "User Interaction": [
-        "addEventListener",
-        "document.onmousemove",
-        "document.onkeypress",
-        "document.onkeydown",
-        "window.onbeforeunload",
-        "chrome.permissions.request",
-        "window.alert",
-        "window.confirm",
-        "window.prompt",
-        "chrome.input.ime.onFocus",
-        "chrome.fileBrowserHandler.onExecute"
-    ]
-}
-# API 키워드 -> Category 매핑 (summary.csv 용도)
-API_TO_CATEGORY = {api: category for category, apis in API_CATEGORIES.items() for api in apis}
-
-
-# 📌 권한별 필요한 API 매핑 (검색 가능한 실제 API 패턴 위주로 정제)
-# 키: Manifest에 선언되는 실제 권한 이름
-# 값: 해당 권한 사용 시 코드에서 발견될 가능성이 높은 API 호출 패턴 (문자열) 리스트
-PERMISSION_TO_APIS = {
-    "activeTab": ["chrome.scripting.executeScript", "chrome.scripting.insertCSS", "chrome.tabs.captureVisibleTab"], # get/update는 tabs 권한과 겹침
-    "alarms": ["chrome.alarms."], # Prefix 사용
-    "bookmarks": ["chrome.bookmarks."],
-    "browsingData": ["chrome.browsingData."],
-    "clipboardRead": ["navigator.clipboard.readText", "document.execCommand('paste')"],
-    "clipboardWrite": ["navigator.clipboard.writeText", "document.execCommand('copy')"],
-    "commands": ["chrome.commands."],
-    "contentSettings": ["chrome.contentSettings."],
-    "contextMenus": ["chrome.contextMenus."],
-    "cookies": ["chrome.cookies."], # Host Permissions 필요
-    "debugger": ["chrome.debugger."],
-    "declarativeContent": ["chrome.declarativeContent."],
-    "declarativeNetRequest": ["chrome.declarativeNetRequest."],
-    "declarativeNetRequestWithHostAccess": ["chrome.declarativeNetRequest."],
-    "declarativeNetRequestFeedback": ["chrome.declarativeNetRequest."],
-    "desktopCapture": ["chrome.desktopCapture."],
-    "downloads": ["chrome.downloads."],
-    "history": ["chrome.history."],
-    "identity": ["chrome.identity."],
-    "idle": ["chrome.idle."],
-    "management": ["chrome.management."],
-    "nativeMessaging": ["chrome.runtime.connectNative", "chrome.runtime.sendNativeMessage"],
-    "notifications": ["chrome.notifications."],
-    "offscreen": ["chrome.offscreen."],
-    "pageCapture": ["chrome.pageCapture."],
-    "permissions": ["chrome.permissions."],
-    "power": ["chrome.power."],
-    "privacy": ["chrome.privacy."],
-    "processes": ["chrome.processes."],
-    "proxy": ["chrome.proxy."],
-    "pushMessaging": ["chrome.pushMessaging.", "PushManager."],
-    "scripting": ["chrome.scripting."], # Host Permissions 또는 activeTab 필요
-    "search": ["chrome.search."],
-    "sessions": ["chrome.sessions."],
-    "sidePanel": ["chrome.sidePanel."],
-    "storage": ["chrome.storage."], # 기본적인 storage API
-    "system.cpu": ["chrome.system.cpu."],
-    "system.display": ["chrome.system.display."],
-    "system.memory": ["chrome.system.memory."],
-    "system.storage": ["chrome.system.storage."],
-    "tabCapture": ["chrome.tabCapture."],
-    "tabGroups": ["chrome.tabGroups."],
-    "tabs": ["chrome.tabs."],
-    "topSites": ["chrome.topSites."],
-    "tts": ["chrome.tts."],
-    "ttsEngine": ["chrome.ttsEngine."],
-    # unlimitedStorage: 관련 스토리지 API 사용 시 제거 (아래 API들)
-    "unlimitedStorage": ["chrome.storage.local.", "indexedDB.", "navigator.storage.persist", "CacheStorage.", "caches."],#기존 storage 10MB 이상
-    "webNavigation": ["chrome.webNavigation."],
-    "webRequest": ["chrome.webRequest."], # Listener 추가/제거가 주 사용 형태
-    # Additional Permissions
-    "userScripts": ["chrome.userScripts."],
-    "mdns": ["chrome.mdns."],
-    "system.network": ["chrome.system.network."],
-    "certificateProvider": ["chrome.certificateProvider."],
-    "documentScan": ["chrome.documentScan."],
-    "pointerLock": ["requestPointerLock", "exitPointerLock"], # Element/document 메소드
-    "signedInDevices": ["chrome.signedInDevices."],
-    "usb": ["chrome.usb."],
-    "hid": ["chrome.hid."],
-    "serial": ["chrome.serial."],
-    "input": ["chrome.input.ime."],
-    "favicon": [], # 분석 대상 아님 (Known 처리용)
-    # Enterprise Specific
-    "enterprise.deviceAttributes": ["chrome.enterprise.deviceAttributes."],
-    "enterprise.hardwarePlatform": ["chrome.enterprise.hardwarePlatform."],
-    "enterprise.networkingAttributes": ["chrome.enterprise.networkingAttributes."],
-    "enterprise.platformKeys": ["chrome.enterprise.platformKeys."],
-    "platformKeys": ["chrome.platformKeys."],
-    # ChromeOS Specific
-    "fileBrowserHandler": ["chrome.fileBrowserHandler."],
-    "fileSystemProvider": ["chrome.fileSystemProvider."],
-    "loginState": ["chrome.loginState."],
-    "printerProvider": ["chrome.printerProvider."],
-    "vpnProvider": ["chrome.vpnProvider."],
-    "webAuthenticationProxy": ["chrome.webAuthenticationProxy."],
-    # Device Access
-    "geolocation": ["navigator.geolocation."], # Prefix 사용
-    # Deprecated
-    "gcm": ["chrome.gcm."],
-    "webRequestBlocking": ["chrome.webRequest."],
-
-    "background": [],
-}
-# 모든 검색 대상 API 패턴 생성 (중복 제거)
-ALL_SEARCH_PATTERNS = set()
-for patterns in PERMISSION_TO_APIS.values():
-    ALL_SEARCH_PATTERNS.update(p for p in patterns if p) # 빈 문자열 제외
+from archive_reader import ArchiveReader
+from manifest_scope import iter_scan_units, load_manifest
+from host_index import HOST_INDEX_FILE, HostIndex, load_host_index, write_host_index
+from member_plan import DEFAULT_MAX_INFLATED, DEFAULT_MAX_MEMBERS, plan_members
+from obfuscation import find_dynamic_apis, inspect_member
+from result_record import AnalysisRecord
+from rule_pack import compile_rules, load_rule_pack
+from shard_merge import build_aggregate, load_aggregate, merge_aggregates, missing_shards, parse_shard, shard_of, write_aggregate
+from triage import TIER_DEEP, TIER_MANIFEST, TriageCriteria, log_triage_report, triage_manifest, triage_report
+from watchdog_pool import DEFAULT_TIMEOUT, STATUS_OK, STATUS_TIMEOUT, WatchdogPool
+from wasm_inspector import inspect_wasm_member, summarize_wasm_modules
+
+# 📌 룰 팩 (rules/default.json 또는 EXTENSION_RULES 환경 변수로 지정한 파일)
+# API_CATEGORIES: summary.csv 용 카테고리별 API 목록 (실제 코드 검색 패턴 포함)
+# PERMISSION_TO_APIS: Manifest에 선언되는 권한 -> 해당 권한 사용 시 코드에서 발견될 가능성이 높은 API 호출 패턴
+# 매칭용 구조(API_TABLE, 패턴 -> 권한 역매핑)는 룰 fingerprint 별로 디스크에 캐시되어 있으면 그대로 사용
+# 룰 팩은 처음 분석/CSV 변환을 할 때 get_rules() 가 한 번 읽습니다 (import 만으로는 룰 파일/캐시를 건드리지 않음).
+class AnalysisRules:
+    """get_rules() 결과: 룰 팩, 매칭용 구조, detailed_analysis.csv 컬럼."""
+
+    def __init__(self, rules, compiled):
+        self.rules = rules
+        self.compiled = compiled
+        self.api_categories = rules.api_categories
+        self.permission_to_apis = rules.permission_to_apis
+        # API 키워드 -> Category 매핑 (summary.csv 용도)
+        self.api_to_category = {api: category for category, apis in rules.api_categories.items() for api in apis}
+        # API 키워드 -> 횟수 벡터 인덱스 (결과 레코드의 counts 용도)
+        self.api_table = compiled.api_table
+        # 모든 검색 대상 API 패턴 (중복 제거, 빈 문자열 제외)
+        self.search_patterns = set(compiled.search_patterns)
+        self.detailed_categories = list(rules.api_categories.keys()) + ["Unknown"]
+        self.detailed_header = [
+            "ZIP File", "Permissions (manifest)", "Over Permissions", "WASM Exist"
+        ] + self.detailed_categories + ["API Contexts", "WASM Modules", "WASM Imports", "WASM Exports", "WASM Code Size", "Scan Tier", "Obfuscated Members"]
 
 
-SAMPLE_RESULTS = []
+_RULES = None
+
+def get_rules():
+    """룰 팩을 처음 호출할 때 읽어 매칭용 구조를 만들고, 이후에는 같은 객체를 돌려줍니다."""
+    global _RULES
+    if _RULES is None:
+        rules = load_rule_pack()
+        _RULES = AnalysisRules(rules, compile_rules(rules))
+    return _RULES
+
+# 예전 모듈 전역 이름 (analyzer_extension.API_TABLE 등) → 처음 접근할 때 get_rules() 로 읽음
+_RULE_ATTRIBUTES = {"RULES": "rules", "COMPILED_RULES": "compiled", "API_CATEGORIES": "api_categories",
+                    "PERMISSION_TO_APIS": "permission_to_apis", "API_TO_CATEGORY": "api_to_category", "API_TABLE": "api_table",
+                    "ALL_SEARCH_PATTERNS": "search_patterns", "DETAILED_CATEGORIES": "detailed_categories",
+                    "DETAILED_HEADER": "detailed_header"}
+
+def __getattr__(name):
+    if name in _RULE_ATTRIBUTES:
+        return getattr(get_rules(), _RULE_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# 📌 API 사용 횟수 계산 함수 (summary.csv용)
-def extract_api_counts(content):
-    """주어진 content에서 API_CATEGORIES 키워드의 사용 횟수를 계산합니다."""
-    counts = defaultdict(int)
-    for api_keyword in API_TO_CATEGORY.keys(): # API_CATEGORIES의 키워드 사용
-        try:
-            count = content.count(api_keyword)
-            if count > 0: counts[api_keyword] += count
-        except Exception as e: logging.error(f"Error counting API '{api_keyword}': {e}"); continue
-    return counts
+
+SAMPLE_RESULTS = []
 
 # 📌 코드 내용에서 API 패턴 존재 여부 확인 함수 (Over-permission 분석용)
 def extract_apis_from_content(content, search_patterns):
@@ -288,16 +91,18 @@ def extract_permissions_from_manifest(content):
     """Manifest에서 모든 권한 목록과, PERMISSION_TO_APIS에 정의된 알려진 API 권한 목록을 추출합니다."""
     all_declared_permissions = []
     declared_known_api_permissions = set()
+    permission_to_apis = get_rules().permission_to_apis
     try:
         manifest = json.loads(content)
         permissions_in_manifest = set(manifest.get("permissions", []))
         host_permissions_in_manifest = set(manifest.get("host_permissions", []))
-        all_declared_permissions = list(permissions_in_manifest.union(host_permissions_in_manifest))
+        # 정렬해 두어야 실행(해시 시드)마다 순서가 달라지지 않음 → 샤드 merge 결과가 단일 실행과 동일
+        all_declared_permissions = sorted(permissions_in_manifest.union(host_permissions_in_manifest), key=str)
 
         # 알려진 최상위 API 권한만 필터링 (PERMISSION_TO_APIS의 키와 비교)
         for perm in permissions_in_manifest:
             # 호스트 권한 아니고, PERMISSION_TO_APIS의 키에 존재하면 추가
-            if not perm.startswith(('<', 'http:', 'https:', '*:', 'file:')) and perm in PERMISSION_TO_APIS:
+            if not perm.startswith(('<', 'http:', 'https:', '*:', 'file:')) and perm in permission_to_apis:
                  # 'favicon' 같이 분석 안 할 권한은 제외할 수도 있음 (여기서는 일단 포함시키되, PERMISSION_TO_APIS 값이 비어있음)
                  declared_known_api_permissions.add(perm)
 
@@ -323,74 +128,118 @@ def create_api_pattern_to_permission_map(permission_map):
     logging.debug(f"API Pattern -> Permissions map created with {len(api_to_perms)} entries.")
     return api_to_perms
 
+def error_record(zip_path, reason):
+    """분석 실패 시 결과 레코드 (permissions 칸에 "Error: <reason>" 표시)."""
+    return AnalysisRecord(os.path.basename(zip_path), [f"Error: {reason}"], [])
+
 # 📌 ZIP 파일 내 파일 검사 (Over-permission 분석 로직)
-def analyze_zip(zip_path, api_pattern_to_permission_map, all_search_patterns):
-    """개별 ZIP 파일을 분석하여 Over-permission을 찾습니다."""
+def analyze_zip(zip_path, api_pattern_to_permission_map, all_search_patterns, skip_unreferenced=False, scan_budget=None,
+                max_inflated=None, max_members=None, triage=None, obfuscation_check=True):
+    """개별 ZIP 파일을 분석하여 결과를 SAMPLE_RESULTS 에 추가하고 반환합니다."""
+    result = analyze_archive(zip_path, api_pattern_to_permission_map, all_search_patterns, skip_unreferenced, scan_budget,
+                             max_inflated, max_members, triage=triage, obfuscation_check=obfuscation_check)
+    SAMPLE_RESULTS.append(result)
+    return result
+
+def analyze_archive(zip_path, api_pattern_to_permission_map, all_search_patterns, skip_unreferenced=False, scan_budget=None,
+                    max_inflated=None, max_members=None, data=None, triage=None, obfuscation_check=True):
+    """개별 ZIP 파일을 분석하여 Over-permission을 찾고 결과 레코드를 반환합니다 (전역 상태 변경 없음).
+       멤버 수/압축 해제 총량이 한도를 넘으면 압축을 풀기 전에 "Error: TooLarge" 레코드를 반환합니다.
+       data(bytes)가 주어지면 디스크 대신 메모리 버퍼를 분석하고, zip_path 는 결과의 이름으로만 쓰입니다.
+       triage(TriageCriteria)가 주어지면 manifest 만 보고 조건에 해당하지 않는 아카이브는 스크립트 스캔 없이
+       (over_permissions=None, 판정하지 않음) tier 1 레코드로 반환합니다.
+       obfuscation_check 가 켜져 있으면 스크립트마다 바이트 통계로 난독화 여부를 보고, 의심되는 멤버만
+       동적 속성 접근 분석으로 숨겨진 API 패턴을 추가로 찾습니다 (API 횟수는 원문 기준 그대로)."""
+    started = time.perf_counter()
+    triage_info = None
     declared_permissions_all = []
     declared_known_api_permissions = set()
-    potential_over_permissions = set()
     found_api_patterns_in_code = set() # 전체 JS 파일에서 발견된 모든 API 패턴
-    api_counts = defaultdict(lambda: defaultdict(int))
+    api_table = get_rules().api_table
+    api_counts = api_table.new_counts() # API_TABLE 인덱스별 등장 횟수
+    api_contexts = defaultdict(set) # 실행 컨텍스트 -> 발견된 API 패턴
+    obfuscated = {} # 난독화 의심 스캔 단위 -> 사유/복원된 패턴
     wasm_exist = "X"
     manifest_found = False
+    manifest = {}
 
     try:
-        with zipfile.ZipFile(zip_path, 'r') as z:
-            # 1단계: Manifest 읽기
-            for name in z.namelist():
-                if name.startswith("__MACOSX/") or name.startswith("._") or name == ".DS_Store": continue
-                if name.lower().endswith("manifest.json"):
-                    manifest_found = True
-                    try:
-                        with z.open(name) as f:
-                            manifest_content = f.read().decode("utf-8", errors='replace')
-                            declared_permissions_all, declared_known_api_permissions = extract_permissions_from_manifest(manifest_content)
-                            potential_over_permissions = declared_known_api_permissions.copy() # 분석 시작점
-                            logging.info(f"Manifest read for {os.path.basename(zip_path)}. Known API permissions to check: {declared_known_api_permissions}")
-                            break
-                    except Exception as e: logging.error(f"Error reading manifest {name} in {zip_path}: {e}")
+        # manifest/스크립트/WASM 단계가 mmap 한 번, 중앙 디렉토리 파싱 한 번을 공유
+        with ArchiveReader(data if data is not None else zip_path) as z:
+            # 0단계: 멤버 목록을 한 번만 훑어 manifest/JS/HTML/WASM/skip 으로 분류
+            members = z.infolist()
+            if max_members is not None and len(members) > max_members:
+                logging.error(f"{zip_path} has {len(members)} members (limit {max_members}).")
+                return error_record(zip_path, "TooLarge")
+            plan = plan_members(members, scan_budget)
+            if max_inflated is not None and plan.total_size > max_inflated:
+                logging.error(f"{zip_path} inflates to {plan.total_size} bytes (limit {max_inflated}).")
+                return error_record(zip_path, "TooLarge")
+
+            # 1단계: 루트 Manifest 읽기
+            if plan.manifest is not None:
+                manifest_found = True
+                try:
+                    manifest_content = str(z.read(plan.manifest), "utf-8", errors='replace')
+                    declared_permissions_all, declared_known_api_permissions = extract_permissions_from_manifest(manifest_content)
+                    manifest = load_manifest(manifest_content)
+                    logging.info(f"Manifest read for {os.path.basename(zip_path)}. Known API permissions to check: {declared_known_api_permissions}")
+                except Exception as e: logging.error(f"Error reading manifest {plan.manifest.filename} in {zip_path}: {e}")
 
             if not manifest_found:
                  logging.warning(f"manifest.json not found in {zip_path}. Cannot perform over-permission analysis.")
                  # Manifest 없으면 결과에 에러 표시하고 반환
-                 SAMPLE_RESULTS.append({"zip": os.path.basename(zip_path), "permissions": ["Error: manifest.json not found"], "over_permissions": [], "wasm_exist": "X", "api_counts": {}})
-                 return
+                 return error_record(zip_path, "manifest.json not found")
+
+            # tier 1: manifest/멤버 목록만으로 깊은 스캔 필요 여부 판단
+            if triage is not None:
+                needs_deep_scan, reasons = triage_manifest(manifest, plan, triage)
+                triage_info = {"tier": TIER_DEEP if needs_deep_scan else TIER_MANIFEST, "reasons": reasons}
+                if not needs_deep_scan:
+                    logging.info(f"Triage: {os.path.basename(zip_path)} needs no deep scan.")
+                    triage_info["seconds"] = time.perf_counter() - started
+                    return AnalysisRecord(os.path.basename(zip_path), declared_permissions_all, None,
+                                          "O" if plan.wasm else "X", triage=triage_info)
+
+            # 2단계: manifest 진입점 기준으로 스크립트(JS/모듈/인라인 <script>) 분석 및 API 패턴 추출
+            logging.info(f"Scanning scripts in {os.path.basename(zip_path)}...")
+            wasm_modules = [inspect_wasm_member(z, info) for info in plan.wasm] # 모듈별 섹션/import/export 분석 결과 (CRC-32/크기 기준 캐시)
+            if plan.wasm: wasm_exist = "O"
 
-            # 2단계: JS 코드 분석 및 API 패턴 추출
-            logging.info(f"Scanning JS files in {os.path.basename(zip_path)}...")
             js_files_count = 0
-            for name in z.namelist():
-                if name.startswith("__MACOSX/") or name.startswith("._") or name == ".DS_Store" or name.lower().endswith("manifest.json"): continue
-                if name.endswith(".wasm"): wasm_exist = "O"
-
-                if name.endswith(".js"):
-                    js_files_count += 1
-                    logging.debug(f"Reading JS file: {name}")
-                    try:
-                        with z.open(name) as f:
-                            # 파일을 한번에 읽음 (메모리 사용량 주의)
-                            content = f.read().decode("utf-8", errors='replace')
-                            if not content: # 빈 파일 스킵
-                                logging.debug(f"Skipping empty JS file: {name}")
-                                continue
-
-                            # Over-permission 분석용 API 패턴 추출 (단순 포함 검색)
-                            patterns_in_file = extract_apis_from_content(content, all_search_patterns)
-                            if patterns_in_file:
-                                logging.debug(f"API patterns found in {name}: {patterns_in_file}")
-                                found_api_patterns_in_code.update(patterns_in_file) # 세트에 누적
-
-                            # API 카운트 (부가 정보)
-                            temp_api_counts = extract_api_counts(content)
-                            for api, count in temp_api_counts.items():
-                                category = API_TO_CATEGORY.get(api, "Unknown")
-                                api_counts[category][api] += count
-                    # 파일 읽기/디코딩 오류는 개별 파일에 대해 로깅하고 계속 진행
-                    except UnicodeDecodeError as ude:
-                        logging.warning(f"Unicode decode error in JS file {name}: {ude}. Skipping file content analysis.")
-                    except Exception as e:
-                        logging.error(f"Error reading or processing JS file {name} in {zip_path}: {e}")
-            logging.info(f"Finished scanning {js_files_count} JS files. Total unique API patterns found: {len(found_api_patterns_in_code)}")
+            unit_contexts = {} # 스캔 단위 -> 실행 컨텍스트 (iter_scan_units가 채움)
+            unit_patterns = {} # 스캔 단위 -> 발견된 API 패턴
+            for name, content, raw in iter_scan_units(z, plan, manifest, unit_contexts, skip_unreferenced):
+                js_files_count += 1
+                if not content: # 빈 파일 스킵
+                    logging.debug(f"Skipping empty script: {name}")
+                    continue
+                try:
+                    # Over-permission 분석용 API 패턴 추출 (단순 포함 검색)
+                    patterns_in_file = extract_apis_from_content(content, all_search_patterns)
+                    # 난독화 의심 멤버만 느린 2차 분석 (문자열 복원/대괄호 접근 정규화)
+                    flagged = inspect_member(raw) if obfuscation_check else None # 통계는 디코딩 전 원본 bytes 기준
+                    if flagged:
+                        reasons, _ = flagged
+                        recovered = find_dynamic_apis(content, all_search_patterns)
+                        logging.info(f"Obfuscated script {name} in {os.path.basename(zip_path)} ({', '.join(reasons)}), recovered {len(recovered)} API patterns.")
+                        patterns_in_file = patterns_in_file | recovered
+                        obfuscated[name] = {"reasons": reasons, "recovered": sorted(recovered)}
+                    if patterns_in_file:
+                        logging.debug(f"API patterns found in {name}: {patterns_in_file}")
+                        found_api_patterns_in_code.update(patterns_in_file) # 세트에 누적
+                        unit_patterns[name] = patterns_in_file
+
+                    # API 카운트 (부가 정보)
+                    api_table.count_into(content, api_counts)
+                except Exception as e:
+                    logging.error(f"Error processing script {name} in {zip_path}: {e}")
+
+            # 발견된 API 패턴을 실행 컨텍스트별로 묶음 (컨텍스트 전파가 끝난 뒤에 계산)
+            for name, patterns_in_file in unit_patterns.items():
+                for context in unit_contexts.get(name, ()):
+                    api_contexts[context].update(patterns_in_file)
+            logging.info(f"Finished scanning {js_files_count} script units. Total unique API patterns found: {len(found_api_patterns_in_code)}")
             logging.debug(f"All found API patterns: {found_api_patterns_in_code}")
 
             # 3단계: Over-permission 분석
@@ -405,7 +254,7 @@ def analyze_zip(zip_path, api_pattern_to_permission_map, all_search_patterns):
                     logging.debug(f"Pattern '{found_pattern}' requires permissions: {required_permissions}")
                     # 이 권한들이 원래 선언된 권한 목록에 있는지 확인
                     for req_perm in required_permissions:
-                        if req_perm in declared_known_api_permissions: # potential_over_permissions 대신 원래 선언된 목록과 비교
+                        if req_perm in declared_known_api_permissions: # 원래 선언된 목록과 비교
                             permissions_confirmed_used.add(req_perm)
                             logging.debug(f"Confirmed usage for permission: {req_perm}")
 
@@ -416,109 +265,298 @@ def analyze_zip(zip_path, api_pattern_to_permission_map, all_search_patterns):
 
     except zipfile.BadZipFile:
         logging.error(f"Failed to open zip file (BadZipFile): {zip_path}")
-        SAMPLE_RESULTS.append({"zip": os.path.basename(zip_path), "permissions": ["Error: BadZipFile"], "over_permissions": [], "wasm_exist": "X", "api_counts": {}})
-        return
+        return error_record(zip_path, "BadZipFile")
     except Exception as e:
         logging.error(f"An unexpected error occurred analyzing {zip_path}: {e}", exc_info=True)
-        SAMPLE_RESULTS.append({"zip": os.path.basename(zip_path), "permissions": [f"Error: {type(e).__name__}"], "over_permissions": [], "wasm_exist": "X", "api_counts": {}})
-        return
-
-    # 최종 결과 저장
-    SAMPLE_RESULTS.append({
-        "zip": os.path.basename(zip_path),
-        "permissions": declared_permissions_all, # Manifest의 모든 권한
-        "over_permissions": sorted(list(final_over_permissions)), # 최종 Over-permission 목록
-        "wasm_exist": wasm_exist,
-        "api_counts": dict(api_counts)
-    })
-
-
-# 📌 CSV 저장 함수 (기존 유지)
-def save_to_csv():
-    # ...(이전과 동일)...
-    categories = list(API_CATEGORIES.keys()) + ["Unknown"]
-    with open("summary.csv", "w", newline="", encoding="utf-8") as csvfile:
+        return error_record(zip_path, type(e).__name__)
+
+    # 최종 결과
+    if triage_info is not None:
+        triage_info["seconds"] = time.perf_counter() - started
+    return AnalysisRecord(
+        os.path.basename(zip_path),
+        declared_permissions_all, # Manifest의 모든 권한
+        sorted(list(final_over_permissions)), # 최종 Over-permission 목록
+        wasm_exist,
+        api_table.pack(api_counts),
+        {context: sorted(patterns) for context, patterns in api_contexts.items()} or None,
+        summarize_wasm_modules(wasm_modules) if wasm_modules else None,
+        triage_info,
+        obfuscated or None
+    )
+
+
+# 📌 CSV 저장 함수
+def compute_api_totals(results):
+    """결과 레코드들의 counts 벡터를 더해 Category -> API -> 총합 으로 변환합니다."""
+    api_table = get_rules().api_table
+    return api_table.nested(api_table.sum_counts(results))
+
+def write_summary_csv(total_counts, path="summary.csv"):
+    with open(path, "w", newline="", encoding="utf-8") as csvfile:
         writer = csv.writer(csvfile)
         writer.writerow(["Category", "API", "Total Count"])
-        total_counts = defaultdict(lambda: defaultdict(int))
-        for result in SAMPLE_RESULTS:
-            if isinstance(result.get("api_counts"), dict):
-                for category, apis in result["api_counts"].items():
-                    for api, count in apis.items(): total_counts[category][api] += count
         all_apis_sorted = []
         for category, apis in total_counts.items():
             for api, count in apis.items(): all_apis_sorted.append((category, api, count))
-        all_apis_sorted.sort(key=lambda x: x[2], reverse=True)
+        # 동률은 Category/API 이름순 (샤드 merge 결과가 단일 실행과 같도록)
+        all_apis_sorted.sort(key=lambda x: (-x[2], x[0], x[1]))
         for category, api, count in all_apis_sorted: writer.writerow([category, api, count])
 
-    with open("detailed_analysis.csv", "w", newline="", encoding="utf-8") as csvfile:
+def detailed_row(result):
+    """결과 레코드 하나를 detailed_analysis.csv 한 줄로 변환합니다."""
+    row = [
+        result.zip,
+        json.dumps(result.permissions, ensure_ascii=False, sort_keys=True),
+        json.dumps(result.over_permissions, ensure_ascii=False, sort_keys=True), # tier 1 은 null (판정하지 않음)
+        result.wasm_exist
+    ]
+    rules = get_rules()
+    api_counts_dict = rules.api_table.nested(result.counts)
+    for category in rules.detailed_categories:
+        category_apis = api_counts_dict.get(category, {})
+        sorted_counts = sorted(category_apis.items(), key=lambda x: x[1], reverse=True)
+        row.append(json.dumps({api: count for api, count in sorted_counts}, ensure_ascii=False))
+    row.append(json.dumps(result.api_contexts or {}, ensure_ascii=False, sort_keys=True))
+    wasm_info = result.wasm_info or {}
+    row += [
+        wasm_info.get("modules", 0),
+        json.dumps(wasm_info.get("imports", {}), ensure_ascii=False),
+        json.dumps(wasm_info.get("exports", []), ensure_ascii=False),
+        wasm_info.get("code_size", 0),
+        result.triage["tier"] if result.triage else "", # triage 모드가 아니면 빈 칸
+        json.dumps(result.obfuscated or {}, ensure_ascii=False, sort_keys=True)
+    ]
+    return row
+
+def record_from_detailed_row(row):
+    """detailed_analysis.csv 한 줄을 집계에 필요한 필드(permissions, over_permissions, counts)만 가진 레코드로 되돌립니다."""
+    rules = get_rules()
+    api_counts = {}
+    for category, cell in zip(rules.detailed_categories, row[4:4 + len(rules.detailed_categories)]):
+        apis = json.loads(cell) if cell else {}
+        if apis: api_counts[category] = apis
+    return AnalysisRecord(row[0], json.loads(row[1]), json.loads(row[2]), row[3], rules.api_table.counts_from_nested(api_counts))
+
+def save_to_csv(output_dir="."):
+    write_summary_csv(compute_api_totals(SAMPLE_RESULTS), os.path.join(output_dir, "summary.csv"))
+
+    with open(os.path.join(output_dir, "detailed_analysis.csv"), "w", newline="", encoding="utf-8") as csvfile:
         writer = csv.writer(csvfile)
-        writer.writerow([
-            "ZIP File", "Permissions (manifest)", "Over Permissions", "WASM Exist"
-        ] + categories)
+        writer.writerow(get_rules().detailed_header)
         for result in SAMPLE_RESULTS:
-            permissions_list = result.get("permissions", [])
-            over_permissions_list = result.get("over_permissions", [])
-            wasm_val = result.get("wasm_exist", "X")
-            api_counts_dict = result.get("api_counts", {})
-            row = [
-                result.get("zip", "Unknown ZIP"),
-                json.dumps(permissions_list, ensure_ascii=False, sort_keys=True),
-                json.dumps(over_permissions_list, ensure_ascii=False, sort_keys=True),
-                wasm_val
-            ]
-            if not isinstance(api_counts_dict, dict): api_counts_dict = {}
-            for category in categories:
-                category_apis = api_counts_dict.get(category, {})
-                sorted_counts = sorted(category_apis.items(), key=lambda x: x[1], reverse=True)
-                row.append(json.dumps({api: count for api, count in sorted_counts}, ensure_ascii=False))
-            writer.writerow(row)
+            writer.writerow(detailed_row(result))
+
+
+# 📌 샤드 결과 병합 (merge 서브커맨드)
+def merge_shard_outputs(shard_dirs, output_dir="."):
+    """--shard 실행 결과 폴더들을 합쳐 단일 실행과 같은 summary.csv / detailed_analysis.csv / host_index.json 을 만듭니다.
+       detailed 행은 단일 실행과 같이 ZIP 이름순으로 정렬되며, 합친 aggregate.json 도 함께 남겨 다시 merge 할 수 있습니다."""
+    aggregates = [load_aggregate(shard_dir) for shard_dir in shard_dirs]
+    merged = merge_aggregates(aggregates)
+    if len(merged["rules"]) > 1:
+        raise ValueError(f"Shards were analyzed with different rule packs ({', '.join(r[:12] for r in merged['rules'])}); re-run the stale shards")
+    missing = missing_shards(merged["shards"])
+    if missing:
+        logging.warning(f"Merging incomplete shard set; missing shard(s): {missing}")
+    duplicated = len(merged["shards"]) - len(set(merged["shards"]))
+    if duplicated:
+        logging.warning(f"{duplicated} shard(s) appear more than once; totals will double count them.")
+
+    rows = []
+    host_patterns = {}
+    for shard_dir in shard_dirs:
+        detailed_path = os.path.join(shard_dir, "detailed_analysis.csv")
+        with open(detailed_path, newline="", encoding="utf-8") as csvfile:
+            reader = csv.reader(csvfile)
+            header = next(reader)
+            if header != get_rules().detailed_header:
+                raise ValueError(f"{shard_dir}/detailed_analysis.csv has an unexpected header")
+            rows.extend(reader)
+        host_index_path = os.path.join(shard_dir, HOST_INDEX_FILE)
+        if os.path.exists(host_index_path):
+            shard_index = load_host_index(host_index_path)
+        else:
+            logging.warning(f"{shard_dir} has no {HOST_INDEX_FILE}; rebuilding it from detailed_analysis.csv")
+            shard_index = HostIndex.from_detailed_csv([detailed_path])
+        for extension, patterns in shard_index.patterns.items():
+            host_patterns.setdefault(extension, []).extend(patterns)
+    rows.sort(key=lambda row: row[0])
+    # 단일 실행은 ZIP 이름순으로 색인에 추가하므로 같은 순서로 다시 만듦
+    host_index = HostIndex()
+    for extension in sorted(host_patterns):
+        host_index.add(extension, host_patterns[extension])
+
+    os.makedirs(output_dir, exist_ok=True)
+    write_summary_csv(merged["api_totals"], os.path.join(output_dir, "summary.csv"))
+    with open(os.path.join(output_dir, "detailed_analysis.csv"), "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(get_rules().detailed_header)
+        writer.writerows(rows)
+    write_host_index(host_index, output_dir)
+    write_aggregate(merged, output_dir)
+    print(f"Merged {len(shard_dirs)} shard outputs ({merged['archives']} archives) into {output_dir}")
+    return merged
+
+
+# 📌 워커 프로세스용 (WatchdogPool 에서 pickle 가능한 최상위 함수여야 함)
+_WORKER_STATE = {}
+
+def _init_worker(options):
+    rules = get_rules()  # spawn 으로 시작한 워커는 여기서 룰 팩을 읽음 (캐시는 부모가 이미 저장)
+    _WORKER_STATE["map"] = rules.compiled.api_to_permissions
+    _WORKER_STATE["patterns"] = rules.search_patterns
+    _WORKER_STATE["options"] = options
+
+def _analyze_task(task):
+    """task: 아카이브 경로, 또는 메모리에서 분석할 (파일 이름, bytes) 튜플."""
+    zip_path, data = task if isinstance(task, tuple) else (task, None)
+    options = _WORKER_STATE["options"]
+    return analyze_archive(zip_path, _WORKER_STATE["map"], _WORKER_STATE["patterns"], data=data, **options)
 
 
 # 📌 실행 부분
-def sampling_analyze(folder_path, sample_size=None):
+def sampling_analyze(folder_path, sample_size=None, skip_unreferenced=False, scan_budget=None,
+                     workers=1, timeout=None, max_inflated=DEFAULT_MAX_INFLATED, max_members=DEFAULT_MAX_MEMBERS,
+                     shard=None, output_dir=".", triage=None, obfuscation_check=True):
+    """폴더의 아카이브들을 분석합니다. timeout 이 주어지거나 workers > 1 이면 WatchdogPool 워커에서 실행해
+       제한 시간을 넘긴 아카이브는 워커를 교체하고 "Error: Timeout" 으로 기록합니다. 둘 다 아니면 현재 프로세스에서 실행합니다.
+       shard=(i, N) 이면 익스텐션 ID 해시가 i 인 아카이브만 분석하고 output_dir 에 aggregate.json 도 남깁니다
+       (sample_size 는 샤드 안에서 적용). triage(TriageCriteria)가 주어지면 2단계 모드로 실행하고 tier 별 통계를 출력합니다.
+       obfuscation_check=False 이면 난독화 판별/2차 분석을 하지 않습니다."""
     # 분석 시작 전, 필요한 매핑 생성
-    api_pattern_to_permission_map = create_api_pattern_to_permission_map(PERMISSION_TO_APIS)
+    rules = get_rules()
+    api_pattern_to_permission_map = rules.compiled.api_to_permissions
     # 모든 검색 대상 패턴 미리 준비
-    all_search_patterns = set(p for patterns in PERMISSION_TO_APIS.values() for p in patterns if p)
+    all_search_patterns = rules.search_patterns
 
     extensions = []
-    for f in os.listdir(folder_path):
+    # ZIP 이름순으로 분석/출력해 샤드 merge 결과와 단일 실행 결과가 같은 순서가 되도록 함
+    for f in sorted(os.listdir(folder_path)):
         if f.endswith(".zip") or f.endswith(".crx"):
             extensions.append(os.path.join(folder_path, f))
 
+    if shard is not None:
+        extensions = [path for path in extensions if shard_of(path, shard[1]) == shard[0]]
+        print(f"Shard {shard[0]}/{shard[1]}: {len(extensions)} archives.")
+
     if not extensions: logging.warning(f"No .zip or .crx files found in {folder_path}"); return
 
     if sample_size is not None and sample_size > 0 and sample_size < len(extensions):
-        sampled_extensions = random.sample(extensions, sample_size)
+        sampled_extensions = sorted(random.sample(extensions, sample_size))
         print(f"Analyzing {len(sampled_extensions)} sampled extensions...")
     else:
         sampled_extensions = extensions
         print(f"Analyzing all {len(sampled_extensions)} extensions...")
 
-    count = 0
-    for ext_path in sampled_extensions:
-        count += 1
-        print(f"[{count}/{len(sampled_extensions)}] Analyzing: {os.path.basename(ext_path)}")
-        logging.info(f"Starting analysis for: {os.path.basename(ext_path)}")
-        # analyze_zip 호출 시 필요한 매핑 전달
-        analyze_zip(ext_path, api_pattern_to_permission_map, all_search_patterns)
-        logging.info(f"Finished analysis for: {os.path.basename(ext_path)}")
+    options = {"skip_unreferenced": skip_unreferenced, "scan_budget": scan_budget,
+               "max_inflated": max_inflated, "max_members": max_members, "triage": triage,
+               "obfuscation_check": obfuscation_check}
+
+    if workers <= 1 and not timeout:
+        count = 0
+        for ext_path in sampled_extensions:
+            count += 1
+            print(f"[{count}/{len(sampled_extensions)}] Analyzing: {os.path.basename(ext_path)}")
+            logging.info(f"Starting analysis for: {os.path.basename(ext_path)}")
+            # analyze_zip 호출 시 필요한 매핑 전달
+            analyze_zip(ext_path, api_pattern_to_permission_map, all_search_patterns, **options)
+            logging.info(f"Finished analysis for: {os.path.basename(ext_path)}")
+    else:
+        # 큰 아카이브부터 배분해 마지막에 큰 작업 하나만 남는 상황(tail latency)을 줄임
+        order = {path: index for index, path in enumerate(sampled_extensions)}
+        scheduled = sorted(sampled_extensions, key=os.path.getsize, reverse=True)
+        results = {}
+        with WatchdogPool(_analyze_task, workers, timeout, _init_worker, (options,)) as pool:
+            for ext_path, status, value in pool.imap_unordered(scheduled):
+                if status == STATUS_OK:
+                    results[ext_path] = value
+                elif status == STATUS_TIMEOUT:
+                    results[ext_path] = error_record(ext_path, "Timeout")
+                else:
+                    results[ext_path] = error_record(ext_path, "WorkerCrashed")
+                print(f"[{len(results)}/{len(sampled_extensions)}] Analyzed: {os.path.basename(ext_path)} ({status})")
+            if pool.restarts:
+                logging.warning(f"{pool.restarts} worker(s) were restarted after timeouts or crashes.")
+        # 출력 순서는 입력(샘플링) 순서로 유지
+        SAMPLE_RESULTS.extend(results[path] for path in sorted(results, key=order.get))
+
+    if triage is not None:
+        log_triage_report(triage_report(SAMPLE_RESULTS))
 
     if SAMPLE_RESULTS:
         print("Analysis complete. Saving results to CSV...")
-        save_to_csv()
+        os.makedirs(output_dir, exist_ok=True)
+        save_to_csv(output_dir)
         print("CSV files saved: summary.csv, detailed_analysis.csv")
+        # host 권한 색인 (host_index.py query/rank 로 CSV 재스캔 없이 조회)
+        write_host_index(HostIndex.from_records(SAMPLE_RESULTS), output_dir)
+        if shard is not None:
+            write_aggregate(build_aggregate(SAMPLE_RESULTS, rules.api_table, shard, rules.rules.fingerprint), output_dir)
+            print(f"Shard aggregate saved: {os.path.join(output_dir, 'aggregate.json')}")
     else:
         print("Analysis completed, but no results were generated.")
 
-if __name__ == "__main__":
+def merge_main(argv):
+    import argparse
+    parser = argparse.ArgumentParser(prog="analyzer_extension.py merge", description="Merge --shard outputs into single-run summary.csv/detailed_analysis.csv.")
+    parser.add_argument("shard_dirs", nargs="+", help="Output folders written by --shard runs.")
+    parser.add_argument("-o", "--output-dir", default=".", help="Where to write the merged CSV files (default: current folder).")
+    args = parser.parse_args(argv)
+    try: merge_shard_outputs(args.shard_dirs, args.output_dir)
+    except ValueError as e: print(f"Error: {e}"); raise SystemExit(1)
+
+def main():
+    import argparse
     import sys
-    if len(sys.argv) < 2: print("Usage: python ... <folder> [sample_size]"); sys.exit(1)
-    folder = sys.argv[1]; size = None
-    if len(sys.argv) > 2:
-        try: size = int(sys.argv[2]);
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if len(sys.argv) > 1 and sys.argv[1] == "merge":
+        merge_main(sys.argv[2:]); return
+    parser = argparse.ArgumentParser(description="Analyze Chrome extension ZIP files for API usage and over-permissions.")
+    parser.add_argument("folder", help="Folder containing .zip/.crx extension archives.")
+    parser.add_argument("sample_size", nargs="?", default=None, help="Number of archives to randomly sample (default: all).")
+    # manifest/HTML/import 어디에서도 참조되지 않는 스크립트는 스캔하지 않음
+    parser.add_argument("--skip-unreferenced", action="store_true", help="Do not scan scripts that nothing in the manifest/HTML/imports references.")
+    parser.add_argument("--scan-budget-mb", type=float, default=None, help="Per-archive budget of uncompressed script/HTML bytes to scan (largest members first).")
+    parser.add_argument("--workers", type=int, default=1, help="Number of analysis worker processes.")
+    parser.add_argument("--timeout", type=float, default=None, help=f"Per-archive wall-clock limit in seconds; 0 disables the watchdog (default: {DEFAULT_TIMEOUT} with --workers > 1, none with --workers 1, which analyzes in-process).")
+    parser.add_argument("--max-inflated-mb", type=float, default=DEFAULT_MAX_INFLATED / (1024 * 1024), help="Per-archive limit on total uncompressed bytes; 0 disables (default: %(default)s).")
+    parser.add_argument("--max-members", type=int, default=DEFAULT_MAX_MEMBERS, help="Per-archive limit on member count; 0 disables (default: %(default)s).")
+    parser.add_argument("--shard", default=None, help="Analyze only shard i of N (e.g. 0/4), partitioned by extension-ID hash.")
+    parser.add_argument("--output-dir", default=".", help="Folder for summary.csv/detailed_analysis.csv (and aggregate.json in shard mode).")
+    # 2단계 모드: manifest 로 먼저 걸러내고 조건에 해당하는 아카이브만 스크립트 스캔
+    parser.add_argument("--triage", action="store_true", help="Tiered mode: deep-scan only archives whose manifest matches the triage criteria.")
+    parser.add_argument("--triage-permissions", default=None, help="Comma-separated permissions that trigger a deep scan (default: the rule pack's suspicious permissions).")
+    parser.add_argument("--triage-manifest-versions", default="", help="Comma-separated manifest versions that always get a deep scan (e.g. 2).")
+    parser.add_argument("--triage-no-broad-hosts", action="store_true", help="Do not deep-scan archives just for requesting all-sites host access.")
+    parser.add_argument("--triage-no-wasm", action="store_true", help="Do not deep-scan archives just for containing .wasm modules.")
+    # 난독화 판별 (바이트 통계) 과 의심 멤버의 동적 속성 접근 분석
+    parser.add_argument("--no-obfuscation-check", action="store_true", help="Skip the per-script obfuscation statistics and the deeper dynamic-access analysis of flagged scripts.")
+    args = parser.parse_args()
+    try: shard = parse_shard(args.shard) if args.shard else None
+    except ValueError as e: parser.error(str(e))
+
+    size = None
+    if args.sample_size is not None:
+        try: size = int(args.sample_size)
         except ValueError: size = None
         if size is not None and size <= 0: size = None
-    if not os.path.isdir(folder): print(f"Error: Folder not found - {folder}"); sys.exit(1)
-    sampling_analyze(folder, size)
+    scan_budget = int(args.scan_budget_mb * 1024 * 1024) if args.scan_budget_mb else None
+    triage = None
+    if args.triage:
+        try: manifest_versions = [int(v) for v in args.triage_manifest_versions.split(",") if v.strip()]
+        except ValueError: parser.error(f"Invalid --triage-manifest-versions {args.triage_manifest_versions!r}")
+        permissions = ([p.strip() for p in args.triage_permissions.split(",") if p.strip()]
+                       if args.triage_permissions is not None else get_rules().rules.suspicious_permissions)
+        triage = TriageCriteria(permissions, not args.triage_no_broad_hosts, manifest_versions, not args.triage_no_wasm)
+    if not os.path.isdir(args.folder): print(f"Error: Folder not found - {args.folder}"); raise SystemExit(1)
+    # 단일 워커는 기본적으로 워커 프로세스 없이 현재 프로세스에서 분석 (--timeout 을 주면 watchdog 사용)
+    timeout = args.timeout if args.timeout is not None else (DEFAULT_TIMEOUT if args.workers > 1 else None)
+    sampling_analyze(args.folder, size, args.skip_unreferenced, scan_budget,
+                     workers=args.workers, timeout=timeout or None,
+                     max_inflated=int(args.max_inflated_mb * 1024 * 1024) if args.max_inflated_mb else None,
+                     max_members=args.max_members or None, shard=shard, output_dir=args.output_dir, triage=triage,
+                     obfuscation_check=not args.no_obfuscation_check)
+
+if __name__ == "__main__":
+    main()
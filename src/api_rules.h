@@ -0,0 +1,127 @@
+// 자동 생성 파일: python rule_pack.py export-c > api_rules.h 로 다시 만드세요. 직접 수정하지 마세요.
+// rule pack: default@1 (2008a5c6749b)
+#ifndef API_RULES_H
+#define API_RULES_H
+
+#define RULES_FINGERPRINT "2008a5c6749b9958cbc4d72c1c2935fe28c92b0e4d563ca1fde3c3a0535a690f"
+
+typedef struct {
+    const char *name;
+    const char *category;
+} APIEntry;
+
+static const APIEntry target_apis[] = {
+    {"navigator.clipboard.readText", "Clipboard"},
+    {"navigator.clipboard.writeText", "Clipboard"},
+    {"document.execCommand('paste')", "Clipboard"},
+    {"document.execCommand('copy')", "Clipboard"},
+    {"chrome.downloads.download", "Downloads"},
+    {"chrome.downloads.search", "Downloads"},
+    {"chrome.downloads.open", "Downloads"},
+    {"chrome.downloads.erase", "Downloads"},
+    {"chrome.downloads.removeFile", "Downloads"},
+    {"chrome.storage.local.get", "Storage"},
+    {"chrome.storage.local.set", "Storage"},
+    {"chrome.storage.sync.get", "Storage"},
+    {"chrome.storage.sync.set", "Storage"},
+    {"indexedDB.open", "Storage"},
+    {"localStorage.setItem", "Storage"},
+    {"sessionStorage.getItem", "Storage"},
+    {"navigator.storage.persist", "Storage"},
+    {"chrome.tabs.create", "Tabs"},
+    {"chrome.tabs.query", "Tabs"},
+    {"chrome.tabs.update", "Tabs"},
+    {"chrome.tabs.get", "Tabs"},
+    {"chrome.tabs.remove", "Tabs"},
+    {"chrome.tabs.executeScript", "Tabs"},
+    {"chrome.tabs.onUpdated.addListener", "Tabs"},
+    {"chrome.tabs.onActivated.addListener", "Tabs"},
+    {"chrome.tabs.captureVisibleTab", "Tabs"},
+    {"chrome.scripting.executeScript", "Scripting"},
+    {"chrome.scripting.insertCSS", "Scripting"},
+    {"chrome.scripting.removeCSS", "Scripting"},
+    {"chrome.scripting.registerContentScripts", "Scripting"},
+    {"chrome.identity.getAuthToken", "Identity"},
+    {"chrome.identity.getProfileUserInfo", "Identity"},
+    {"chrome.identity.launchWebAuthFlow", "Identity"},
+    {"chrome.webRequest.onBeforeRequest", "WebRequest"},
+    {"chrome.webRequest.onHeadersReceived", "WebRequest"},
+    {"chrome.webRequest.onCompleted", "WebRequest"},
+    {"chrome.bookmarks.create", "Bookmarks"},
+    {"chrome.bookmarks.get", "Bookmarks"},
+    {"chrome.bookmarks.search", "Bookmarks"},
+    {"chrome.bookmarks.update", "Bookmarks"},
+    {"chrome.bookmarks.remove", "Bookmarks"},
+    {"chrome.history.search", "History"},
+    {"chrome.history.addUrl", "History"},
+    {"chrome.history.deleteUrl", "History"},
+    {"chrome.history.deleteAll", "History"},
+    {"chrome.alarms.create", "Alarms"},
+    {"chrome.alarms.get", "Alarms"},
+    {"chrome.alarms.clear", "Alarms"},
+    {"chrome.alarms.onAlarm.addListener", "Alarms"},
+    {"chrome.notifications.create", "Notifications"},
+    {"chrome.notifications.update", "Notifications"},
+    {"chrome.notifications.clear", "Notifications"},
+    {"chrome.notifications.onClicked.addListener", "Notifications"},
+    {"chrome.contextMenus.create", "Context Menus"},
+    {"chrome.contextMenus.update", "Context Menus"},
+    {"chrome.contextMenus.remove", "Context Menus"},
+    {"chrome.contextMenus.onClicked.addListener", "Context Menus"},
+    {"document.querySelector", "File System"},
+    {"file.name", "File System"},
+    {"file.type", "File System"},
+    {"file.size", "File System"},
+    {"file.lastModified", "File System"},
+    {"new Blob", "File System"},
+    {"FileReader.readAsText", "File System"},
+    {"FileReader.readAsDataURL", "File System"},
+    {"FileReader.readAsArrayBuffer", "File System"},
+    {"window.requestFileSystem", "File System"},
+    {"fileEntry.createWriter", "File System"},
+    {"indexedDB.transaction", "File System"},
+    {"store.put", "File System"},
+    {"localStorage.getItem", "File System"},
+    {"sessionStorage.setItem", "File System"},
+    {"document.cookie", "File System"},
+    {"Element.requestPointerLock", "File System"},
+    {"fetch", "Network"},
+    {"new XMLHttpRequest", "Network"},
+    {"new WebSocket", "Network"},
+    {"navigator.sendBeacon", "Network"},
+    {"new RTCPeerConnection", "Network"},
+    {"chrome.proxy.settings.set", "Network"},
+    {"chrome.dns.resolve", "Network"},
+    {"chrome.mdns.onServiceList", "Network"},
+    {"chrome.signedInDevices.get", "Network"},
+    {"document.createElement", "Rendering"},
+    {"document.appendChild", "Rendering"},
+    {"element.innerHTML", "Rendering"},
+    {"document.getElementById", "Rendering"},
+    {"element.style", "Rendering"},
+    {"new MutationObserver", "Rendering"},
+    {"setTimeout", "Rendering"},
+    {"setInterval", "Rendering"},
+    {"canvas.getContext", "Rendering"},
+    {"CanvasRenderingContext2D.drawImage", "Rendering"},
+    {"document.designMode", "Rendering"},
+    {"shadowRoot.attachShadow", "Rendering"},
+    {"window.open", "Rendering"},
+    {"chrome.windows.create", "Rendering"},
+    {"chrome.declarativeContent.onPageChanged", "Rendering"},
+    {"addEventListener", "User Interaction"},
+    {"document.onmousemove", "User Interaction"},
+    {"document.onkeypress", "User Interaction"},
+    {"document.onkeydown", "User Interaction"},
+    {"window.onbeforeunload", "User Interaction"},
+    {"chrome.permissions.request", "User Interaction"},
+    {"window.alert", "User Interaction"},
+    {"window.confirm", "User Interaction"},
+    {"window.prompt", "User Interaction"},
+    {"chrome.input.ime.onFocus", "User Interaction"},
+    {"chrome.fileBrowserHandler.onExecute", "User Interaction"}
+};
+
+#define API_COUNT (sizeof(target_apis) / sizeof(target_apis[0]))
+
+#endif
@@ -0,0 +1,336 @@
+import io
+import mmap
+import os
+import struct
+import zipfile
+import zlib
+
+# 📌 ZIP 포맷 상수 (APPNOTE.TXT)
+EOCD_SIGNATURE = b"PK\x05\x06"
+EOCD_STRUCT = struct.Struct("<4s4H2LH")
+ZIP64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+ZIP64_LOCATOR_STRUCT = struct.Struct("<4sLQL")
+ZIP64_EOCD_SIGNATURE = b"PK\x06\x06"
+ZIP64_EOCD_STRUCT = struct.Struct("<4sQ2H2L4Q")
+CENTRAL_SIGNATURE = b"PK\x01\x02"
+CENTRAL_STRUCT = struct.Struct("<4s4B4HL2L5H2L")
+LOCAL_SIGNATURE = b"PK\x03\x04"
+LOCAL_STRUCT = struct.Struct("<4s2B4HL2L2H")
+MAX_COMMENT = 0xFFFF
+STREAM_CHUNK = 64 * 1024
+
+FLAG_ENCRYPTED = 0x1
+FLAG_UTF8 = 0x800
+
+
+class ArchiveMember:
+    """중앙 디렉토리 한 항목. zipfile.ZipInfo 와 같은 이름의 속성(filename, CRC, file_size ...)을 제공합니다."""
+    __slots__ = ("filename", "compress_type", "compress_size", "file_size", "CRC", "flag_bits", "header_offset")
+
+    def __init__(self, filename, compress_type, compress_size, file_size, crc, flag_bits, header_offset):
+        self.filename = filename
+        self.compress_type = compress_type
+        self.compress_size = compress_size
+        self.file_size = file_size
+        self.CRC = crc
+        self.flag_bits = flag_bits
+        self.header_offset = header_offset
+
+    def is_dir(self):
+        return self.filename.endswith("/")
+
+
+class BufferStream(io.RawIOBase):
+    """bytes/memoryview 위의 읽기 전용 파일 객체. read(n) 시 요청한 구간만 복사합니다."""
+
+    def __init__(self, buffer):
+        super().__init__()
+        self._buffer = buffer
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._buffer)
+        self._pos = max(0, offset)
+        return self._pos
+
+    def read(self, size=-1):
+        end = len(self._buffer) if size is None or size < 0 else min(len(self._buffer), self._pos + size)
+        data = bytes(self._buffer[self._pos:end])
+        self._pos = end
+        return data
+
+    def readinto(self, b):
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        self._buffer = b""
+        super().close()
+
+
+class InflateStream(io.RawIOBase):
+    """DEFLATE 로 압축된 memoryview 를 STREAM_CHUNK 단위로 풀어주는 순차 읽기 파일 객체.
+       WASM 섹션 파서처럼 앞에서부터 훑기만 하는 단계가 멤버 전체를 메모리에 올리지 않도록 합니다.
+       crc 를 주면 끝까지 읽었을 때 CRC-32 를 확인합니다."""
+
+    def __init__(self, source, limit=None, crc=None, name=None):
+        super().__init__()
+        self._source = source
+        self._limit = limit
+        self._expected_crc = crc
+        self._crc = 0
+        self._name = name
+        self._in_pos = 0
+        self._pos = 0
+        self._eof = False
+        self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+
+    def readable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            chunks = []
+            while True:
+                chunk = self.read(STREAM_CHUNK)
+                if not chunk:
+                    return b"".join(chunks)
+                chunks.append(chunk)
+        out = bytearray()
+        try:
+            while len(out) < size and not self._eof:
+                if self._decompressor.unconsumed_tail:
+                    data = self._decompressor.unconsumed_tail
+                elif self._in_pos < len(self._source):
+                    data = self._source[self._in_pos:self._in_pos + STREAM_CHUNK]
+                    self._in_pos += len(data)
+                else:
+                    out += self._decompressor.flush()
+                    self._eof = True
+                    break
+                out += self._decompressor.decompress(data, size - len(out))
+                if self._decompressor.eof:
+                    self._eof = True
+        except zlib.error as e:
+            raise zipfile.BadZipFile(f"Error decompressing member: {e}")
+        self._pos += len(out)
+        if self._limit is not None and self._pos > self._limit:
+            raise zipfile.BadZipFile("member inflates beyond its declared size")
+        if self._expected_crc is not None:
+            self._crc = zlib.crc32(out, self._crc)
+            if self._eof and self._crc != self._expected_crc:
+                raise zipfile.BadZipFile(f"Bad CRC-32 for file {self._name!r}")
+        return bytes(out)
+
+    def readinto(self, b):
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        self._source = b""
+        super().close()
+
+
+# 📌 mmap 기반 ZIP 리더 (분석 단계 간 공유)
+class ArchiveReader:
+    """ZIP 파일을 한 번 mmap 하고 중앙 디렉토리도 한 번만 파싱해 여러 분석 단계가 공유하도록 합니다.
+
+       - read(): 멤버를 압축 해제한 버퍼를 반환 (STORED 멤버는 복사 없는 memoryview). zipfile 처럼 CRC-32 를 확인합니다
+       - open()/namelist()/infolist(): zipfile.ZipFile 과 호환되는 최소 인터페이스
+       포맷 오류는 기존 코드와 동일하게 zipfile.BadZipFile 로 올립니다."""
+
+    def __init__(self, source):
+        """source: ZIP 파일 경로, 또는 이미 메모리에 있는 bytes/bytearray (다운로드 직후 분석 등)."""
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self.path = None
+            self._file = None
+        else:
+            self.path = source
+            self._file = open(source, "rb")
+        try:
+            if self._file is None:
+                self._mm = bytes(source) if isinstance(source, memoryview) else source
+            else:
+                if os.fstat(self._file.fileno()).st_size < EOCD_STRUCT.size:
+                    raise zipfile.BadZipFile("File is not a zip file")
+                self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(self._mm) < EOCD_STRUCT.size:
+                raise zipfile.BadZipFile("File is not a zip file")
+            self._view = memoryview(self._mm)
+            self._members = self._read_central_directory()
+        except Exception:
+            self._release()
+            raise
+        self._by_name = {member.filename: member for member in self._members}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _find_eocd(self):
+        search_start = max(0, len(self._mm) - EOCD_STRUCT.size - MAX_COMMENT)
+        offset = self._mm.rfind(EOCD_SIGNATURE, search_start)
+        if offset < 0:
+            raise zipfile.BadZipFile("File is not a zip file")
+        return offset
+
+    def _read_central_directory(self):
+        eocd_offset = self._find_eocd()
+        _, _, _, _, entry_count, cd_size, cd_offset, _ = EOCD_STRUCT.unpack_from(self._mm, eocd_offset)
+
+        # ZIP64: EOCD 값이 0xFFFF/0xFFFFFFFF 로 채워져 있으면 ZIP64 EOCD 레코드를 사용
+        locator_offset = eocd_offset - ZIP64_LOCATOR_STRUCT.size
+        is_zip64 = locator_offset >= 0 and self._mm[locator_offset:locator_offset + 4] == ZIP64_LOCATOR_SIGNATURE
+        if is_zip64:
+            _, _, zip64_offset, _ = ZIP64_LOCATOR_STRUCT.unpack_from(self._mm, locator_offset)
+            if self._mm[zip64_offset:zip64_offset + 4] != ZIP64_EOCD_SIGNATURE:
+                raise zipfile.BadZipFile("Corrupt ZIP64 end of central directory")
+            fields = ZIP64_EOCD_STRUCT.unpack_from(self._mm, zip64_offset)
+            entry_count, cd_size, cd_offset = fields[7], fields[8], fields[9]
+
+        # 앞에 데이터가 붙은 ZIP (self-extractor, CRX 헤더 등) 보정
+        base = eocd_offset - cd_size - cd_offset
+        if is_zip64:
+            base -= ZIP64_EOCD_STRUCT.size + ZIP64_LOCATOR_STRUCT.size
+        if base < 0:
+            raise zipfile.BadZipFile("Bad central directory offset")
+        self._base = base
+
+        members = []
+        pos = base + cd_offset
+        for _ in range(entry_count):
+            if self._mm[pos:pos + 4] != CENTRAL_SIGNATURE:
+                raise zipfile.BadZipFile("Bad magic number for central directory")
+            (_, _, _, _, _, flag_bits, compress_type, _, _, crc, compress_size, file_size,
+             name_len, extra_len, comment_len, _, _, _, header_offset) = CENTRAL_STRUCT.unpack_from(self._mm, pos)
+            pos += CENTRAL_STRUCT.size
+            raw_name = self._mm[pos:pos + name_len]
+            filename = raw_name.decode("utf-8" if flag_bits & FLAG_UTF8 else "cp437")
+            extra = self._mm[pos + name_len:pos + name_len + extra_len]
+            if 0xFFFFFFFF in (compress_size, file_size, header_offset):
+                file_size, compress_size, header_offset = self._apply_zip64_extra(extra, file_size, compress_size, header_offset)
+            members.append(ArchiveMember(filename, compress_type, compress_size, file_size, crc, flag_bits, header_offset))
+            pos += name_len + extra_len + comment_len
+        return members
+
+    @staticmethod
+    def _apply_zip64_extra(extra, file_size, compress_size, header_offset):
+        pos = 0
+        while pos + 4 <= len(extra):
+            tag, size = struct.unpack_from("<2H", extra, pos)
+            if tag == 0x0001:
+                values = list(struct.unpack_from(f"<{size // 8}Q", extra, pos + 4))
+                if file_size == 0xFFFFFFFF and values:
+                    file_size = values.pop(0)
+                if compress_size == 0xFFFFFFFF and values:
+                    compress_size = values.pop(0)
+                if header_offset == 0xFFFFFFFF and values:
+                    header_offset = values.pop(0)
+                break
+            pos += 4 + size
+        return file_size, compress_size, header_offset
+
+    # 📌 zipfile.ZipFile 호환 인터페이스
+    def namelist(self):
+        return [member.filename for member in self._members]
+
+    def infolist(self):
+        return list(self._members)
+
+    def getinfo(self, name):
+        try:
+            return self._by_name[name]
+        except KeyError:
+            raise KeyError(f"There is no item named {name!r} in the archive")
+
+    def _resolve(self, member):
+        if not isinstance(member, ArchiveMember):
+            member = self.getinfo(member.filename if hasattr(member, "filename") else member)
+        if member.flag_bits & FLAG_ENCRYPTED:
+            raise RuntimeError(f"File {member.filename!r} is encrypted")
+        return member
+
+    def _raw_data(self, member):
+        """로컬 헤더를 건너뛴 압축 데이터 구간의 memoryview."""
+        header_pos = self._base + member.header_offset
+        if self._mm[header_pos:header_pos + 4] != LOCAL_SIGNATURE:
+            raise zipfile.BadZipFile(f"Bad magic number for file header: {member.filename}")
+        name_len, extra_len = struct.unpack_from("<2H", self._mm, header_pos + 26)
+        data_start = header_pos + LOCAL_STRUCT.size + name_len + extra_len
+        return self._view[data_start:data_start + member.compress_size]
+
+    def open(self, member, mode="r"):
+        """멤버를 순차 읽기 파일 객체로 엽니다. DEFLATE 멤버는 읽는 만큼만 압축을 풉니다."""
+        member = self._resolve(member)
+        if member.compress_type == zipfile.ZIP_DEFLATED:
+            return InflateStream(self._raw_data(member), member.file_size, member.CRC, member.filename)
+        return BufferStream(self.read(member))
+
+    def read(self, member):
+        """멤버 내용을 반환합니다. STORED 멤버는 mmap 위의 memoryview (복사 없음), 그 외는 압축 해제한 bytes."""
+        member = self._resolve(member)
+        data = self._raw_data(member)
+
+        if member.compress_type == zipfile.ZIP_STORED:
+            return self._check_crc(member, data)
+        if member.compress_type == zipfile.ZIP_DEFLATED:
+            try:
+                # 중앙 디렉토리에 선언된 크기까지만 풀어 크기를 속인 zip bomb 이 메모리를 잡아먹지 않도록 함
+                out = zlib.decompressobj(-zlib.MAX_WBITS).decompress(data, member.file_size + 1)
+            except zlib.error as e:
+                raise zipfile.BadZipFile(f"Error decompressing {member.filename}: {e}")
+            if len(out) > member.file_size:
+                raise zipfile.BadZipFile(f"{member.filename} inflates beyond its declared size")
+            return self._check_crc(member, out)
+        # bzip2/lzma 등 드문 압축 방식은 zipfile 에 맡김
+        with zipfile.ZipFile(self._file if self._file is not None else io.BytesIO(self._mm)) as z:
+            return z.read(member.filename)
+
+    @staticmethod
+    def _check_crc(member, data):
+        # 손상되거나 조작된 멤버를 zipfile 과 같은 BadZipFile 로 거름 (memoryview 도 복사 없이 계산)
+        if zlib.crc32(data) != member.CRC:
+            raise zipfile.BadZipFile(f"Bad CRC-32 for file {member.filename!r}")
+        return data
+
+    def close(self):
+        self._members = []
+        self._by_name = {}
+        self._release()
+
+    def _release(self):
+        view = getattr(self, "_view", None)
+        if view is not None:
+            try:
+                view.release()
+            except BufferError:
+                pass  # 호출자가 아직 STORED 멤버 view 를 들고 있음 → GC 시 해제
+            self._view = None
+        mm = getattr(self, "_mm", None)
+        if isinstance(mm, mmap.mmap):
+            try:
+                mm.close()
+            except BufferError:
+                pass
+        self._mm = None
+        if self._file is not None:
+            self._file.close()
@@ -0,0 +1,49 @@
+import argparse
+import importlib
+import os
+import sys
+
+# 📌 통합 실행 진입점
+#   python cli.py <command> [args...]   (python cli.py <command> --help 로 각 명령의 옵션 확인)
+# 명령마다 해당 스크립트의 main() 을 그대로 실행합니다. 스크립트 모듈은 명령이 정해진 뒤에만 import 하므로
+# manifest 만 보는 작업이 requests/pandas/NumPy 같은 무거운 의존성의 import 비용을 내지 않습니다.
+# (각 스크립트는 import 만으로는 파일을 읽고 쓰거나 네트워크 요청을 하지 않습니다.)
+
+# 명령 -> (모듈, 설명). 파이프라인 순서: download -> index/collect -> survey -> analyze -> enrich -> flag
+COMMANDS = {
+    "download": ("extension_downloader", "Download the latest version of each extension listed in a CSV (chrome-stats)."),
+    "stream": ("stream_pipeline", "Download and analyze extensions in memory as they arrive."),
+    "index": ("corpus_store", "Add archives to the content-addressed corpus store or materialize a working set."),
+    "collect": ("path_downloader", "Collect the archives listed in a CSV into a working folder via the corpus store."),
+    "survey": ("suspicious_permissions_analysis.sampling_permissions", "Sample archives and list the suspicious permissions their manifests declare."),
+    "analyze": ("analyzer_extension", "Analyze archives for API usage and over-permissions ('analyze merge' joins shard outputs)."),
+    "watch": ("watch_mode", "Continuously analyze new or changed archives in a corpus folder."),
+    "enrich": ("suspicious_permissions_analysis.update_extension_csv", "Add chrome-stats names and descriptions to a survey CSV."),
+    "flag": ("suspicious_permissions_analysis.matching_context", "Flag suspicious permissions the store listing does not explain."),
+    "find-wasm": ("download_wasm", "Copy archives that contain .wasm modules to another folder."),
+    "hosts": ("host_index", "Build or query the host-permission index."),
+    "results": ("results_db", "Load analyzer output into the SQLite results database, query or serve it."),
+    "rules": ("rule_pack", "Inspect, precompile or export analysis rule packs."),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Chrome extension analysis tools.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="commands:\n" + "\n".join(f"  {name:<10}  {description}" for name, (_, description) in COMMANDS.items()))
+    parser.add_argument("command", metavar="command", choices=list(COMMANDS), help="One of the commands below.")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments for the command (see <command> --help).")
+    args = parser.parse_args(argv)
+
+    try:
+        module = importlib.import_module(COMMANDS[args.command][0])
+    except ModuleNotFoundError as e:  # 선택 의존성 (requests, pandas 등) 은 그 명령을 쓸 때만 필요
+        print(f"Error: '{args.command}' needs the {e.name} package (pip install {e.name})"); raise SystemExit(1)
+    # 각 스크립트의 argparse 가 "cli.py <command>" 를 prog 로 쓰고 나머지 인자를 그대로 읽도록 함
+    sys.argv = [f"{os.path.basename(sys.argv[0])} {args.command}"] + args.args
+    return module.main()
+
+
+if __name__ == "__main__":
+    main()
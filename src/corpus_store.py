@@ -0,0 +1,293 @@
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# 📌 내용 주소 기반(content-addressed) 코퍼스 저장소
+# 아카이브를 sha256 으로 한 번만 저장하고 (objects/ab/abcdef....zip), 작업 폴더는 선택 목록(manifest)에서
+# hardlink/symlink 로 만들어 냅니다. 같은 내용의 파일은 이름이 달라도 한 개만 저장됩니다.
+
+INDEX_FILE = "index.json"
+OBJECTS_DIR = "objects"
+SELECTION_MANIFEST = "selection.csv"
+SELECTION_HEADER = ["File Name", "SHA256", "Size", "Source Path"]
+HASH_CHUNK_SIZE = 1024 * 1024
+
+MODE_HARDLINK = "hardlink"
+MODE_SYMLINK = "symlink"
+MODE_COPY = "copy"
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _link_or_copy(source, destination, mode):
+    """mode 대로 destination 을 만듭니다. hardlink 가 불가능하면 (다른 파일시스템 등) 복사로 대체."""
+    if mode == MODE_SYMLINK:
+        os.symlink(os.path.abspath(source), destination)
+        return MODE_SYMLINK
+    if mode == MODE_HARDLINK:
+        try:
+            os.link(source, destination)
+            return MODE_HARDLINK
+        except OSError:
+            pass
+    shutil.copy2(source, destination)
+    return MODE_COPY
+
+
+class CorpusStore:
+    """sha256 → 아카이브 저장소.
+
+       index.json 에는 객체별 크기/원래 이름과, 원본 경로별 (size, mtime_ns, sha256) 캐시를 저장합니다.
+       이미 해시를 계산한 원본 파일은 크기/mtime 이 그대로면 다시 읽지 않으므로 같은 코퍼스를 반복 수집해도 빠릅니다.
+       객체는 원본과 inode 를 공유하므로 (hardlink) 원본 아카이브를 제자리에서 수정하지 않는다는 전제입니다."""
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(os.path.join(root, OBJECTS_DIR), exist_ok=True)
+        self._lock = threading.Lock()
+        self._index = {"objects": {}, "sources": {}}
+        index_path = os.path.join(root, INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, "r", encoding="utf-8") as f:
+                self._index = json.load(f)
+
+    def object_path(self, sha256):
+        return os.path.join(self.root, OBJECTS_DIR, sha256[:2], sha256 + ".zip")
+
+    def __contains__(self, sha256):
+        return sha256 in self._index["objects"]
+
+    def names(self, sha256):
+        return self._index["objects"].get(sha256, {}).get("names", [])
+
+    def _cached_hash(self, source, st):
+        cached = self._index["sources"].get(os.path.abspath(source))
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        return None
+
+    def file_sha256(self, path, st=None):
+        """파일의 sha256. index 에 같은 경로/크기/mtime 으로 계산해 둔 값이 있으면 다시 읽지 않습니다."""
+        st = st or os.stat(path)
+        with self._lock:
+            sha256 = self._cached_hash(path, st)
+        return sha256 or sha256_file(path)
+
+    def add(self, source):
+        """원본 파일 하나를 저장소에 넣고 sha256 을 반환합니다. 이미 있는 내용이면 이름만 기록합니다.
+           저장은 원본에 대한 hardlink 로 시도하므로 같은 파일시스템이면 디스크를 더 쓰지 않습니다."""
+        st = os.stat(source)
+        sha256 = self.file_sha256(source, st)
+
+        object_path = self.object_path(sha256)
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            tmp_path = f"{object_path}.{threading.get_ident()}.tmp"
+            _link_or_copy(source, tmp_path, MODE_HARDLINK)
+            os.replace(tmp_path, object_path)  # 다른 스레드가 같은 내용을 동시에 넣어도 결과는 같음
+
+        name = os.path.basename(source)
+        with self._lock:
+            entry = self._index["objects"].setdefault(sha256, {"size": st.st_size, "names": []})
+            if name not in entry["names"]:
+                entry["names"].append(name)
+            self._index["sources"][os.path.abspath(source)] = [st.st_size, st.st_mtime_ns, sha256]
+        return sha256
+
+    def add_many(self, sources, workers=8):
+        """여러 파일을 스레드 풀로 병렬 저장합니다. [(source, sha256 또는 None)] 을 입력 순서대로 반환."""
+        def add_one(source):
+            try:
+                return source, self.add(source)
+            except OSError as e:
+                logging.error(f"Cannot store {source}: {e}")
+                return source, None
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            results = list(executor.map(add_one, sources))
+        self.save()
+        return results
+
+    def save(self):
+        index_path = os.path.join(self.root, INDEX_FILE)
+        with self._lock:
+            with open(index_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(self._index, f, ensure_ascii=False)
+            os.replace(index_path + ".tmp", index_path)
+
+    def _object_inodes(self):
+        """저장소 객체들의 (st_dev, inode) 집합. 작업 셋에 남은 파일이 저장소 객체에 대한 hardlink 인지 확인할 때 사용."""
+        objects_dir = os.path.join(self.root, OBJECTS_DIR)
+        device = os.stat(objects_dir).st_dev
+        inodes = set()
+        with os.scandir(objects_dir) as prefixes:
+            for prefix in prefixes:
+                if prefix.is_dir(follow_symlinks=False):
+                    with os.scandir(prefix.path) as entries:
+                        inodes.update((device, entry.inode()) for entry in entries)  # POSIX 에서는 stat 없이 얻음
+        return inodes
+
+    def materialize(self, selection, destination_folder, mode=MODE_HARDLINK, workers=8):
+        """selection([(file_name, sha256)]) 을 destination_folder 에 링크로 만듭니다.
+
+           같은 내용은 한 번만 만들고, 이름은 같은데 내용이 다르면 <name>_<sha256 앞 8자리><ext> 로 구분합니다.
+           이미 같은 내용의 파일이 있으면 (링크든 copy 모드로 만든 복사본이든) 그대로 두고, 이전 작업 셋이 남긴
+           symlink 나 저장소 객체에 대한 hardlink 는 새 객체로 교체합니다.
+           만들어진 {작업 셋 안의 파일 이름: (sha256, mode)} 를 반환합니다."""
+        os.makedirs(destination_folder, exist_ok=True)
+        targets = {}
+        seen = set()
+        for file_name, sha256 in selection:
+            if sha256 in seen:
+                continue
+            seen.add(sha256)
+            if file_name in targets:
+                name, ext = os.path.splitext(file_name)
+                file_name = f"{name}_{sha256[:8]}{ext}"
+            targets[file_name] = sha256
+
+        store_inodes = []  # 처음 필요할 때 한 번만 만듦
+        inode_lock = threading.Lock()
+
+        def is_store_link(path):
+            st = os.lstat(path)
+            if st.st_nlink < 2:
+                return False
+            with inode_lock:
+                if not store_inodes:
+                    store_inodes.append(self._object_inodes())
+            return (st.st_dev, st.st_ino) in store_inodes[0]
+
+        def same_content(path, sha256, object_path):
+            """복사본의 내용이 객체와 같은지 확인합니다. 크기가 다르면 파일을 읽지 않습니다."""
+            st = os.stat(path)
+            return st.st_size == os.path.getsize(object_path) and self.file_sha256(path, st) == sha256
+
+        def make_one(item):
+            file_name, sha256 = item
+            destination_path = os.path.join(destination_folder, file_name)
+            object_path = self.object_path(sha256)
+            if os.path.lexists(destination_path):
+                if os.path.exists(destination_path) and os.path.samefile(destination_path, object_path):
+                    return file_name, (sha256, "existing")
+                if not (os.path.islink(destination_path) or is_store_link(destination_path)):
+                    # copy 모드 (또는 hardlink 가 복사로 대체된 경우) 로 만든 같은 내용의 파일은 그대로 사용
+                    if same_content(destination_path, sha256, object_path):
+                        return file_name, (sha256, "existing")
+                    # 저장소 밖에서 만든 파일은 덮어쓰지 않음
+                    name, ext = os.path.splitext(file_name)
+                    file_name = f"{name}_{sha256[:8]}{ext}"
+                    destination_path = os.path.join(destination_folder, file_name)
+                    if os.path.lexists(destination_path):
+                        return file_name, (sha256, "existing")
+                else:
+                    # 이전 작업 셋의 링크는 새 객체로 교체 (임시 이름으로 만든 뒤 한 번에 바꿈)
+                    tmp_path = f"{destination_path}.{threading.get_ident()}.tmp"
+                    used = _link_or_copy(object_path, tmp_path, mode)
+                    os.replace(tmp_path, destination_path)
+                    return file_name, (sha256, used)
+            return file_name, (sha256, _link_or_copy(object_path, destination_path, mode))
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            return dict(executor.map(make_one, targets.items()))
+
+
+def read_selection_manifest(path):
+    """selection.csv 를 [(file_name, sha256)] 로 읽습니다."""
+    with open(path, newline="", encoding="utf-8") as csvfile:
+        return [(row["File Name"], row["SHA256"]) for row in csv.DictReader(csvfile)]
+
+
+def write_selection_manifest(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(SELECTION_HEADER)
+        writer.writerows(rows)
+
+
+def build_working_set(paths, store_root, destination_folder, mode=MODE_HARDLINK, workers=8):
+    """원본 경로들을 저장소에 넣고 destination_folder 에 작업 셋을 만든 뒤, 선택 목록을 selection.csv 로 남깁니다.
+       나중에 같은 작업 셋은 read_selection_manifest + materialize 로 원본 없이 다시 만들 수 있습니다."""
+    store = CorpusStore(store_root)
+    existing = []
+    for file_path in paths:
+        if os.path.isfile(file_path):
+            existing.append(file_path)
+        else:
+            print(f"File not found: {file_path}")
+
+    stored = []
+    selection = []
+    for source, sha256 in store.add_many(existing, workers):
+        if sha256 is None:
+            continue
+        selection.append((os.path.basename(source), sha256))
+        stored.append((source, sha256))
+
+    created = store.materialize(selection, destination_folder, mode, workers)
+    # 분석 결과의 ZIP 이름(작업 셋 안의 이름)으로 원본 경로를 찾을 수 있도록 바뀐 이름을 기록
+    materialized_name = {sha256: file_name for file_name, (sha256, _) in created.items()}
+    rows = [[materialized_name[sha256], sha256, os.path.getsize(source), source] for source, sha256 in stored]
+    write_selection_manifest(os.path.join(destination_folder, SELECTION_MANIFEST), rows)
+    unique = len(materialized_name)
+    modes = {}
+    for _, used in created.values():
+        modes[used] = modes.get(used, 0) + 1
+    print(f"Stored {len(selection)} archives ({unique} unique) in {store_root}; "
+          f"working set {destination_folder}: {', '.join(f'{count} {used}' for used, count in sorted(modes.items())) or 'empty'}")
+    return created
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Content-addressed store for extension archives and working-set materialization.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    add_parser = subparsers.add_parser("add", help="Store archives (files or folders, searched recursively).")
+    add_parser.add_argument("paths", nargs="+")
+    add_parser.add_argument("--store", required=True, help="Store root folder.")
+    add_parser.add_argument("--workers", type=int, default=8)
+
+    materialize_parser = subparsers.add_parser("materialize", help="Rebuild a working set from a selection.csv manifest.")
+    materialize_parser.add_argument("manifest")
+    materialize_parser.add_argument("destination")
+    materialize_parser.add_argument("--store", required=True, help="Store root folder.")
+    materialize_parser.add_argument("--mode", choices=[MODE_HARDLINK, MODE_SYMLINK, MODE_COPY], default=MODE_HARDLINK)
+    materialize_parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    if args.command == "add":
+        sources = []
+        for path in args.paths:
+            if os.path.isdir(path):
+                for dirpath, _, files in os.walk(path):
+                    sources.extend(os.path.join(dirpath, f) for f in files if f.endswith((".zip", ".crx")))
+            else:
+                sources.append(path)
+        results = CorpusStore(args.store).add_many(sources, args.workers)
+        stored = [sha256 for _, sha256 in results if sha256]
+        print(f"Stored {len(stored)} archives ({len(set(stored))} unique) in {args.store}")
+    else:
+        store = CorpusStore(args.store)
+        selection = read_selection_manifest(args.manifest)
+        missing = [sha256 for _, sha256 in selection if sha256 not in store]
+        if missing:
+            print(f"Error: {len(missing)} archives in {args.manifest} are not in the store")
+            raise SystemExit(1)
+        created = store.materialize(selection, args.destination, args.mode, args.workers)
+        print(f"Materialized {len(created)} archives into {args.destination}")
+
+
+if __name__ == "__main__":
+    main()
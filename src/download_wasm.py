@@ -5,17 +5,21 @@ import argparse
 import logging
 from pathlib import Path
 
+from archive_reader import ArchiveReader
+
 # --- 로깅 설정 ---
-# INFO 레벨 이상의 메시지를 콘솔에 출력하고, 파일에도 저장합니다.
+# INFO 레벨 이상의 메시지를 콘솔에 출력하고, 파일에도 저장합니다 (main 에서 설정, import 만으로는 로그 파일을 만들지 않음).
 log_file = 'wasm_zip_finder.log'
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file, mode='w', encoding='utf-8'), # 파일 핸들러
-        logging.StreamHandler() # 콘솔 핸들러
-    ]
-)
+
+def setup_logging():
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file, mode='w', encoding='utf-8'), # 파일 핸들러
+            logging.StreamHandler() # 콘솔 핸들러
+        ]
+    )
 
 def find_and_copy_wasm_zips(source_dir, dest_dir):
     """
@@ -57,8 +61,8 @@ def find_and_copy_wasm_zips(source_dir, dest_dir):
                 wasm_found_in_zip = False
 
                 try:
-                    # ZIP 파일 열기 (읽기 모드)
-                    with zipfile.ZipFile(zip_file_path, 'r') as zf:
+                    # ZIP 파일 열기 (mmap + 중앙 디렉토리만 파싱)
+                    with ArchiveReader(zip_file_path) as zf:
                         # ZIP 파일 내의 모든 멤버(파일/디렉토리) 이름 목록 가져오기
                         member_list = zf.namelist()
                         # 각 멤버 이름 확인
@@ -111,6 +115,7 @@ def main():
         help="The destination directory path where ZIP files containing .wasm will be copied."
     )
     args = parser.parse_args()
+    setup_logging()
 
     # 함수 호출
     find_and_copy_wasm_zips(args.source_directory, args.destination_directory)
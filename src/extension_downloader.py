@@ -1,6 +1,8 @@
+import argparse
 import csv
 import os
 import re
+import threading
 
 import requests
 
@@ -8,20 +10,24 @@ import requests
 BASE_URL = "https://chrome-stats.com/api"
 
 # API 키 설정
-API_KEYS = "your api keys"
+API_KEYS = ["your api key"]
 api_key_index = 0
+_api_key_lock = threading.Lock()  # stream_pipeline 의 다운로드 스레드들이 동시에 키를 돌려 씀
 
+# 요청 공통 헤더. x-api-key 는 요청마다 request_headers() 에서 채움 (여러 스레드가 공유하므로 직접 수정하지 않음)
 HEADERS = {
     "x-api-key": API_KEYS[0]
 }
 
-# 기본 다운로드 폴더 설정
+# 기본 다운로드 폴더 설정 (카테고리 폴더 생성 시 함께 만들어짐)
 BASE_DOWNLOAD_FOLDER = "your_download_path"
-os.makedirs(BASE_DOWNLOAD_FOLDER, exist_ok=True)
 
 # CSV 파일 경로 설정
 CSV_FILE_PATH = "your_file_path"
 
+# 요청 timeout (연결, 읽기) 초. 응답 없는 서버에서 다운로드 스레드가 멈추지 않도록 함
+REQUEST_TIMEOUT = (10, 60)
+
 def sanitize_filename(filename):
     return re.sub(r'[<>:"/\\|?*()]', '', filename)
 
@@ -30,20 +36,28 @@ def get_next_api_key():
     Obtain the following API keys cyclically
     """
     global api_key_index
-    api_key = API_KEYS[api_key_index]
-    api_key_index = (api_key_index + 1) % len(API_KEYS)
+    with _api_key_lock:
+        api_key = API_KEYS[api_key_index % len(API_KEYS)]
+        api_key_index = (api_key_index + 1) % len(API_KEYS)
     return api_key
 
+
+def request_headers():
+    """다음 API 키를 넣은 요청별 헤더 dict (공유 HEADERS 는 바꾸지 않음)."""
+    return {**HEADERS, "x-api-key": get_next_api_key()}
+
 def get_available_versions(extension_id, retries=5):
     """
     /api/list-versions 엔드포인트를 호출해 확장 프로그램의 사용 가능한 버전 목록을 가져옴.
     """
-    global HEADERS
-    HEADERS["x-api-key"] = get_next_api_key()
     url = f"{BASE_URL}/list-versions"
     params = {"id": extension_id}
     
-    response = requests.get(url, headers=HEADERS, params=params)
+    try:
+        response = requests.get(url, headers=request_headers(), params=params, timeout=REQUEST_TIMEOUT)
+    except requests.RequestException as e:
+        print(f"Failed to get versions for {extension_id}: {e}")
+        return None
     if response.status_code == 200:
         data = response.json()
         return data.get("downloads", {}).get("allVersions", [])  # allVersions 리스트 추출
@@ -59,17 +73,38 @@ def get_available_versions(extension_id, retries=5):
         return None
 
 
-def download_extension(extension_id, version, file_type, category):
+def extension_file_name(extension_id, version, file_type):
+    """저장/분석 결과에 쓰는 파일 이름: <id>_<version>.<type>"""
+    return f"{extension_id}_{sanitize_filename(version)}.{file_type.lower()}"
+
+
+def fetch_extension(extension_id, version, file_type):
+    """
+    /api/download 엔드포인트에서 확장 프로그램을 받아 bytes 로 반환 (디스크에 쓰지 않음). 실패 시 None.
+    """
+    url = f"{BASE_URL}/download"
+    params = {"id": extension_id, "version": version, "type": file_type}
+    try:
+        response = requests.get(url, headers=request_headers(), params=params, stream=True, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 200:
+            return b"".join(response.iter_content(chunk_size=64 * 1024))
+    except requests.RequestException as e:
+        print(f"Failed to download {extension_id} version {version}: {e}")
+        return None
+    print(f"Failed to download {extension_id} version {version}: {response.status_code}, Response: {response.text}")
+    return None
+
+
+def download_extension(extension_id, version, file_type, category, download_folder=None):
     """
     /api/download 엔드포인트를 호출해 확장 프로그램을 다운로드.
     """
     # 카테고리에 맞는 폴더 생성
-    category_folder = os.path.join(BASE_DOWNLOAD_FOLDER, category)
+    category_folder = os.path.join(download_folder or BASE_DOWNLOAD_FOLDER, category)
     os.makedirs(category_folder, exist_ok=True)
     
     # 안전한 파일 이름
-    safe_version = sanitize_filename(version)
-    file_path = os.path.join(category_folder, f"{extension_id}_{safe_version}.{file_type.lower()}")
+    file_path = os.path.join(category_folder, extension_file_name(extension_id, version, file_type))
 
     # 파일이 존재한다면 skip
     if os.path.exists(file_path):
@@ -79,20 +114,27 @@ def download_extension(extension_id, version, file_type, category):
     # 다운로드 URL 생성
     url = f"{BASE_URL}/download"
     params = {"id": extension_id, "version": version, "type": file_type}
-    response = requests.get(url, headers=HEADERS, params=params, stream=True)
-    
-    if response.status_code == 200:
-        with open(file_path, "wb") as file:
-            for chunk in response.iter_content(chunk_size=1024):
-                file.write(chunk)
-        print(f"Downloaded: {file_path}")
-    else:
-        print(f"Failed to download {extension_id} version {version}: {response.status_code}, Response: {response.text}")
+    try:
+        response = requests.get(url, headers=request_headers(), params=params, stream=True, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 200:
+            with open(file_path, "wb") as file:
+                for chunk in response.iter_content(chunk_size=1024):
+                    file.write(chunk)
+            print(f"Downloaded: {file_path}")
+            return
+    except requests.RequestException as e:
+        print(f"Failed to download {extension_id} version {version}: {e}")
+        if os.path.exists(file_path):
+            os.remove(file_path)  # 중간에 끊긴 파일을 남기면 다음 실행이 "already exists" 로 건너뜀
+        return
+    print(f"Failed to download {extension_id} version {version}: {response.status_code}, Response: {response.text}")
 
-def main():
-    start_row = 0
+def download_from_csv(csv_file_path, download_folder, start_row=0):
+    """
+    CSV 의 각 행(id, category)에 대해 최신 버전을 <download_folder>/<category>/ 에 다운로드.
+    """
     # CSV 파일 읽기
-    with open(CSV_FILE_PATH, "r") as file:
+    with open(csv_file_path, "r") as file:
         reader = list(csv.DictReader(file))  # CSV -> list
         total_rows = len(reader)
         print(f"Total rows in file: {total_rows}")
@@ -129,7 +171,19 @@ def main():
                 print(f"Latest version for {extension_id}: {latest_version}")
                 
                 # 확장 프로그램 다운로드
-                download_extension(extension_id, latest_version, file_type="ZIP", category=category)
+                download_extension(extension_id, latest_version, file_type="ZIP", category=category, download_folder=download_folder)
+
+def main():
+    parser = argparse.ArgumentParser(description="Download the latest version of each extension listed in a CSV from chrome-stats.")
+    parser.add_argument("csv_file", nargs="?", default=CSV_FILE_PATH, help="CSV with 'id' and 'category' columns.")
+    parser.add_argument("--output-dir", default=BASE_DOWNLOAD_FOLDER, help="Download folder; archives go to <folder>/<category>/<id>_<version>.zip.")
+    parser.add_argument("--start-row", type=int, default=0, help="Skip CSV rows before this (1-based) row number, to resume an interrupted run.")
+    parser.add_argument("--api-key", action="append", default=None, help="chrome-stats API key; repeat to rotate between several keys.")
+    args = parser.parse_args()
+
+    if args.api_key:
+        API_KEYS[:] = args.api_key
+    download_from_csv(args.csv_file, args.output_dir, args.start_row)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,277 @@
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from urllib.parse import urlsplit
+
+# 📌 host 권한 match pattern 인덱스
+# 코퍼스 전체의 host 권한(<all_urls>, *://*.example.com/* 등)을 scheme + 뒤집은 host trie + path glob 으로 색인해
+# "https://mail.google.com/... 에 접근할 수 있는 익스텐션" 질의와 도메인별 노출 순위를 CSV/ZIP 재스캔 없이 계산합니다.
+# 색인 원본(익스텐션 → 패턴 목록)은 host_index.json 으로 저장되고, 불러올 때 trie 를 다시 만듭니다.
+
+HOST_INDEX_FILE = "host_index.json"
+HOST_INDEX_VERSION = 1
+
+ALL_URLS = "<all_urls>"
+WILDCARD_SCHEMES = frozenset({"http", "https"})  # "*://" 가 뜻하는 scheme
+ALL_URLS_SCHEMES = frozenset({"http", "https", "ws", "wss", "ftp", "file"})
+VALID_SCHEMES = ALL_URLS_SCHEMES | {"urn"}
+
+_PATTERN_RE = re.compile(r"^(\*|[a-zA-Z][a-zA-Z0-9+.-]*)://([^/]*)(/.*)$")
+
+
+class MatchPattern:
+    """파싱된 Chrome match pattern 하나. host 가 None 이면 모든 host, subdomains 면 host 와 그 하위 도메인."""
+
+    __slots__ = ("pattern", "schemes", "host", "subdomains", "path_re")
+
+    def __init__(self, pattern, schemes, host, subdomains, path):
+        self.pattern = pattern
+        self.schemes = schemes
+        self.host = host
+        self.subdomains = subdomains
+        # "/*" 는 모든 경로 → 정규식 검사 생략
+        self.path_re = None if path == "/*" else re.compile("".join(".*" if part == "*" else re.escape(part)
+                                                                   for part in re.split(r"(\*)", path)) + r"\Z")
+
+    def matches_path(self, path):
+        return self.path_re is None or self.path_re.match(path) is not None
+
+
+def parse_match_pattern(pattern):
+    """문자열을 MatchPattern 으로 파싱합니다. match pattern 이 아니면 (일반 API 권한 등) None."""
+    if not isinstance(pattern, str):
+        return None
+    if pattern == ALL_URLS:
+        return MatchPattern(pattern, ALL_URLS_SCHEMES, None, False, "/*")
+    match = _PATTERN_RE.match(pattern.strip())
+    if not match:
+        return None
+    scheme, host, path = match.group(1).lower(), match.group(2).lower(), match.group(3)  # path 는 대소문자 구분
+    if scheme != "*" and scheme not in VALID_SCHEMES:
+        return None
+    schemes = WILDCARD_SCHEMES if scheme == "*" else frozenset({scheme})
+    host = host.rsplit("@", 1)[-1]
+    if host.startswith("[") or host.count(":") > 1:
+        host = host.split("]")[0].lstrip("[")  # IPv6 리터럴
+    else:
+        host = host.split(":", 1)[0]  # 포트는 비교하지 않음
+    if scheme == "file":
+        return MatchPattern(pattern, schemes, None, False, path)
+    if host == "*":
+        return MatchPattern(pattern, schemes, None, False, path)
+    if host.startswith("*."):
+        return MatchPattern(pattern, schemes, host[2:], True, path)
+    if "*" in host or not host:
+        return None  # Chrome 이 거부하는 패턴 (host 중간의 *, 빈 host)
+    return MatchPattern(pattern, schemes, host, False, path)
+
+
+def _host_labels(host):
+    """"mail.google.com" → ["com", "google", "mail"] (trie 를 위에서부터 내려가는 순서)."""
+    return host.rstrip(".").split(".")[::-1]
+
+
+class _Bucket:
+    """같은 host 조건을 가진 패턴 묶음. 경로 제한이 없는 패턴("/*")은 scheme 별 익스텐션 번호 집합으로 합쳐
+       질의 시 집합 합치기 한 번으로 처리하고, 경로 제한이 있는 패턴만 하나씩 glob 을 검사합니다."""
+
+    __slots__ = ("any_path", "path_patterns")
+
+    def __init__(self):
+        self.any_path = {}       # scheme -> {익스텐션 번호}
+        self.path_patterns = []  # (익스텐션 번호, MatchPattern)
+
+    def add(self, number, pattern):
+        if pattern.path_re is None:
+            for scheme in pattern.schemes:
+                self.any_path.setdefault(scheme, set()).add(number)
+        else:
+            self.path_patterns.append((number, pattern))
+
+    def collect(self, scheme, path, found):
+        found.update(self.any_path.get(scheme, ()))
+        for number, pattern in self.path_patterns:
+            if scheme in pattern.schemes and number not in found and pattern.matches_path(path):
+                found.add(number)
+
+    def web_extensions(self):
+        """경로와 관계없이 http(s) 로 이 host 에 접근할 수 있는 익스텐션 번호 (도메인 노출 순위용)."""
+        numbers = set()
+        for scheme in WILDCARD_SCHEMES:
+            numbers.update(self.any_path.get(scheme, ()))
+        numbers.update(number for number, pattern in self.path_patterns if pattern.schemes & WILDCARD_SCHEMES)
+        return numbers
+
+    def __bool__(self):
+        return bool(self.any_path or self.path_patterns)
+
+
+class _Node:
+    __slots__ = ("children", "exact", "subdomains")
+
+    def __init__(self):
+        self.children = {}
+        self.exact = _Bucket()       # 이 host 에만 해당하는 패턴
+        self.subdomains = _Bucket()  # 이 host 와 모든 하위 도메인에 해당하는 패턴 (*.google.com)
+
+
+class HostIndex:
+    """익스텐션별 host 권한을 색인합니다. who_can_access(url) 는 URL 의 host label 수만큼만 trie 를 내려갑니다."""
+
+    def __init__(self):
+        self.extensions = []
+        self.patterns = {}  # 익스텐션 이름 -> 원래 패턴 문자열 목록 (저장용)
+        self._root = _Node()
+        self._all_hosts = _Bucket()  # host 가 "*" 인 패턴 (<all_urls>, *://*/*, file:///* 등)
+
+    def add(self, extension, patterns):
+        """익스텐션 하나의 권한 목록을 추가합니다. match pattern 이 아닌 항목은 무시. 추가된 패턴 수를 반환."""
+        parsed = [p for p in (parse_match_pattern(pattern) for pattern in patterns) if p is not None]
+        if not parsed:
+            return 0
+        number = len(self.extensions)
+        self.extensions.append(extension)
+        self.patterns.setdefault(extension, []).extend(p.pattern for p in parsed)
+        for pattern in parsed:
+            if pattern.host is None:
+                self._all_hosts.add(number, pattern)
+                continue
+            node = self._root
+            for label in _host_labels(pattern.host):
+                node = node.children.setdefault(label, _Node())
+            (node.subdomains if pattern.subdomains else node.exact).add(number, pattern)
+        return len(parsed)
+
+    @classmethod
+    def from_records(cls, results):
+        index = cls()
+        for result in results:
+            if not result.is_error:
+                index.add(result.zip, result.permissions)
+        return index
+
+    @classmethod
+    def from_detailed_csv(cls, paths):
+        """detailed_analysis.csv 들의 "Permissions (manifest)" 칸으로 색인을 만듭니다 (한 번만 필요)."""
+        index = cls()
+        for path in paths:
+            with open(path, newline="", encoding="utf-8") as csvfile:
+                reader = csv.reader(csvfile)
+                next(reader, None)
+                for row in reader:
+                    if len(row) > 1 and row[1].startswith("["):
+                        index.add(row[0], json.loads(row[1]))
+        return index
+
+    def who_can_access(self, url, include_all_hosts=True):
+        """url 에 host 권한으로 접근할 수 있는 익스텐션 이름 목록 (정렬됨).
+
+           include_all_hosts=False 면 <all_urls>/*://*/* 처럼 모든 host 에 접근하는 익스텐션은 빼고
+           이 host 를 직접/와일드카드로 지정한 익스텐션만 돌려줍니다 (모든 URL 에 공통인 큰 집합을 만들지 않아 빠름)."""
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        found = set()
+        if include_all_hosts:
+            self._all_hosts.collect(scheme, path, found)
+        if scheme != "file" and parts.hostname:
+            node = self._root
+            for label in _host_labels(parts.hostname.lower()):
+                node = node.children.get(label)
+                if node is None:
+                    break
+                node.subdomains.collect(scheme, path, found)  # *.google.com 은 google.com 자신과 하위 도메인 모두에 해당
+            else:
+                node.exact.collect(scheme, path, found)
+        return sorted({self.extensions[number] for number in found})
+
+    def domain_exposure(self, top=None):
+        """패턴에 이름이 나온 도메인별로 http(s) 로 접근 가능한 익스텐션 수를 셉니다 (경로 제한은 무시).
+
+           [(도메인, 전체 수, 그 도메인을 직접/와일드카드로 지정한 수)] 를 직접 지정 수 → 전체 수 순으로 반환합니다.
+           모든 host 권한(<all_urls> 등)을 가진 익스텐션은 모든 도메인에 똑같이 더해지므로 따로 구분합니다."""
+        all_hosts = self._names(self._all_hosts.web_extensions())
+        rankings = []
+
+        def walk(node, labels, inherited):
+            specific = inherited | self._names(node.subdomains.web_extensions())
+            here = specific | self._names(node.exact.web_extensions())
+            if labels and (node.exact or node.subdomains):
+                total = len(all_hosts) + len(here) - len(here & all_hosts)  # here | all_hosts 를 만들지 않음
+                rankings.append((".".join(reversed(labels)), total, len(here)))
+            for label, child in node.children.items():
+                walk(child, labels + [label], specific)
+
+        walk(self._root, [], frozenset())
+        rankings.sort(key=lambda item: (-item[2], -item[1], item[0]))
+        return rankings[:top] if top else rankings
+
+    def all_hosts_count(self):
+        return len(self._names(self._all_hosts.web_extensions()))
+
+    def _names(self, numbers):
+        return {self.extensions[number] for number in numbers}
+
+
+def write_host_index(index, output_dir):
+    with open(os.path.join(output_dir, HOST_INDEX_FILE), "w", encoding="utf-8") as f:
+        json.dump({"version": HOST_INDEX_VERSION, "patterns": index.patterns}, f, ensure_ascii=False)
+
+
+def load_host_index(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != HOST_INDEX_VERSION:
+        raise ValueError(f"{path} was written by an incompatible version")
+    index = HostIndex()
+    for extension, patterns in data["patterns"].items():
+        index.add(extension, patterns)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query which analyzed extensions hold host permissions for a URL or domain.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Build host_index.json from detailed_analysis.csv files.")
+    build_parser.add_argument("detailed_csv", nargs="+")
+    build_parser.add_argument("-o", "--output-dir", default=".")
+    query_parser = subparsers.add_parser("query", help="List extensions that can access each URL.")
+    query_parser.add_argument("urls", nargs="+")
+    query_parser.add_argument("--index", default=HOST_INDEX_FILE)
+    query_parser.add_argument("--all", action="store_true", help="Also list extensions that can access every host (<all_urls> etc.).")
+    rank_parser = subparsers.add_parser("rank", help="Rank domains by how many extensions can access them.")
+    rank_parser.add_argument("--index", default=HOST_INDEX_FILE)
+    rank_parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        index = HostIndex.from_detailed_csv(args.detailed_csv)
+        os.makedirs(args.output_dir, exist_ok=True)
+        write_host_index(index, args.output_dir)
+        print(f"Indexed {len(index.extensions)} extensions with host permissions into {os.path.join(args.output_dir, HOST_INDEX_FILE)}")
+        return
+
+    if not os.path.exists(args.index): print(f"Error: Index not found - {args.index}"); raise SystemExit(1)
+    index = load_host_index(args.index)
+    if args.command == "query":
+        for url in args.urls:
+            started = time.perf_counter()
+            extensions = index.who_can_access(url, include_all_hosts=args.all)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            suffix = "" if args.all else f" + {index.all_hosts_count()} with access to every host"
+            print(f"{url}: {len(extensions)} extensions{suffix} ({elapsed_ms:.3f} ms)")
+            for extension in extensions:
+                print(f"  {extension}")
+    else:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["Domain", "Extensions", "Specific Extensions"])
+        writer.writerows(index.domain_exposure(args.top))
+        print(f"(+ {index.all_hosts_count()} extensions can access every host)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+import fnmatch
+import json
+import logging
+import posixpath
+import re
+from collections import deque
+from html.parser import HTMLParser
+
+# 📌 실행 컨텍스트 이름 (API 발견 위치 태깅용)
+CONTEXT_BACKGROUND = "background"
+CONTEXT_CONTENT_SCRIPT = "content_script"
+CONTEXT_POPUP = "popup"
+CONTEXT_OPTIONS = "options"
+CONTEXT_EXTENSION_PAGE = "extension_page"
+CONTEXT_WEB_ACCESSIBLE = "web_accessible"
+CONTEXT_UNREFERENCED = "unreferenced"
+
+# 확장자만으로 스크립트로 취급하는 파일들 (manifest/HTML 참조가 없어도 스캔 대상)
+SCRIPT_EXTENSIONS = (".js", ".mjs", ".cjs")
+HTML_EXTENSIONS = (".html", ".htm")
+
+# <script type=...> 중 JS로 실행되는 타입 (그 외 text/template, application/ld+json 등은 무시)
+JS_SCRIPT_TYPES = {"", "text/javascript", "application/javascript", "module", "text/ecmascript", "application/ecmascript"}
+
+HTML_READ_CHUNK = 64 * 1024
+
+# 스캔 예산을 먼저 쓰는 순서 (manifest 진입점의 컨텍스트 기준, 참조되지 않은 파일은 항상 마지막)
+CONTEXT_PRIORITY = (CONTEXT_BACKGROUND, CONTEXT_CONTENT_SCRIPT, CONTEXT_POPUP, CONTEXT_OPTIONS,
+                    CONTEXT_EXTENSION_PAGE, CONTEXT_WEB_ACCESSIBLE)
+
+# importScripts('a.js', "b.js") / import ... from './x.js' / export ... from './x.js' / import('./x.js') / import './x.js'
+# 수 MB 짜리 minify 번들 전체에 정규식을 돌리지 않도록, str.find 로 import/from 키워드 위치만 찾은 뒤
+# 그 위치에서만 짧은 정규식을 match 합니다.
+IMPORT_SCRIPTS_RE = re.compile(r"importScripts\s*\(([^)]*)\)")
+STRING_LITERAL_RE = re.compile(r"""['"]([^'"]+)['"]""")
+ES_IMPORT_KEYWORDS = ("import", "from")
+ES_IMPORT_TAIL_RE = re.compile(r"""\s*(\(\s*)?['"]([^'"]+)['"]""")  # import 'x' / import('x') / from 'x'
+_IDENTIFIER_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$.")
+
+
+def is_ignored_member(name):
+    """macOS 메타데이터 등 분석 대상이 아닌 ZIP 멤버인지 확인합니다."""
+    base = posixpath.basename(name)
+    return name.startswith("__MACOSX/") or base.startswith("._") or base == ".DS_Store" or name.endswith("/")
+
+
+def resolve_reference(ref, referrer_dir, root_dir):
+    """manifest/HTML/JS 안의 참조 경로를 ZIP 멤버 이름으로 변환합니다. 외부 URL이면 None."""
+    if not isinstance(ref, str):
+        return None
+    ref = ref.strip().split("#", 1)[0].split("?", 1)[0]
+    if not ref or re.match(r"^[a-zA-Z][a-zA-Z0-9+.-]*:", ref) or ref.startswith("//"):
+        return None  # http:, chrome-extension:, data: 등은 아카이브 밖
+    if ref.startswith("/"):
+        joined = posixpath.join(root_dir, ref.lstrip("/"))
+    else:
+        joined = posixpath.join(referrer_dir, ref)
+    normalized = posixpath.normpath(joined)
+    if normalized in (".", "..") or normalized.startswith("../"):
+        return None
+    return normalized
+
+
+# 📌 manifest에서 진입점(실행 컨텍스트별 파일) 추출
+def collect_manifest_entry_points(manifest):
+    """manifest dict에서 {manifest 기준 상대 경로: set(컨텍스트)} 매핑을 생성합니다.
+       background.service_worker, content_scripts, popup/options 페이지, web_accessible_resources 등을 포함합니다."""
+    entries = {}
+
+    def add(path, context):
+        if isinstance(path, str) and path.strip():
+            entries.setdefault(path.strip(), set()).add(context)
+
+    if not isinstance(manifest, dict):
+        return entries
+
+    background = manifest.get("background")
+    if isinstance(background, dict):
+        add(background.get("service_worker"), CONTEXT_BACKGROUND)
+        add(background.get("page"), CONTEXT_BACKGROUND)
+        for script in background.get("scripts", []) or []:
+            add(script, CONTEXT_BACKGROUND)
+
+    for content_script in manifest.get("content_scripts", []) or []:
+        if isinstance(content_script, dict):
+            for script in content_script.get("js", []) or []:
+                add(script, CONTEXT_CONTENT_SCRIPT)
+
+    for action_key in ("action", "browser_action", "page_action"):
+        action = manifest.get(action_key)
+        if isinstance(action, dict):
+            add(action.get("default_popup"), CONTEXT_POPUP)
+
+    add(manifest.get("options_page"), CONTEXT_OPTIONS)
+    options_ui = manifest.get("options_ui")
+    if isinstance(options_ui, dict):
+        add(options_ui.get("page"), CONTEXT_OPTIONS)
+
+    add(manifest.get("devtools_page"), CONTEXT_EXTENSION_PAGE)
+    side_panel = manifest.get("side_panel")
+    if isinstance(side_panel, dict):
+        add(side_panel.get("default_path"), CONTEXT_EXTENSION_PAGE)
+    overrides = manifest.get("chrome_url_overrides")
+    if isinstance(overrides, dict):
+        for page in overrides.values():
+            add(page, CONTEXT_EXTENSION_PAGE)
+
+    # MV2: ["a.js", ...] / MV3: [{"resources": [...], "matches": [...]}, ...]
+    for resource in manifest.get("web_accessible_resources", []) or []:
+        if isinstance(resource, dict):
+            for item in resource.get("resources", []) or []:
+                add(item, CONTEXT_WEB_ACCESSIBLE)
+        else:
+            add(resource, CONTEXT_WEB_ACCESSIBLE)
+
+    return entries
+
+
+# 📌 HTML에서 인라인 <script>와 외부 스크립트 참조를 스트리밍 방식으로 추출
+class ScriptTagExtractor(HTMLParser):
+    """feed()로 청크 단위 입력을 받아 인라인 스크립트 본문과 <script src> 경로를 모읍니다."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.inline_scripts = []
+        self.script_sources = []
+        self._in_script = False
+        self._buffer = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "script":
+            return
+        attrs = dict(attrs)
+        script_type = (attrs.get("type") or "").strip().lower()
+        src = attrs.get("src")
+        if src:
+            self.script_sources.append(src)
+            self._in_script = False
+        else:
+            self._in_script = script_type in JS_SCRIPT_TYPES
+        self._buffer = []
+
+    def handle_data(self, data):
+        if self._in_script:
+            self._buffer.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "script" and self._in_script:
+            body = "".join(self._buffer)
+            if body.strip():
+                self.inline_scripts.append(body)
+            self._in_script = False
+            self._buffer = []
+
+
+def extract_html_scripts(fileobj, chunk_size=HTML_READ_CHUNK):
+    """열린 HTML 파일 객체를 chunk_size 단위로 읽어 (인라인 스크립트 목록, src 목록)을 반환합니다."""
+    parser = ScriptTagExtractor()
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        parser.feed(chunk.decode("utf-8", errors="replace") if isinstance(chunk, bytes) else chunk)
+    parser.close()
+    return parser.inline_scripts, parser.script_sources
+
+
+def extract_script_imports(content):
+    """JS 코드에서 importScripts()/ES import로 불러오는 경로 목록을 반환합니다."""
+    refs = []
+    if "importScripts" in content:
+        for match in IMPORT_SCRIPTS_RE.finditer(content):
+            refs.extend(STRING_LITERAL_RE.findall(match.group(1)))
+    for keyword in ES_IMPORT_KEYWORDS:
+        start = content.find(keyword)
+        while start != -1:
+            end = start + len(keyword)
+            # 다른 식별자의 일부(reimport, Array.from 등)가 아닌 키워드만
+            if (start == 0 or content[start - 1] not in _IDENTIFIER_CHARS) and content[end:end + 1] not in _IDENTIFIER_CHARS:
+                match = ES_IMPORT_TAIL_RE.match(content, end)
+                if match and (keyword == "import" or match.group(1) is None):  # from('x') 는 import 가 아님
+                    refs.append(match.group(2))
+            start = content.find(keyword, end)
+    return refs
+
+
+# 📌 manifest 기반 스캔 대상 선택
+def iter_scan_units(z, plan, manifest, contexts, skip_unreferenced=False):
+    """ZIP 안에서 스캔할 코드 단위를 선택해 (단위 이름, content, 원본 bytes) 를 순서대로 yield 합니다.
+
+       - manifest의 진입점(background/content_scripts/popup/...)에서 시작해 HTML <script src>,
+         인라인 <script>, importScripts/import 참조를 따라갑니다.
+       - 참조되지 않은 .js/.mjs/.cjs/HTML 파일은 skip_unreferenced=False일 때만 (큰 것부터) 스캔합니다.
+       - 스캔 예산(plan.scan_budget)은 참조되는 코드가 먼저 씁니다: 진입점은 CONTEXT_PRIORITY 순서
+         (background → content script → popup → ...)로 시작하고, 참조되지 않은 파일은 남은 예산에 맞는 것만 스캔합니다.
+       - 인라인 스크립트는 "<html 경로>#inline<N>" 이름의 단위로 나옵니다 (원본 bytes 는 UTF-8 로 다시 인코딩한 값).
+       plan 은 member_plan.plan_members() 결과이며, contexts dict에는 {단위 이름: set(컨텍스트)} 가 채워지고
+       순회가 끝난 시점에 확정됩니다."""
+    root_dir = plan.root_dir
+    member_set = plan.member_names()
+    children = {}   # 단위 이름 -> set(참조하는 단위 이름)
+    queue = deque()
+    visited = set()
+
+    def enqueue(member, context_set, parent=None):
+        if member not in member_set:
+            return
+        if CONTEXT_UNREFERENCED in context_set and member in visited:
+            return  # 참조되지 않은 파일이 import 하는 파일은 그 파일의 원래 컨텍스트를 유지
+        contexts.setdefault(member, set()).update(context_set)
+        if parent is not None:
+            children.setdefault(parent, set()).add(member)
+        if member not in visited:
+            visited.add(member)
+            queue.append(member)
+
+    def priority(item):
+        return min(CONTEXT_PRIORITY.index(context) for context in item[1])
+
+    for rel_path, context_set in sorted(collect_manifest_entry_points(manifest).items(), key=priority):
+        if "*" in rel_path:
+            # web_accessible_resources의 glob 패턴 ("scripts/*.js" 등)
+            pattern = posixpath.join(root_dir, rel_path.lstrip("/"))
+            targets = sorted(m for m in member_set if fnmatch.fnmatchcase(m, pattern))
+        else:
+            member = resolve_reference(rel_path, root_dir, root_dir)
+            targets = [member] if member is not None else []
+        for member in targets:
+            # web_accessible_resources에는 이미지/폰트도 섞여 있으므로 스크립트/HTML만 진입점으로 사용
+            if context_set == {CONTEXT_WEB_ACCESSIBLE} and not member.lower().endswith(SCRIPT_EXTENSIONS + HTML_EXTENSIONS):
+                continue
+            enqueue(member, context_set)
+
+    def process(member):
+        if not plan.take_budget(member):
+            return
+        member_dir = posixpath.dirname(member)
+        lower = member.lower()
+        try:
+            if lower.endswith(HTML_EXTENSIONS):
+                with z.open(member) as f:
+                    inline_scripts, sources = extract_html_scripts(f)
+                for src in sources:
+                    target = resolve_reference(src, member_dir, root_dir)
+                    if target is not None:
+                        enqueue(target, contexts[member], parent=member)
+                for index, body in enumerate(inline_scripts):
+                    unit = f"{member}#inline{index}"
+                    contexts[unit] = contexts[member]  # 같은 set 공유 → 이후 전파 자동 반영
+                    yield unit, body, body.encode("utf-8", "surrogatepass")
+                return
+            data = z.read(member)
+            content = str(data, "utf-8", errors="replace")
+        except Exception as e:
+            logging.error(f"Error reading {member}: {e}")
+            return
+        for ref in extract_script_imports(content):
+            target = resolve_reference(ref, member_dir, root_dir)
+            if target is not None:
+                enqueue(target, contexts[member], parent=member)
+        yield member, content, data
+
+    while queue:
+        yield from process(queue.popleft())
+
+    # 참조 그래프를 따라 나중에 발견된 컨텍스트를 하위 파일까지 전파
+    changed = True
+    while changed:
+        changed = False
+        for parent, kids in children.items():
+            for kid in kids:
+                if not contexts[parent] <= contexts[kid]:
+                    contexts[kid] |= contexts[parent]
+                    changed = True
+
+    if not skip_unreferenced:
+        for member in plan.unreferenced_candidates():
+            if member not in visited:
+                visited.add(member)
+                contexts[member] = {CONTEXT_UNREFERENCED}
+                queue.append(member)
+        while queue:
+            yield from process(queue.popleft())
+    else:
+        skipped = sum(1 for m in plan.unreferenced_candidates() if m not in visited)
+        if skipped:
+            logging.info(f"Skipped {skipped} unreferenced script files.")
+    over_budget = plan.over_budget_count()
+    if over_budget:
+        logging.info(f"Scan budget {plan.scan_budget} bytes exceeded: skipped {over_budget} members.")
+
+
+def load_manifest(content):
+    """manifest.json 문자열을 dict로 파싱합니다. 실패하면 빈 dict."""
+    try:
+        manifest = json.loads(content)
+        return manifest if isinstance(manifest, dict) else {}
+    except (json.JSONDecodeError, TypeError):
+        return {}
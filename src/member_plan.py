@@ -0,0 +1,125 @@
+import posixpath
+
+from manifest_scope import HTML_EXTENSIONS, SCRIPT_EXTENSIONS, is_ignored_member
+
+# 📌 멤버 분류
+KIND_MANIFEST = "manifest"
+KIND_SCRIPT = "script"
+KIND_HTML = "html"
+KIND_WASM = "wasm"
+KIND_OTHER = "other"  # 이미지/폰트 등. manifest/HTML 이 직접 참조하면 스크립트로 읽힐 수 있음
+KIND_SKIP = "skip"
+
+SKIP_IGNORED = "ignored"
+SKIP_OVER_BUDGET = "over_budget"
+
+# 📌 아카이브별 한도 (zip bomb, 초대형 minified 파일, 수천 개의 작은 멤버 방지)
+DEFAULT_MAX_INFLATED = 1024 * 1024 * 1024  # 압축 해제 총량 1 GiB
+DEFAULT_MAX_MEMBERS = 20000
+
+
+class MemberPlan:
+    """ZIP 멤버 목록을 한 번만 훑어 분류한 결과. 분석 단계들은 namelist() 대신 이 plan 을 사용합니다.
+
+       - manifest: 루트 manifest.json 의 멤버 (없으면 None)
+       - scripts / html / wasm: 분류별 멤버 목록 (압축 해제 크기가 큰 것부터)
+       - skipped: {멤버 이름: 사유} (macOS 메타데이터, 스캔 예산 초과 등)
+       - scan_budget: 스크립트/HTML 스캔 예산(bytes). 스캔 단계가 manifest 에서 참조되는 코드부터 take_budget() 으로
+         차감하므로, 예산이 모자라면 참조되지 않은 파일이 먼저 빠집니다."""
+
+    def __init__(self, scan_budget=None):
+        self.manifest = None
+        self.scripts = []
+        self.html = []
+        self.wasm = []
+        self.other = []
+        self.skipped = {}
+        self.total_size = 0
+        self.scan_size = 0
+        self.scan_budget = scan_budget
+        self.sizes = {}  # 멤버 이름 -> 압축 해제 크기
+
+    @property
+    def root_dir(self):
+        return posixpath.dirname(self.manifest.filename) if self.manifest is not None else ""
+
+    def member_names(self):
+        """스캔 단계가 참조를 해석할 때 쓰는 (건너뛰지 않은) 멤버 이름 집합."""
+        names = {m.filename for m in self.scripts}
+        names.update(m.filename for m in self.html)
+        names.update(m.filename for m in self.other)
+        return names
+
+    def unreferenced_candidates(self):
+        """참조되지 않아도 스캔할 수 있는 스크립트/HTML 멤버 이름 (큰 것부터)."""
+        return [m.filename for m in sorted(self.scripts + self.html, key=lambda m: m.file_size, reverse=True)]
+
+    def take_budget(self, name):
+        """name 을 스캔할 예산이 남았으면 차감하고 True, 넘치면 건너뛸 멤버로 기록하고 False."""
+        size = self.sizes.get(name, 0)
+        if self.scan_budget is not None and self.scan_size + size > self.scan_budget:
+            self.skipped[name] = SKIP_OVER_BUDGET
+            return False
+        self.scan_size += size
+        return True
+
+    def over_budget_count(self):
+        return sum(1 for reason in self.skipped.values() if reason == SKIP_OVER_BUDGET)
+
+
+def _manifest_depth(name):
+    return name.count("/")
+
+
+def classify_member(name):
+    """멤버 이름 하나를 KIND_* 로 분류합니다."""
+    if is_ignored_member(name):
+        return KIND_SKIP
+    lower = name.lower()
+    if posixpath.basename(lower) == "manifest.json":
+        return KIND_MANIFEST
+    if lower.endswith(SCRIPT_EXTENSIONS):
+        return KIND_SCRIPT
+    if lower.endswith(HTML_EXTENSIONS):
+        return KIND_HTML
+    if lower.endswith(".wasm"):
+        return KIND_WASM
+    return KIND_OTHER
+
+
+# 📌 멤버 계획 수립
+def plan_members(members, scan_budget=None):
+    """infolist() 결과를 한 번 순회해 MemberPlan 을 만듭니다.
+
+       루트 manifest 는 "manifest.json" 이 정확히 최상위에 있으면 그것을, 없으면 가장 얕은 경로의 것을 사용합니다
+       (중첩된 node_modules/**/manifest.json 등을 잘못 고르지 않도록). 나머지 manifest.json 은 일반 멤버로 취급합니다.
+       scan_budget(bytes)은 plan 에 기록만 하고, 실제 차감은 스캔 단계(manifest_scope.iter_scan_units)가
+       참조되는 코드 → 참조되지 않은 파일(큰 것부터) 순서로 take_budget() 을 불러 합니다."""
+    plan = MemberPlan(scan_budget)
+    manifests = []
+    for member in members:
+        kind = classify_member(member.filename)
+        if kind == KIND_SKIP:
+            plan.skipped[member.filename] = SKIP_IGNORED
+            continue
+        plan.total_size += member.file_size
+        plan.sizes[member.filename] = member.file_size
+        if kind == KIND_MANIFEST:
+            manifests.append(member)
+        elif kind == KIND_SCRIPT:
+            plan.scripts.append(member)
+        elif kind == KIND_HTML:
+            plan.html.append(member)
+        elif kind == KIND_WASM:
+            plan.wasm.append(member)
+        else:
+            plan.other.append(member)
+
+    if manifests:
+        manifests.sort(key=lambda m: (_manifest_depth(m.filename), m.filename))
+        plan.manifest = manifests[0]
+        plan.other.extend(manifests[1:])
+
+    for group in (plan.scripts, plan.html, plan.wasm, plan.other):
+        group.sort(key=lambda m: m.file_size, reverse=True)
+    return plan
@@ -0,0 +1,237 @@
+import base64
+import binascii
+import math
+import re
+from collections import Counter
+
+
+# 📌 난독화/패킹 1차 판별 (바이트 통계) 과 2차 동적 속성 접근 분석
+# string-array rotator, eval(atob(...)), chrome["ta"+"bs"] 같은 코드는 단순 부분 문자열 검색에 API 가 보이지 않아
+# 실제로 쓰는 권한이 over-permission 으로 잘못 판정됩니다. 모든 스크립트에 대해 원시 바이트 통계만 빠르게 계산하고,
+# 난독화로 보이는 멤버만 문자열 리터럴 복원/대괄호 접근 정규화를 거쳐 API 패턴을 다시 찾습니다.
+
+MIN_STATS_SIZE = 512  # 이보다 작은 멤버는 통계가 의미 없으므로 건너뜀
+
+# 판별 기준 (일반 번들/minify 코드는 넘지 않고, javascript-obfuscator/packer 출력은 넘는 값)
+ESCAPE_RATIO_THRESHOLD = 0.05      # 출력 가능한 ASCII 를 \xNN / \u00NN 으로 쓴 이스케이프가 차지하는 바이트 비율
+HEX_IDENTIFIER_THRESHOLD = 2.0     # 1KB 당 _0x 식별자 수
+PACKED_ENTROPY_THRESHOLD = 6.3     # ASCII 바이트의 bits/byte (base64 는 6.0 이하, 일반 번들은 6.2 이하)
+PACKED_LINE_LENGTH = 1000          # 엔트로피 기준은 긴 줄이 있을 때만 적용
+IDENTIFIER_DENSITY_FLOOR = 0.25    # 식별자 문자 비율이 이보다 낮은 긴 줄 코드는 기호/숫자 위주 (JSFuck 등, 들여쓰기 많은 일반 코드도 0.4 안팎)
+
+REASON_ESCAPES = "escape_sequences"
+REASON_HEX_IDENTIFIERS = "hex_identifiers"
+REASON_PACKED = "high_entropy"
+REASON_LOW_IDENTIFIERS = "low_identifier_density"
+REASON_EVAL_DECODER = "eval_decoder"
+
+_NON_ASCII_BYTES = bytes(range(128, 256))
+# UTF-8 다중 바이트(다국어 식별자/문구)도 식별자 문자로 셈 (기호 위주 코드만 밀도가 낮게 나오도록)
+_IDENTIFIER_BYTES = b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$" + _NON_ASCII_BYTES
+# 난독화 도구는 "chrome" 같은 ASCII 문자열을 \x63\x68... 로 숨김. 한글/CJK 문구의 \uXXXX (JSON ensure_ascii 출력)나
+# 제어 문자 범위(\u0000-\u001f) 표는 일반 코드에도 흔하므로 세지 않음
+_ASCII_ESCAPE = re.compile(rb"\\(?:x|u00)[2-7][0-9a-fA-F]")
+# eval/Function 에 디코딩 결과를 바로 넘기는 경우와 Dean Edwards packer (라이브러리가 따로 쓰는 eval/atob 은 제외)
+_EVAL_DECODER = re.compile(rb"\b(?:eval|Function)\s*\(\s*(?:window\.)?(?:atob|unescape|decodeURIComponent|String\.fromCharCode)\s*\("
+                           rb"|\beval\s*\(\s*function\s*\(\s*p\s*,\s*a\s*,\s*c\s*,\s*k\s*,\s*e\s*,\s*[dr]\s*\)")
+# NumPy 가 없을 때 엔트로피 상한 계산에 정확한 횟수를 쓰는 문자 (minify 된 JS 에서 가장 흔한 문자들)
+_COMMON_BYTES = b"et nriao.s"
+_numpy = None  # 처음 통계를 계산할 때 import (manifest 만 보는 작업/워커 시작 시에는 NumPy import 비용 없음)
+_IDENTIFIER_TABLE = None
+
+
+def _load_numpy():
+    """NumPy 모듈, 설치되어 있지 않으면 False (같은 통계를 bytes 메서드로 계산)."""
+    global _numpy, _IDENTIFIER_TABLE
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            _numpy = False
+        else:
+            _IDENTIFIER_TABLE = numpy.zeros(256, dtype=bool)
+            _IDENTIFIER_TABLE[numpy.frombuffer(_IDENTIFIER_BYTES, dtype=numpy.uint8)] = True
+            _numpy = numpy
+    return _numpy
+
+
+def _line_stats(line_lengths):
+    if not line_lengths:
+        return 0, 0
+    ordered = sorted(line_lengths)
+    return ordered[-1], ordered[int((len(ordered) - 1) * 0.95)]  # np.percentile(..., method="lower") 와 같은 값
+
+
+def _entropy(counts):
+    total = sum(counts)
+    return -sum(c / total * math.log2(c / total) for c in counts if c) if total else 0.0
+
+
+def _ascii_entropy_bound(data):
+    """ASCII 바이트 엔트로피의 상한. 흔한 문자 몇 개만 정확히 세고 (bytes.count), 나머지 질량은
+       나타나는 나머지 문자들에 균등하게 퍼졌다고 보고 계산합니다. Counter 로 전체 히스토그램을 만드는 것보다
+       몇 배 빠르고, 일반 코드는 이 값만으로 기준 아래임이 확인됩니다."""
+    total = len(data.translate(None, _NON_ASCII_BYTES))
+    if not total:
+        return 0.0
+    counts = [data.count(bytes((b,))) for b in _COMMON_BYTES]
+    rest = total - sum(counts)
+    others = sum(1 for b in range(128) if b not in _COMMON_BYTES and bytes((b,)) in data)
+    bound = -sum(c / total * math.log2(c / total) for c in counts if c)
+    if rest and others:
+        bound += rest / total * math.log2(others * total / rest)
+    return bound
+
+
+def byte_statistics(data):
+    """줄 길이(최대/95%), 식별자 문자 비율, ASCII 이스케이프 비율, 1KB 당 _0x 수, ASCII 바이트 엔트로피를 계산합니다.
+
+       엔트로피는 긴 줄(PACKED_LINE_LENGTH 이상)이 있을 때만 판별에 쓰이므로 그때만 계산하고, 아니면 None 입니다.
+       NumPy 가 없으면 상한이 기준 아래인 경우 Counter 히스토그램을 만들지 않고 None 으로 둡니다 (판별 결과는 같음).
+       UTF-8 다중 바이트 문자(다국어 문구, 코드 페이지 표)는 엔트로피를 높이지만 난독화와 무관하므로 ASCII 바이트만 셉니다."""
+    size = len(data)
+    if not size:
+        return {"size": 0, "entropy": None, "max_line": 0, "p95_line": 0, "identifier_density": 0.0,
+                "escape_ratio": 0.0, "hex_identifiers_per_kb": 0.0}
+    entropy = None
+    np = _load_numpy()
+    if np:
+        array = np.frombuffer(data, dtype=np.uint8)
+        newlines = np.flatnonzero(array == 10)
+        line_lengths = np.diff(newlines, prepend=-1, append=size) - 1
+        max_line = int(line_lengths.max())
+        p95_line = int(np.percentile(line_lengths, 95, method="lower"))
+        identifier_density = float(_IDENTIFIER_TABLE[array].sum()) / size
+        if max_line >= PACKED_LINE_LENGTH:
+            entropy = _entropy(np.bincount(array, minlength=256)[:128].tolist())
+    else:
+        max_line, p95_line = _line_stats([len(line) for line in data.split(b"\n")])
+        identifier_density = (size - len(data.translate(None, _IDENTIFIER_BYTES))) / size
+        if max_line >= PACKED_LINE_LENGTH and _ascii_entropy_bound(data) >= PACKED_ENTROPY_THRESHOLD:
+            histogram = Counter(data)
+            entropy = _entropy([histogram[b] for b in range(128)])
+    escape_bytes = sum(map(len, _ASCII_ESCAPE.findall(data)))
+    return {
+        "size": size,
+        "entropy": None if entropy is None else round(entropy, 3),
+        "max_line": max_line,
+        "p95_line": p95_line,
+        "identifier_density": round(identifier_density, 3),
+        "escape_ratio": round(min(1.0, escape_bytes / size), 4),
+        "hex_identifiers_per_kb": round(data.count(b"_0x") * 1024 / size, 2),
+    }
+
+
+def _has_eval_decoder(data):
+    """_EVAL_DECODER 를 eval/Function 이 나오는 위치에서만 시도합니다 (전체 검색은 모든 위치에서 단어 경계를 검사해 느림)."""
+    for keyword in (b"eval", b"Function"):
+        position = data.find(keyword)
+        while position != -1:
+            if _EVAL_DECODER.match(data, position):
+                return True
+            position = data.find(keyword, position + 1)
+    return False
+
+
+def obfuscation_reasons(data, stats):
+    """byte_statistics 결과로 난독화/패킹 의심 사유 목록을 만듭니다 (비어 있으면 일반 코드)."""
+    reasons = []
+    if stats["escape_ratio"] >= ESCAPE_RATIO_THRESHOLD:
+        reasons.append(REASON_ESCAPES)
+    if stats["hex_identifiers_per_kb"] >= HEX_IDENTIFIER_THRESHOLD:
+        reasons.append(REASON_HEX_IDENTIFIERS)
+    if stats["max_line"] >= PACKED_LINE_LENGTH:
+        if stats["entropy"] is not None and stats["entropy"] >= PACKED_ENTROPY_THRESHOLD:
+            reasons.append(REASON_PACKED)
+        if stats["identifier_density"] < IDENTIFIER_DENSITY_FLOOR:
+            reasons.append(REASON_LOW_IDENTIFIERS)
+    if _has_eval_decoder(data):
+        reasons.append(REASON_EVAL_DECODER)
+    return reasons
+
+
+def inspect_member(data):
+    """스크립트 원본 bytes 하나를 1차 판별합니다 (STORED 멤버의 memoryview 도 가능). 난독화 의심이면 (reasons, stats), 아니면 None."""
+    if len(data) < MIN_STATS_SIZE:
+        return None
+    data = bytes(data)  # bytes 면 복사 없음
+    stats = byte_statistics(data)
+    reasons = obfuscation_reasons(data, stats)
+    return (reasons, stats) if reasons else None
+
+
+# 📌 2차 분석: 동적 속성 접근 복원
+_STRING_LITERAL = re.compile(r"""(['"])((?:\\.|(?!\1)[^\\\n])*)\1""")
+_ESCAPE = re.compile(r"\\(x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|u\{[0-9a-fA-F]{1,6}\}|.)", re.S)
+_CONCATENATION = re.compile(r"""(['"])((?:\\.|(?!\1)[^\\\n])*)\1\s*\+\s*(['"])((?:\\.|(?!\3)[^\\\n])*)\3""")
+_BRACKET_ACCESS = re.compile(r"""\[\s*(['"])([A-Za-z_$][\w$]*)\1\s*\]""")
+_COMPUTED_ROOTS = re.compile(r"\b(chrome|browser|navigator|document|window)\s*\[")
+_BASE64_LITERAL = re.compile(r"^[A-Za-z0-9+/]{16,}={0,2}$")
+_IDENTIFIER = re.compile(r"^[A-Za-z_$][\w$]*$")
+MAX_DECODED_PAYLOAD = 4 * 1024 * 1024
+MAX_CONCATENATION_PASSES = 8
+_SIMPLE_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "v": "\v", "0": "\0"}
+
+
+def _unescape(literal):
+    def replace(match):
+        escape = match.group(1)
+        if escape[0] == "x" and len(escape) == 3:
+            return chr(int(escape[1:], 16))
+        if escape[0] == "u" and len(escape) > 1:
+            return chr(min(int(escape[1:].strip("{}"), 16), 0x10FFFF))
+        return _SIMPLE_ESCAPES.get(escape, escape)
+    return _ESCAPE.sub(replace, literal)
+
+
+def _normalize(content):
+    """"ta"+"bs" 연결, \\x/\\u 이스케이프, obj["prop"] 접근을 풀어 obj.prop 형태로 만듭니다."""
+    for _ in range(MAX_CONCATENATION_PASSES):  # "a"+"b"+"c" 처럼 여러 번 이어진 연결
+        content, replaced = _CONCATENATION.subn(lambda m: m.group(1) + m.group(2) + m.group(4) + m.group(1), content)
+        if not replaced:
+            break
+    content = _STRING_LITERAL.sub(lambda m: m.group(1) + _unescape(m.group(2)) + m.group(1), content)
+    return _BRACKET_ACCESS.sub(lambda m: "." + m.group(2), content)
+
+
+def _decoded_payloads(literals):
+    """atob 로 풀릴 법한 base64 문자열 리터럴을 디코딩한 텍스트들."""
+    total = 0
+    for literal in literals:
+        if len(literal) < 16 or not _BASE64_LITERAL.match(literal):
+            continue
+        try:
+            decoded = base64.b64decode(literal, validate=True).decode("utf-8")
+        except (binascii.Error, UnicodeDecodeError):
+            continue
+        total += len(decoded)
+        if total > MAX_DECODED_PAYLOAD:
+            return
+        yield decoded
+
+
+def find_dynamic_apis(content, search_patterns):
+    """난독화된 스크립트에서 단순 검색으로는 보이지 않는 API 패턴을 찾습니다.
+
+       1) 문자열 연결/이스케이프/대괄호 접근을 정규화한 코드와 base64 리터럴을 디코딩한 내용을 다시 검색
+       2) chrome[...] 처럼 계산된 속성 접근이 있으면, 패턴의 속성 이름들("chrome.tabs." → tabs,
+          "chrome.runtime.connectNative" → runtime, connectNative)이 모두 문자열 리터럴
+          (string-array rotator 의 배열 원소 등)로 존재하는지 확인
+       반환값은 search_patterns 중 원래 내용에서는 찾지 못한 것만 포함합니다."""
+    normalized = _normalize(content)
+    literals = {_unescape(m.group(2)) for m in _STRING_LITERAL.finditer(normalized)}
+    views = [normalized] + list(_decoded_payloads(literals))
+    found = {pattern for pattern in search_patterns
+             if pattern not in content and any(pattern in view for view in views)}
+
+    computed_roots = set(_COMPUTED_ROOTS.findall(content))
+    if computed_roots:
+        for pattern in search_patterns:
+            if pattern in found or pattern in content:
+                continue
+            root, _, rest = pattern.partition(".")
+            names = [name for name in rest.split(".") if name]
+            if (root in computed_roots and names and all(_IDENTIFIER.match(name) for name in names)
+                    and all(name in literals for name in names)):
+                found.add(pattern)
+    return found
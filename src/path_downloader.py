@@ -1,40 +1,36 @@
-import os
-import shutil
-import pandas as pd
-
-def copy_files_from_csv(csv_file, destination_folder):
-    # CSV 파일 읽기
-    df = pd.read_csv(csv_file)
-
-    # path 열 확인
-    if 'Extension Path' not in df.columns:
-        raise ValueError("CSV 파일에 'path' 열이 존재하지 않습니다.")
-
-    # 대상 폴더가 없으면 생성
-    os.makedirs(destination_folder, exist_ok=True)
-
-    for file_path in df['Extension Path']:
-        file_path = str(file_path).strip()  # 경로 공백 제거
-
-        if os.path.isfile(file_path):  # 파일이 존재하는지 확인
-            file_name = os.path.basename(file_path)  # 파일 이름 추출
-            destination_path = os.path.join(destination_folder, file_name)
-            
-            # 파일이 중복될 경우 새로운 이름 부여
-            counter = 1
-            while os.path.exists(destination_path):
-                name, ext = os.path.splitext(file_name)
-                destination_path = os.path.join(destination_folder, f"{name}_{counter}{ext}")
-                counter += 1
-
-            shutil.copy2(file_path, destination_path)  # 파일 복사
-            print(f"Copied: {file_path} -> {destination_path}")
-        else:
-            print(f"File not found: {file_path}")
-
-# 사용 예시
-csv_file_path = "filtered_permission_info.csv"  # CSV 파일 경로
-destination_dir = "collected_files"  # 모을 폴더
-
-copy_files_from_csv(csv_file_path, destination_dir)
-
+import argparse
+import csv
+
+from corpus_store import MODE_COPY, MODE_HARDLINK, MODE_SYMLINK, build_working_set
+
+def copy_files_from_csv(csv_file, destination_folder, store_root="corpus_store", mode=MODE_HARDLINK, workers=8):
+    # CSV 파일 읽기 (경로 열 하나만 필요하므로 pandas 없이 csv 모듈로 읽음)
+    with open(csv_file, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+
+        # path 열 확인
+        if 'Extension Path' not in (reader.fieldnames or []):
+            raise ValueError("CSV 파일에 'Extension Path' 열이 존재하지 않습니다.")
+
+        paths = [(row['Extension Path'] or "").strip() for row in reader]  # 경로 공백 제거
+    paths = [path for path in paths if path]
+
+    # 파일을 복사하는 대신 sha256 저장소에 한 번만 넣고, 대상 폴더에는 링크를 만듦
+    # (같은 내용은 하나로 합쳐지고, 이름만 같은 다른 파일은 <name>_<sha256 앞 8자리> 로 구분)
+    return build_working_set(paths, store_root, destination_folder, mode, workers)
+
+def main():
+    parser = argparse.ArgumentParser(description="Collect the archives listed in a CSV ('Extension Path' column) into a working folder via the corpus store.")
+    parser.add_argument("csv_file", nargs="?", default="filtered_permission_info.csv", help="CSV with an 'Extension Path' column (default: %(default)s).")
+    parser.add_argument("destination", nargs="?", default="collected_files", help="Folder to collect the archives into (default: %(default)s).")
+    parser.add_argument("--store", default="corpus_store", help="Corpus store root folder (default: %(default)s).")
+    parser.add_argument("--mode", choices=[MODE_HARDLINK, MODE_SYMLINK, MODE_COPY], default=MODE_HARDLINK)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    try: copy_files_from_csv(args.csv_file, args.destination, args.store, args.mode, args.workers)
+    except (OSError, ValueError) as e: print(f"Error: {e}"); raise SystemExit(1)
+
+# 사용 예시: python path_downloader.py filtered_permission_info.csv collected_files
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import re
+from array import array
+from dataclasses import dataclass
+
+# 📌 분석 결과 레코드
+# 아카이브마다 defaultdict(lambda: defaultdict(int)) 를 만드는 대신, API_CATEGORIES 로 만든 고정 API 표의
+# 인덱스를 쓰는 정수 벡터(array) 하나에 횟수를 담습니다. 레코드는 pickle 이 가능하고 (워커 간 전달),
+# 10만 건을 메모리에 들고 있어도 가볍고, 전체 합계는 벡터 덧셈이 됩니다.
+
+COUNT_TYPECODE = "Q"  # 스캔 중 누적용 (부호 없는 64비트 정수)
+# 레코드에 저장할 때는 최댓값이 들어가는 가장 작은 폭으로 줄임 (대부분 8/16비트로 충분)
+PACKED_TYPECODES = (("B", 0xFF), ("H", 0xFFFF), ("I", 0xFFFFFFFF), ("Q", 0xFFFFFFFFFFFFFFFF))
+TOTAL_TYPECODE = "q"  # 전체 합계용 (부호 있는 64비트, NumPy int64 와 같은 배치)
+_NONZERO_BYTE = re.compile(rb"[^\x00]")
+_numpy = None  # 처음 합계를 낼 때 import (없으면 False)
+
+
+def _load_numpy():
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy
+
+
+class ApiTable:
+    """API 이름 ↔ 벡터 인덱스 표. 카테고리별로 연속된 구간을 차지하며, 만든 뒤에는 바꾸지 않습니다."""
+
+    __slots__ = ("names", "category_of", "category_ranges", "index")
+
+    def __init__(self, api_categories):
+        names = []
+        ranges = []
+        seen = set()
+        for category, apis in api_categories.items():
+            start = len(names)
+            for api in apis:
+                if api not in seen:  # 같은 API 가 여러 카테고리에 있으면 처음 것만 사용
+                    seen.add(api)
+                    names.append(api)
+            ranges.append((category, start, len(names)))
+        self.names = tuple(names)
+        self.category_ranges = tuple(ranges)
+        self.category_of = tuple(category for category, start, stop in ranges for _ in range(start, stop))
+        self.index = {api: i for i, api in enumerate(names)}
+
+    def __len__(self):
+        return len(self.names)
+
+    def new_counts(self):
+        return array(COUNT_TYPECODE, bytes(len(self.names) * array(COUNT_TYPECODE).itemsize))
+
+    def pack(self, counts):
+        """누적이 끝난 벡터를 레코드용으로 줄입니다. 모두 0 이면 None."""
+        largest = max(counts, default=0)
+        if not largest:
+            return None
+        typecode = next(code for code, limit in PACKED_TYPECODES if largest <= limit)
+        return array(typecode, counts)
+
+    def count_into(self, content, counts):
+        """content 에서 각 API 문자열의 등장 횟수를 counts 벡터에 더합니다."""
+        for i, api in enumerate(self.names):
+            count = content.count(api)
+            if count:
+                counts[i] += count
+
+    def nested(self, counts):
+        """벡터를 {Category: {API: count}} (0 이 아닌 값만, 표 순서) 로 변환합니다. CSV/집계 출력용."""
+        result = {}
+        if counts is None:
+            return result
+        for category, start, stop in self.category_ranges:
+            apis = {self.names[i]: counts[i] for i in range(start, stop) if counts[i]}
+            if apis:
+                result[category] = apis
+        return result
+
+    def counts_from_nested(self, nested):
+        """nested() 의 역변환. 표에 없는 API 는 무시합니다. 모두 0 이면 None."""
+        counts = self.new_counts()
+        for apis in nested.values():
+            for api, count in apis.items():
+                i = self.index.get(api)
+                if i is not None:
+                    counts[i] += count
+        return self.pack(counts)
+
+    def sum_counts(self, records):
+        """레코드들의 counts 벡터 합계. 미리 만든 array("q") 하나에 제자리로 더합니다.
+           NumPy 가 있으면 벡터 덧셈, 없으면 0 이 아닌 칸만 찾아 (대부분의 API 는 0) 더합니다."""
+        totals = array(TOTAL_TYPECODE, bytes(len(self.names) * array(TOTAL_TYPECODE).itemsize))
+        np = _load_numpy()
+        if np:
+            view = np.frombuffer(totals, dtype=np.int64)  # totals 와 버퍼를 공유
+            for record in records:
+                if record.counts is not None:
+                    np.add(view, np.frombuffer(record.counts, dtype=record.counts.typecode), out=view, casting="unsafe")
+            return totals
+        for record in records:
+            counts = record.counts
+            if counts is None:
+                continue
+            itemsize = counts.itemsize
+            last = -1
+            for match in _NONZERO_BYTE.finditer(memoryview(counts).cast("B")):
+                i = match.start() // itemsize
+                if i != last:
+                    totals[i] += counts[i]
+                    last = i
+        return totals
+
+
+@dataclass(slots=True)
+class AnalysisRecord:
+    """아카이브 하나의 분석 결과.
+
+       counts 는 ApiTable 인덱스 기준 API 등장 횟수 벡터이며, 스캔하지 않았거나 모두 0 이면 None 입니다.
+       over_permissions 는 판정하지 않은 경우 (triage tier 1) [] 가 아니라 None 입니다.
+       obfuscated 는 난독화 의심 스캔 단위 -> {"reasons", "recovered"} 입니다 (바이트 통계는 판별에만 쓰고 저장하지 않음).
+       api_contexts / wasm_info / triage / obfuscated 도 값이 없으면 None 으로 두어 레코드를 작게 유지합니다."""
+    zip: str
+    permissions: list
+    over_permissions: list  # None: 판정하지 않음
+    wasm_exist: str = "X"
+    counts: array = None
+    api_contexts: dict = None
+    wasm_info: dict = None
+    triage: dict = None
+    obfuscated: dict = None
+
+    @property
+    def is_error(self):
+        return any(str(p).startswith("Error:") for p in self.permissions)
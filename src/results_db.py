@@ -0,0 +1,595 @@
+import argparse
+import csv
+import hashlib
+import io
+import json
+import logging
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+from shard_merge import extension_id_from_name
+
+# 📌 분석 결과 조회 서비스 (SQLite)
+# "cookies 를 쓰지 않는 익스텐션 목록", "카테고리 X 에서 fetch 를 가장 많이 쓰는 익스텐션" 같은 질문마다
+# detailed_analysis.csv 전체를 pandas 로 읽고 JSON 칸을 파싱하는 대신, 결과를 SQLite 에 색인해 두고 조회합니다.
+# - 익스텐션 ID / 선언 권한 / over-permission / API 별 색인
+# - detailed_analysis.csv 는 마지막으로 읽은 위치부터 새 행만 읽음 (watch 모드가 덧붙인 행, 같은 ZIP 은 나중 행이 우선).
+#   파일이 새로 쓰였으면 (inode 가 바뀌었거나 이미 읽은 부분의 내용이 다르면) 처음부터 다시 읽음
+# - 목록 조회는 limit/offset 페이지 단위, 집계 조회는 데이터가 바뀔 때까지 캐시
+#   (serve 는 읽기 전용 연결 몇 개를 돌려 쓰고, 집계 캐시는 서버 전체가 함께 씀)
+#
+#   python results_db.py load out/                      # out/detailed_analysis.csv 를 results.sqlite 에 반영
+#   python results_db.py query over-permission cookies --limit 20 --offset 20
+#   python results_db.py query top-api --api fetch --category Network
+#   python results_db.py serve --port 8765              # GET /over-permission/cookies?limit=20 ...
+
+DEFAULT_DB = "results.sqlite"
+DETAILED_CSV = "detailed_analysis.csv"
+SCHEMA_VERSION = 2
+DEFAULT_PAGE_SIZE = 50
+DEFAULT_CONNECTIONS = 4  # serve 의 읽기 전용 연결 수
+MAX_PAGE_SIZE = 1000
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# detailed_analysis.csv 의 고정 컬럼 (카테고리 컬럼은 "WASM Exist" 와 "API Contexts" 사이)
+COLUMN_ZIP = "ZIP File"
+COLUMN_PERMISSIONS = "Permissions (manifest)"
+COLUMN_OVER_PERMISSIONS = "Over Permissions"
+COLUMN_WASM = "WASM Exist"
+COLUMN_CONTEXTS = "API Contexts"
+COLUMN_SCAN_TIER = "Scan Tier"
+COLUMN_OBFUSCATED = "Obfuscated Members"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY, header TEXT NOT NULL, offset INTEGER NOT NULL, digest TEXT NOT NULL,
+    size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, inode INTEGER NOT NULL, rows INTEGER NOT NULL, loaded_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS extensions (
+    id INTEGER PRIMARY KEY, zip TEXT NOT NULL UNIQUE, extension_id TEXT NOT NULL, source TEXT NOT NULL,
+    wasm INTEGER NOT NULL, error TEXT, scan_tier INTEGER, permissions TEXT NOT NULL, over_permissions TEXT NOT NULL,
+    api_contexts TEXT, obfuscated TEXT
+);
+CREATE INDEX IF NOT EXISTS extensions_extension_id ON extensions (extension_id);
+CREATE INDEX IF NOT EXISTS extensions_source ON extensions (source);
+CREATE TABLE IF NOT EXISTS permissions (
+    permission TEXT NOT NULL, ext INTEGER NOT NULL, PRIMARY KEY (permission, ext)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS permissions_ext ON permissions (ext);
+CREATE TABLE IF NOT EXISTS over_permissions (
+    permission TEXT NOT NULL, ext INTEGER NOT NULL, PRIMARY KEY (permission, ext)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS over_permissions_ext ON over_permissions (ext);
+CREATE TABLE IF NOT EXISTS api_counts (
+    api TEXT NOT NULL, category TEXT NOT NULL, ext INTEGER NOT NULL, count INTEGER NOT NULL,
+    PRIMARY KEY (api, category, ext)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS api_counts_rank ON api_counts (api, count DESC);
+CREATE INDEX IF NOT EXISTS api_counts_category ON api_counts (category, ext);
+CREATE INDEX IF NOT EXISTS api_counts_ext ON api_counts (ext);
+CREATE TABLE IF NOT EXISTS aggregate_cache (key TEXT PRIMARY KEY, generation INTEGER NOT NULL, value TEXT NOT NULL);
+"""
+
+
+def _prefix_digest(f, offset):
+    """파일 앞 offset 바이트의 sha1 객체 (새로 읽은 행을 update 해 다음 적재의 기준 해시로 이어 씀)."""
+    digest = hashlib.sha1()
+    f.seek(0)
+    remaining = offset
+    while remaining > 0:
+        chunk = f.read(min(remaining, HASH_CHUNK_SIZE))
+        if not chunk:
+            break
+        digest.update(chunk)
+        remaining -= len(chunk)
+    return digest
+
+
+def _page_bounds(limit, offset):
+    limit = DEFAULT_PAGE_SIZE if limit is None else int(limit)
+    offset = 0 if offset is None else int(offset)
+    if limit <= 0 or offset < 0:
+        raise ValueError("limit must be positive and offset non-negative")
+    return min(limit, MAX_PAGE_SIZE), offset
+
+
+def _page(total, limit, offset, items):
+    return {"total": total, "limit": limit, "offset": offset, "items": items,
+            "next_offset": offset + limit if offset + limit < total else None}
+
+
+class AggregateCache:
+    """(key, generation) -> 집계 결과 메모리 캐시. 여러 연결이 함께 쓸 수 있도록 lock 으로 보호하고,
+       더 새로운 generation 의 값이 들어오면 이전 generation 의 값은 버립니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+        self._generation = None
+
+    def get(self, key, generation):
+        with self._lock:
+            return self._values.get((key, generation))
+
+    def put(self, key, generation, value):
+        with self._lock:
+            if self._generation is not None and generation < self._generation:
+                return  # 이미 더 새로운 데이터로 계산한 값이 있음
+            if generation != self._generation:
+                self._values = {}
+                self._generation = generation
+            self._values[(key, generation)] = value
+
+    def __len__(self):
+        with self._lock:
+            return len(self._values)
+
+
+class ResultsDB:
+    """결과 DB 연결 하나. 한 번에 한 스레드만 씁니다 (serve 는 ConnectionPool 로 연결을 돌려 씀).
+
+       read_only=True 이면 SQLite 를 읽기 전용(mode=ro)으로 열고 스키마/meta 를 쓰지 않으며, 집계 캐시도
+       메모리에만 둡니다 (serve 가 적재 중인 DB 에 쓰기 잠금을 잡지 않도록). cache(AggregateCache)를 주면
+       다른 연결과 집계 캐시를 함께 씁니다."""
+
+    def __init__(self, path=DEFAULT_DB, read_only=False, cache=None):
+        self.path = path
+        self.read_only = read_only
+        if read_only:
+            # 풀에 돌려놓은 연결은 다른 요청 스레드가 이어서 씀 (동시에 두 스레드가 쓰지는 않음)
+            self.conn = sqlite3.connect(f"file:{quote(os.path.abspath(path))}?mode=ro", uri=True, timeout=30,
+                                        check_same_thread=False)
+            version = self._meta("schema_version")
+        else:
+            self.conn = sqlite3.connect(path, timeout=30)
+            self.conn.execute("PRAGMA journal_mode=WAL")  # 적재 중에도 조회가 막히지 않도록
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+            version = self._meta("schema_version")
+            if version is None:
+                with self.conn:
+                    self._set_meta("schema_version", SCHEMA_VERSION)
+                    self._set_meta("generation", 0)
+                version = SCHEMA_VERSION
+        if int(version) != SCHEMA_VERSION:
+            raise ValueError(f"{path} was written by an incompatible version (schema {version})")
+        self._cache = cache if cache is not None else AggregateCache()  # aggregate_cache 테이블 앞의 메모리 캐시
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    @property
+    def generation(self):
+        """적재할 때마다 1씩 증가. 집계 캐시는 같은 generation 에서만 유효합니다."""
+        return int(self._meta("generation"))
+
+    # 📌 적재
+    def load_detailed_csv(self, path):
+        """detailed_analysis.csv 를 마지막으로 읽은 위치부터 읽어 반영합니다. 반영한 행 수를 반환합니다.
+           크기/mtime/inode 가 그대로이면 파일을 읽지 않습니다. inode 가 바뀌었거나 (os.replace 로 새로 쓴 파일),
+           파일이 줄었거나, 헤더가 바뀌었거나, 이미 읽은 부분 전체의 해시가 달라졌으면 (제자리에서 고친 행)
+           이 파일에서 온 행을 모두 지우고 처음부터 다시 읽습니다."""
+        path = os.path.abspath(path)
+        source = self.conn.execute("SELECT header, offset, digest, size, mtime_ns, inode, rows FROM sources WHERE path = ?",
+                                   (path,)).fetchone()
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            if source is not None and (st.st_size, st.st_mtime_ns, st.st_ino) == tuple(source[3:6]):
+                return 0  # 지난 적재 이후 바뀌지 않음
+            header_line = f.readline()
+            header_text = header_line.decode("utf-8-sig").rstrip("\r\n")
+            offset, rows, rewritten, digest = len(header_line), 0, False, None
+            if source is not None:
+                old_header, old_offset, old_digest, _, _, old_inode, old_rows = source
+                if old_header == header_text and old_inode == st.st_ino and old_offset <= st.st_size:
+                    digest = _prefix_digest(f, old_offset)
+                if digest is not None and digest.hexdigest() == old_digest:
+                    offset, rows = old_offset, old_rows
+                else:
+                    logging.info(f"{path} was rewritten; reloading it from the start.")
+                    rewritten, digest = True, None
+            if digest is None:
+                digest = _prefix_digest(f, offset)
+            f.seek(offset)
+            data = f.read()
+        complete = data.rfind(b"\n") + 1  # 쓰는 중인 마지막 줄은 다음 적재에서 읽음
+        data = data[:complete]
+        header = next(csv.reader([header_text]))
+        records = list(csv.reader(io.StringIO(data.decode("utf-8"), newline="")))
+
+        with self.conn:
+            if rewritten:
+                self._delete_source(path)
+            loaded = 0
+            for row in records:
+                if row:
+                    self._upsert(path, header, row)
+                    loaded += 1
+            digest.update(data)
+            self.conn.execute("INSERT OR REPLACE INTO sources (path, header, offset, digest, size, mtime_ns, inode, rows, loaded_at) "
+                              "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                              (path, header_text, offset + complete, digest.hexdigest(), st.st_size, st.st_mtime_ns, st.st_ino,
+                               rows + loaded, time.time()))
+            if loaded or rewritten:
+                self._set_meta("generation", self.generation + 1)
+        return loaded
+
+    def load(self, paths):
+        """분석 출력 폴더 또는 detailed_analysis.csv 경로들을 적재합니다."""
+        total = 0
+        for path in paths:
+            if os.path.isdir(path):
+                path = os.path.join(path, DETAILED_CSV)
+            total += self.load_detailed_csv(path)
+        return total
+
+    def _delete_extension(self, ext):
+        for table in ("permissions", "over_permissions", "api_counts"):
+            self.conn.execute(f"DELETE FROM {table} WHERE ext = ?", (ext,))
+        self.conn.execute("DELETE FROM extensions WHERE id = ?", (ext,))
+
+    def _delete_source(self, path):
+        for (ext,) in self.conn.execute("SELECT id FROM extensions WHERE source = ?", (path,)).fetchall():
+            self._delete_extension(ext)
+
+    def _upsert(self, source, header, row):
+        cells = dict(zip(header, row))
+        zip_name = cells[COLUMN_ZIP]
+        permissions = json.loads(cells.get(COLUMN_PERMISSIONS) or "[]")
+        over_permissions = json.loads(cells.get(COLUMN_OVER_PERMISSIONS) or "[]")  # tier 1 은 null (판정하지 않음)
+        error = next((p[len("Error:"):].strip() for p in permissions if str(p).startswith("Error:")), None)
+        tier = cells.get(COLUMN_SCAN_TIER)
+
+        previous = self.conn.execute("SELECT id FROM extensions WHERE zip = ?", (zip_name,)).fetchone()
+        if previous:
+            self._delete_extension(previous[0])
+        ext = self.conn.execute(
+            "INSERT INTO extensions (zip, extension_id, source, wasm, error, scan_tier, permissions, over_permissions, api_contexts, obfuscated) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (zip_name, extension_id_from_name(zip_name), source, int(cells.get(COLUMN_WASM) == "O"), error,
+             int(tier) if tier else None, json.dumps(permissions, ensure_ascii=False), json.dumps(over_permissions, ensure_ascii=False),
+             cells.get(COLUMN_CONTEXTS) or None, cells.get(COLUMN_OBFUSCATED) if cells.get(COLUMN_OBFUSCATED) not in (None, "", "{}") else None)
+        ).lastrowid
+        if error is None:
+            self.conn.executemany("INSERT OR IGNORE INTO permissions (permission, ext) VALUES (?, ?)",
+                                  [(str(p), ext) for p in permissions])
+        self.conn.executemany("INSERT OR IGNORE INTO over_permissions (permission, ext) VALUES (?, ?)",
+                              [(p, ext) for p in over_permissions or ()])
+        # 카테고리 컬럼: "WASM Exist" 와 "API Contexts" 사이 (룰 팩에 따라 개수가 다름)
+        start = header.index(COLUMN_WASM) + 1
+        stop = header.index(COLUMN_CONTEXTS) if COLUMN_CONTEXTS in header else len(header)
+        counts = []
+        for category, cell in zip(header[start:stop], row[start:stop]):
+            for api, count in (json.loads(cell) if cell else {}).items():
+                counts.append((api, category, ext, count))
+        self.conn.executemany("INSERT INTO api_counts (api, category, ext, count) VALUES (?, ?, ?, ?)", counts)
+
+    # 📌 목록 조회 (페이지 단위)
+    def _paged(self, count_sql, select_sql, params, limit, offset, to_item):
+        limit, offset = _page_bounds(limit, offset)
+        total = self.conn.execute(count_sql, params).fetchone()[0]
+        rows = self.conn.execute(f"{select_sql} LIMIT ? OFFSET ?", (*params, limit, offset)).fetchall()
+        return _page(total, limit, offset, [to_item(row) for row in rows])
+
+    def over_permission(self, permission, limit=None, offset=None):
+        """permission 을 선언했지만 코드에서 쓰지 않는 (over-permission) 익스텐션."""
+        return self._paged("SELECT COUNT(*) FROM over_permissions WHERE permission = ?",
+                           "SELECT e.zip, e.extension_id FROM over_permissions o JOIN extensions e ON e.id = o.ext "
+                           "WHERE o.permission = ? ORDER BY e.zip", (permission,), limit, offset,
+                           lambda row: {"zip": row[0], "extension_id": row[1]})
+
+    def with_permission(self, permission, limit=None, offset=None):
+        """manifest 에 permission 을 선언한 익스텐션."""
+        return self._paged("SELECT COUNT(*) FROM permissions WHERE permission = ?",
+                           "SELECT e.zip, e.extension_id FROM permissions p JOIN extensions e ON e.id = p.ext "
+                           "WHERE p.permission = ? ORDER BY e.zip", (permission,), limit, offset,
+                           lambda row: {"zip": row[0], "extension_id": row[1]})
+
+    def top_api(self, api=None, category=None, limit=None, offset=None):
+        """API(또는 카테고리 전체) 등장 횟수가 많은 순으로 익스텐션을 나열합니다. api/category 중 하나 이상 필요."""
+        if api is None and category is None:
+            raise ValueError("top_api needs an api or a category")
+        conditions, params = [], []
+        if api is not None:
+            conditions.append("a.api = ?"); params.append(api)
+        if category is not None:
+            conditions.append("a.category = ?"); params.append(category)
+        where = " AND ".join(conditions)
+        return self._paged(f"SELECT COUNT(DISTINCT a.ext) FROM api_counts a WHERE {where}",
+                           f"SELECT e.zip, e.extension_id, SUM(a.count) AS total FROM api_counts a JOIN extensions e ON e.id = a.ext "
+                           f"WHERE {where} GROUP BY a.ext ORDER BY total DESC, e.zip", tuple(params), limit, offset,
+                           lambda row: {"zip": row[0], "extension_id": row[1], "count": row[2]})
+
+    def extension(self, name):
+        """익스텐션 ID 또는 ZIP 이름으로 분석 결과를 찾습니다 (같은 ID 의 여러 버전이면 모두)."""
+        rows = self.conn.execute(
+            "SELECT id, zip, extension_id, wasm, error, scan_tier, permissions, over_permissions, api_contexts, obfuscated "
+            "FROM extensions WHERE extension_id = ? OR zip = ? ORDER BY zip", (name, name)).fetchall()
+        results = []
+        for ext, zip_name, extension_id, wasm, error, tier, permissions, over_permissions, contexts, obfuscated in rows:
+            api_counts = {}
+            for api, category, count in self.conn.execute(
+                    "SELECT api, category, count FROM api_counts WHERE ext = ? ORDER BY category, count DESC, api", (ext,)):
+                api_counts.setdefault(category, {})[api] = count
+            results.append({"zip": zip_name, "extension_id": extension_id, "wasm": bool(wasm), "error": error, "scan_tier": tier,
+                            "permissions": json.loads(permissions), "over_permissions": json.loads(over_permissions),
+                            "api_counts": api_counts, "api_contexts": json.loads(contexts) if contexts else {},
+                            "obfuscated": json.loads(obfuscated) if obfuscated else {}})
+        return results
+
+    # 📌 집계 조회 (캐시)
+    def _cached(self, key, compute):
+        """generation 이 그대로이면 메모리/aggregate_cache 테이블의 값을 그대로 돌려줍니다.
+           읽기 전용 연결은 새로 계산한 값을 테이블에 쓰지 않고 메모리에만 둡니다."""
+        generation = self.generation
+        value = self._cache.get(key, generation)
+        if value is not None:
+            return value
+        row = self.conn.execute("SELECT value FROM aggregate_cache WHERE key = ? AND generation = ?", (key, generation)).fetchone()
+        if row:
+            value = json.loads(row[0])
+        else:
+            value = compute()
+            if not self.read_only:
+                with self.conn:
+                    self.conn.execute("INSERT OR REPLACE INTO aggregate_cache (key, generation, value) VALUES (?, ?, ?)",
+                                      (key, generation, json.dumps(value, ensure_ascii=False)))
+        self._cache.put(key, generation, value)
+        return value
+
+    def over_permission_counts(self):
+        """over-permission 으로 판정된 횟수 (권한별, 많은 순)."""
+        return self._cached("over_permission_counts", lambda: [
+            {"permission": permission, "extensions": count} for permission, count in self.conn.execute(
+                "SELECT permission, COUNT(*) AS n FROM over_permissions GROUP BY permission ORDER BY n DESC, permission")])
+
+    def api_totals(self, category=None):
+        """summary.csv 와 같은 API 별 총 등장 횟수 (category 를 주면 그 카테고리만)."""
+        where, params = ("WHERE category = ?", (category,)) if category is not None else ("", ())
+        return self._cached(f"api_totals:{category or ''}", lambda: [
+            {"category": row[0], "api": row[1], "total": row[2], "extensions": row[3]} for row in self.conn.execute(
+                f"SELECT category, api, SUM(count) AS total, COUNT(*) FROM api_counts {where} "
+                f"GROUP BY category, api ORDER BY total DESC, category, api", params)])
+
+    def stats(self):
+        def compute():
+            archives, errors, wasm = self.conn.execute(
+                "SELECT COUNT(*), COUNT(error), COALESCE(SUM(wasm), 0) FROM extensions").fetchone()
+            tiers = {str(tier): count for tier, count in self.conn.execute(
+                "SELECT scan_tier, COUNT(*) FROM extensions WHERE scan_tier IS NOT NULL GROUP BY scan_tier")}
+            obfuscated = self.conn.execute("SELECT COUNT(*) FROM extensions WHERE obfuscated IS NOT NULL").fetchone()[0]
+            # over-permission 을 판정한 아카이브 수 (오류와 tier 1 은 판정하지 않음)
+            judged = self.conn.execute(
+                "SELECT COUNT(*) FROM extensions WHERE error IS NULL AND over_permissions != 'null'").fetchone()[0]
+            sources = self.conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0]
+            return {"archives": archives, "errors": errors, "over_permission_archives": judged, "with_wasm": wasm,
+                    "with_obfuscated_scripts": obfuscated, "scan_tiers": tiers, "sources": sources}
+        return self._cached("stats", compute)
+
+
+class ConnectionPool:
+    """serve 용 읽기 전용 ResultsDB 연결 풀. 요청 스레드는 연결을 빌려 쓰고 돌려놓으며, 연결은 size 개까지만 엽니다.
+       모든 연결이 하나의 AggregateCache 를 함께 쓰므로 집계는 데이터가 바뀔 때까지 한 번만 계산합니다."""
+
+    def __init__(self, path, size=DEFAULT_CONNECTIONS):
+        self.path = path
+        self.size = max(1, size)
+        self.cache = AggregateCache()
+        self.opened = 0
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        try:
+            db = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self.opened < self.size
+                if create:
+                    self.opened += 1
+            if create:
+                try:
+                    db = ResultsDB(self.path, read_only=True, cache=self.cache)
+                except Exception:
+                    with self._lock:
+                        self.opened -= 1
+                    raise
+            else:
+                db = self._idle.get()  # 다른 요청이 돌려놓을 때까지 대기
+        try:
+            yield db
+        finally:
+            self._idle.put(db)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+# 📌 HTTP 조회 (JSON)
+def _query_handler():
+    """요청 처리 클래스. http.server 는 serve 할 때만 import 합니다 (load/query CLI 와 watch 모드의 시작 비용 절약)."""
+    from http.server import BaseHTTPRequestHandler
+
+    class _QueryHandler(BaseHTTPRequestHandler):
+        """GET /stats, /over-permission/<p>, /permission/<p>, /top-api?api=&category=, /extension/<id>,
+               /aggregates/over-permissions, /aggregates/apis?category=  (목록은 ?limit=&offset=)"""
+
+        server_version = "ExtensionResults/1"
+
+        def _send(self, status, body):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            parts = [unquote(part) for part in url.path.split("/") if part]
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            page = {"limit": query.get("limit"), "offset": query.get("offset")}
+            with self.server.pool.connection() as db:  # 응답을 보내기 전에 연결을 돌려놓음
+                status, body = self._query(db, url.path, parts, query, page)
+            self._send(status, body)
+
+        @staticmethod
+        def _query(db, path, parts, query, page):
+            try:
+                if parts == ["stats"]:
+                    return 200, db.stats()
+                if len(parts) == 2 and parts[0] == "over-permission":
+                    return 200, db.over_permission(parts[1], **page)
+                if len(parts) == 2 and parts[0] == "permission":
+                    return 200, db.with_permission(parts[1], **page)
+                if parts == ["top-api"]:
+                    return 200, db.top_api(query.get("api"), query.get("category"), **page)
+                if len(parts) == 2 and parts[0] == "extension":
+                    body = db.extension(parts[1])
+                    return (200, body) if body else (404, {"error": f"Unknown extension {parts[1]}"})
+                if parts == ["aggregates", "over-permissions"]:
+                    return 200, db.over_permission_counts()
+                if parts == ["aggregates", "apis"]:
+                    return 200, db.api_totals(query.get("category"))
+                return 404, {"error": f"Unknown path {path}"}
+            except ValueError as e:
+                return 400, {"error": str(e)}
+
+        def log_message(self, format, *args):
+            logging.debug(f"{self.address_string()} {format % args}")
+
+    return _QueryHandler
+
+
+def make_server(db_path, host="127.0.0.1", port=8765, connections=DEFAULT_CONNECTIONS):
+    """요청마다 스레드를 만드는 HTTP 서버. 연결 풀(server.pool)과 그 집계 캐시는 서버 전체가 함께 씁니다."""
+    from http.server import ThreadingHTTPServer
+    server = ThreadingHTTPServer((host, port), _query_handler())
+    server.daemon_threads = True
+    server.pool = ConnectionPool(db_path, connections)
+    return server
+
+
+def serve(db_path, host="127.0.0.1", port=8765, connections=DEFAULT_CONNECTIONS):
+    server = make_server(db_path, host, port, connections)
+    print(f"Serving {os.path.abspath(db_path)} on http://{host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopping results server...")
+    finally:
+        server.server_close()
+        server.pool.close()
+
+
+def _print_page(page, columns):
+    writer = csv.writer(sys.stdout)
+    writer.writerow(columns)
+    for item in page["items"]:
+        writer.writerow([item[column] for column in columns])
+    shown = f"{page['offset'] + 1}-{page['offset'] + len(page['items'])}" if page["items"] else "none"
+    more = f"; next --offset {page['next_offset']}" if page["next_offset"] is not None else ""
+    print(f"({shown} of {page['total']}{more})", file=sys.stderr)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Load analyzer output into an indexed SQLite results database and query it.")
+    parser.add_argument("--db", default=DEFAULT_DB, help="Results database file (default: %(default)s).")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    load_parser = subparsers.add_parser("load", help="Load new rows from analyzer output folders or detailed_analysis.csv files.")
+    load_parser.add_argument("paths", nargs="+")
+    query_parser = subparsers.add_parser("query", help="Run a query and print CSV (or JSON with --json).")
+    query_parser.add_argument("kind", choices=["over-permission", "permission", "top-api", "extension",
+                                               "over-permission-counts", "api-totals", "stats"])
+    query_parser.add_argument("value", nargs="?", help="Permission name or extension ID/ZIP name.")
+    query_parser.add_argument("--api", default=None)
+    query_parser.add_argument("--category", default=None)
+    query_parser.add_argument("--limit", type=int, default=DEFAULT_PAGE_SIZE)
+    query_parser.add_argument("--offset", type=int, default=0)
+    query_parser.add_argument("--json", action="store_true", help="Print the raw JSON result.")
+    serve_parser = subparsers.add_parser("serve", help="Serve the queries as JSON over HTTP.")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--connections", type=int, default=DEFAULT_CONNECTIONS, help="Read-only database connections shared by request threads (default: %(default)s).")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        if not os.path.exists(args.db): print(f"Error: Database not found - {args.db}"); raise SystemExit(1)
+        serve(args.db, args.host, args.port, args.connections)
+        return
+    if args.command == "query" and not os.path.exists(args.db):
+        print(f"Error: Database not found - {args.db}"); raise SystemExit(1)
+
+    with ResultsDB(args.db) as db:
+        if args.command == "load":
+            started = time.perf_counter()
+            try: loaded = db.load(args.paths)
+            except FileNotFoundError as e: print(f"Error: {e}"); raise SystemExit(1)
+            print(f"Loaded {loaded} new rows into {args.db} in {time.perf_counter() - started:.2f}s "
+                  f"({db.stats()['archives']} archives indexed)")
+            return
+
+        if args.kind in ("over-permission", "permission", "extension") and not args.value:
+            parser.error(f"query {args.kind} needs a value")
+        started = time.perf_counter()
+        try:
+            if args.kind == "over-permission":
+                result = db.over_permission(args.value, args.limit, args.offset)
+            elif args.kind == "permission":
+                result = db.with_permission(args.value, args.limit, args.offset)
+            elif args.kind == "top-api":
+                result = db.top_api(args.api or args.value, args.category, args.limit, args.offset)
+            elif args.kind == "extension":
+                result = db.extension(args.value)
+            elif args.kind == "over-permission-counts":
+                result = db.over_permission_counts()
+            elif args.kind == "api-totals":
+                result = db.api_totals(args.category)
+            else:
+                result = db.stats()
+        except ValueError as e:
+            parser.error(str(e))
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if args.json or args.kind in ("extension", "stats"):
+            print(json.dumps(result, ensure_ascii=False, indent=2))
+        elif args.kind in ("over-permission", "permission"):
+            _print_page(result, ["zip", "extension_id"])
+        elif args.kind == "top-api":
+            _print_page(result, ["zip", "extension_id", "count"])
+        else:
+            columns = list(result[0]) if result else []
+            writer = csv.writer(sys.stdout)
+            writer.writerow(columns)
+            writer.writerows([item[column] for column in columns] for item in result)
+        print(f"({elapsed_ms:.3f} ms)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+from result_record import ApiTable
+
+# 📌 룰 팩 (API 카테고리, 권한 → API 패턴, 고위험 권한 목록)
+# 하드코딩된 dict 대신 rules/*.json 에서 읽습니다. 룰 내용(공백/키 순서 무관)의 sha256 이 fingerprint 이며,
+# 결과 파일(aggregate.json, watch 상태)에도 fingerprint 를 남겨 룰이 바뀐 경우에만 이전 결과를 무효화합니다.
+# 룰에서 만든 매칭용 구조(ApiTable, 패턴 → 권한 역매핑, 검색 패턴 목록)는 만드는 데 0.1ms 정도라
+# (룰 JSON 을 읽는 것보다 빠름) 디스크에 캐시하지 않고 실행마다 새로 만듭니다.
+#
+# 다른 룰 팩을 쓰려면 EXTENSION_RULES 환경 변수에 JSON 경로를 지정합니다 (워커 프로세스에도 그대로 전달됨).
+
+RULES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules")
+DEFAULT_RULE_PACK = os.path.join(RULES_DIR, "default.json")
+RULES_ENV = "EXTENSION_RULES"
+
+REQUIRED_KEYS = ("api_categories", "permission_to_apis", "suspicious_permissions")
+# fingerprint 에 포함되는 키 (name/description/notes 같은 설명용 키는 바뀌어도 결과에 영향 없음)
+RULE_KEYS = ("api_categories", "permission_to_apis", "suspicious_permissions", "permission_keywords")
+
+
+def fingerprint_rules(data):
+    """룰 내용의 sha256. JSON 을 키 정렬/공백 없이 직렬화해 계산하므로 서식만 바뀐 경우엔 그대로입니다."""
+    canonical = json.dumps({key: data.get(key) for key in RULE_KEYS}, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class RulePack:
+    """rules/*.json 하나. api_categories/permission_to_apis 는 파일의 순서를 유지합니다 (CSV 컬럼 순서)."""
+
+    def __init__(self, data, path=None):
+        missing = [key for key in REQUIRED_KEYS if key not in data]
+        if missing:
+            raise ValueError(f"Rule pack {path or ''} is missing {', '.join(missing)}")
+        self.path = path
+        self.name = data.get("name", os.path.splitext(os.path.basename(path))[0] if path else "rules")
+        self.version = data.get("version")
+        self.api_categories = data["api_categories"]
+        self.permission_to_apis = data["permission_to_apis"]
+        self.suspicious_permissions = frozenset(data["suspicious_permissions"])
+        self.permission_keywords = data.get("permission_keywords", {})
+        self.fingerprint = fingerprint_rules(data)
+
+    @property
+    def label(self):
+        return f"{self.name}@{self.version} ({self.fingerprint[:12]})"
+
+
+class CompiledRules:
+    """룰 팩에서 만든 매칭용 구조."""
+
+    def __init__(self, rules):
+        self.fingerprint = rules.fingerprint
+        self.api_table = ApiTable(rules.api_categories)
+        api_to_permissions = {}
+        for permission, patterns in rules.permission_to_apis.items():
+            for pattern in patterns:
+                if pattern:  # 빈 패턴 리스트(e.g., favicon)는 건너뛰기
+                    api_to_permissions.setdefault(pattern, set()).add(permission)
+        self.api_to_permissions = {pattern: frozenset(permissions) for pattern, permissions in api_to_permissions.items()}
+        self.search_patterns = tuple(sorted(self.api_to_permissions))
+
+
+def compile_rules(rules):
+    """룰 팩의 매칭용 구조(CompiledRules)를 만듭니다."""
+    return CompiledRules(rules)
+
+
+def load_rule_pack(path=None):
+    """룰 팩을 읽습니다. path 가 없으면 EXTENSION_RULES 환경 변수, 그것도 없으면 rules/default.json."""
+    path = path or os.environ.get(RULES_ENV) or DEFAULT_RULE_PACK
+    with open(path, "r", encoding="utf-8") as f:
+        return RulePack(json.load(f), path)
+
+
+def export_c_header(rules, out):
+    """static_analyzer*.c 가 include 하는 API 표(api_rules.h)를 룰 팩에서 생성합니다."""
+    out.write(f"// 자동 생성 파일: python rule_pack.py export-c > api_rules.h 로 다시 만드세요. 직접 수정하지 마세요.\n")
+    out.write(f"// rule pack: {rules.label}\n")
+    out.write("#ifndef API_RULES_H\n#define API_RULES_H\n\n")
+    out.write(f"#define RULES_FINGERPRINT \"{rules.fingerprint}\"\n\n")
+    out.write("typedef struct {\n    const char *name;\n    const char *category;\n} APIEntry;\n\n")
+    out.write("static const APIEntry target_apis[] = {\n")
+    entries = []
+    for category, apis in rules.api_categories.items():
+        for api in apis:
+            entries.append(f"    {{{json.dumps(api, ensure_ascii=False)}, {json.dumps(category, ensure_ascii=False)}}}")
+    out.write(",\n".join(entries))
+    out.write("\n};\n\n#define API_COUNT (sizeof(target_apis) / sizeof(target_apis[0]))\n\n#endif\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect, validate or export analysis rule packs.")
+    parser.add_argument("command", choices=["info", "compile", "export-c"])
+    parser.add_argument("--rules", default=None, help=f"Rule pack JSON (default: ${RULES_ENV} or rules/default.json).")
+    args = parser.parse_args()
+
+    rules = load_rule_pack(args.rules)
+    if args.command == "export-c":
+        export_c_header(rules, sys.stdout)
+        return
+    if args.command == "compile":
+        compiled = compile_rules(rules)
+        print(f"Compiled {rules.label}: {len(compiled.api_table)} APIs, {len(compiled.search_patterns)} search patterns")
+        return
+    print(f"Rule pack: {rules.label}")
+    print(f"  file: {rules.path}")
+    print(f"  fingerprint: {rules.fingerprint}")
+    print(f"  {len(rules.api_categories)} API categories, {len(rules.permission_to_apis)} permissions, "
+          f"{len(rules.suspicious_permissions)} suspicious permissions")
+
+
+if __name__ == "__main__":
+    main()
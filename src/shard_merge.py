@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+
+# 📌 샤드 모드 (--shard i/N) 와 merge 에서 쓰는 부분 집계
+# 각 샤드는 자기 detailed_analysis.csv 와 함께 aggregate.json 을 남기고,
+# merge 는 aggregate 들을 더해 단일 실행과 같은 summary.csv 를 다시 만듭니다.
+
+AGGREGATE_FILE = "aggregate.json"
+
+
+def parse_shard(spec):
+    """"i/N" 문자열을 (i, N) 으로 변환합니다. 0 <= i < N 이어야 합니다."""
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except (AttributeError, ValueError):
+        raise ValueError(f"Invalid shard spec {spec!r}; expected i/N (e.g. 0/4)")
+    if count <= 0 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard spec {spec!r}; need 0 <= i < N")
+    return index, count
+
+
+def extension_id_from_name(name):
+    """<id>_<version>.zip 형태의 파일 이름에서 익스텐션 ID 를 추출합니다."""
+    base = os.path.basename(name)
+    return base.split("_", 1)[0] if "_" in base else os.path.splitext(base)[0]
+
+
+def shard_of(name, count):
+    """익스텐션 ID 의 SHA-1 으로 샤드 번호를 정합니다 (실행/호스트가 달라도 항상 같은 값)."""
+    digest = hashlib.sha1(extension_id_from_name(name).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+
+def empty_aggregate():
+    # over_permission_archives: over-permission 을 실제로 판정한 아카이브 수 (오류/tier 1 은 제외) → over_permission_counts 의 분모
+    return {"shards": [], "rules": [], "archives": 0, "errors": 0, "over_permission_archives": 0,
+            "api_totals": {}, "over_permission_counts": {}}
+
+
+def add_record(aggregate, result, api_table, sign=1):
+    """결과 레코드 하나를 aggregate 에 더합니다 (sign=-1 이면 뺌). watch 모드의 증분 갱신에 사용."""
+    aggregate["archives"] += sign
+    if result.is_error:
+        aggregate["errors"] += sign
+    for category, apis in api_table.nested(result.counts).items():
+        target = aggregate["api_totals"].setdefault(category, {})
+        for api, count in apis.items():
+            target[api] = target.get(api, 0) + sign * count
+            if target[api] == 0:
+                del target[api]
+        if not target:
+            del aggregate["api_totals"][category]
+    if result.over_permissions is None or result.is_error:
+        return aggregate  # 판정하지 않은 아카이브는 "over-permission 없음" 으로 세지 않음
+    aggregate["over_permission_archives"] = aggregate.get("over_permission_archives", 0) + sign
+    over = aggregate["over_permission_counts"]
+    for permission in result.over_permissions:
+        over[permission] = over.get(permission, 0) + sign
+        if over[permission] == 0:
+            del over[permission]
+    return aggregate
+
+
+def build_aggregate(results, api_table, shard=None, rules_fingerprint=None):
+    """결과 레코드들에서 더할 수 있는 집계(API 총합, 권한별 over-permission 수)를 만듭니다.
+       rules_fingerprint 는 분석에 쓴 룰 팩 fingerprint 로, merge 시 서로 다른 룰의 결과가 섞이지 않게 합니다."""
+    aggregate = empty_aggregate()
+    if shard:
+        aggregate["shards"] = [f"{shard[0]}/{shard[1]}"]
+    if rules_fingerprint:
+        aggregate["rules"] = [rules_fingerprint]
+    for result in results:
+        add_record(aggregate, result, api_table)
+    return aggregate
+
+
+def merge_aggregates(aggregates):
+    """여러 aggregate 를 하나로 더합니다. 결과도 같은 형식이라 다시 merge 할 수 있습니다."""
+    merged = empty_aggregate()
+    for aggregate in aggregates:
+        merged["shards"].extend(aggregate.get("shards", []))
+        merged["rules"] = sorted(set(merged["rules"]) | set(aggregate.get("rules", [])))
+        merged["archives"] += aggregate.get("archives", 0)
+        merged["errors"] += aggregate.get("errors", 0)
+        merged["over_permission_archives"] += aggregate.get("over_permission_archives", 0)
+        for category, apis in aggregate.get("api_totals", {}).items():
+            target = merged["api_totals"].setdefault(category, {})
+            for api, count in apis.items():
+                target[api] = target.get(api, 0) + count
+        for permission, count in aggregate.get("over_permission_counts", {}).items():
+            merged["over_permission_counts"][permission] = merged["over_permission_counts"].get(permission, 0) + count
+    return merged
+
+
+def missing_shards(shard_specs):
+    """합친 샤드 목록에서 빠진 샤드 번호를 찾습니다 (N 이 섞여 있으면 ValueError)."""
+    parsed = [parse_shard(spec) for spec in shard_specs]
+    counts = {count for _, count in parsed}
+    if len(counts) > 1:
+        raise ValueError(f"Shards from different partitionings: {sorted(set(shard_specs))}")
+    if not counts:
+        return []
+    count = counts.pop()
+    return sorted(set(range(count)) - {index for index, _ in parsed})
+
+
+def write_aggregate(aggregate, output_dir):
+    with open(os.path.join(output_dir, AGGREGATE_FILE), "w", encoding="utf-8") as f:
+        json.dump(aggregate, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def load_aggregate(shard_dir):
+    with open(os.path.join(shard_dir, AGGREGATE_FILE), "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -3,87 +3,8 @@
 #include <string.h>
 #include <zip.h>
 
-// API 카테고리별 목록 정의
-typedef struct {
-    const char *name;
-    const char *category;
-} APIEntry;
-
-// 분석할 API 목록 (JavaScript에서 직접 호출되는 함수 기반)
-APIEntry target_apis[] = {
-    // **File System API**
-    {"document.querySelector('input[type=\"file\"]')", "File System"},
-    {"file.name", "File System"},
-    {"file.type", "File System"},
-    {"file.size", "File System"},
-    {"file.lastModified", "File System"},
-    {"new Blob", "File System"},
-    {"FileReader.readAsText", "File System"},
-    {"FileReader.readAsDataURL", "File System"},
-    {"FileReader.readAsArrayBuffer", "File System"},
-    {"window.requestFileSystem", "File System"},
-    {"fileEntry.createWriter", "File System"},
-    {"indexedDB.open", "File System"},
-    {"indexedDB.transaction", "File System"},
-    {"store.put", "File System"},
-    {"localStorage.setItem", "File System"},
-    {"localStorage.getItem", "File System"},
-    {"sessionStorage.setItem", "File System"},
-    {"sessionStorage.getItem", "File System"},
-    {"document.cookie", "File System"},
-    {"navigator.clipboard.readText", "File System"},
-    {"navigator.clipboard.writeText", "File System"},
-
-    // **Network API**
-    {"fetch", "Network"},
-    {"new XMLHttpRequest", "Network"},
-    {"new WebSocket", "Network"},
-    {"navigator.sendBeacon", "Network"},
-    {"new RTCPeerConnection", "Network"},
-    {"chrome.webRequest.onBeforeRequest.addListener", "Network"},
-    {"chrome.webRequest.onHeadersReceived.addListener", "Network"},
-    {"chrome.identity.getAuthToken", "Network"},
-    {"chrome.proxy.settings.set", "Network"},
-    {"chrome.dns.resolve", "Network"},
-
-    // **Rendering API**
-    {"document.createElement", "Rendering"},
-    {"document.appendChild", "Rendering"},
-    {"element.innerHTML", "Rendering"},
-    {"document.querySelector", "Rendering"},
-    {"document.getElementById", "Rendering"},
-    {"element.style", "Rendering"},
-    {"new MutationObserver", "Rendering"},
-    {"chrome.tabs.executeScript", "Rendering"},
-    {"setTimeout", "Rendering"},
-    {"setInterval", "Rendering"},
-    {"canvas.getContext", "Rendering"},
-    {"CanvasRenderingContext2D.drawImage", "Rendering"},
-    {"document.designMode", "Rendering"},
-    {"shadowRoot.attachShadow", "Rendering"},
-    {"window.open", "Rendering"},
-    {"chrome.windows.create", "Rendering"},
-    {"chrome.tabs.create", "Rendering"},
-    {"chrome.notifications.create", "Rendering"},
-
-    // **User Interaction API**
-    {"addEventListener", "User Interaction"},
-    {"document.onmousemove", "User Interaction"},
-    {"document.onkeypress", "User Interaction"},
-    {"document.onkeydown", "User Interaction"},
-    {"window.onbeforeunload", "User Interaction"},
-    {"chrome.contextMenus.create", "User Interaction"},
-    {"chrome.alarms.create", "User Interaction"},
-    {"chrome.notifications.onClicked.addListener", "User Interaction"},
-    {"chrome.permissions.request", "User Interaction"},
-    {"chrome.tabs.onActivated.addListener", "User Interaction"},
-    {"window.alert", "User Interaction"},
-    {"window.confirm", "User Interaction"},
-    {"window.prompt", "User Interaction"}
-};
-
-// API 개수
-#define API_COUNT (sizeof(target_apis) / sizeof(target_apis[0]))
+// API 카테고리별 목록 (룰 팩 rules/default.json 에서 생성: python rule_pack.py export-c > api_rules.h)
+#include "api_rules.h"
 
 // 구조체 정의 (API 카운팅용)
 typedef struct APINode {
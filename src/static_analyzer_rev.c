@@ -9,11 +9,8 @@
 #define MAX_PATH_LEN 512
 #define OUTPUT_CSV "extension_analysis.csv"
 
-// API 카테고리별 목록 정의
-typedef struct {
-    const char *name;
-    const char *category;
-} APIEntry;
+// API 카테고리별 목록 (룰 팩 rules/default.json 에서 생성: python rule_pack.py export-c > api_rules.h)
+#include "api_rules.h"
 
 // API 통계 저장 구조체
 typedef struct APINode {
@@ -22,24 +19,6 @@ typedef struct APINode {
     struct APINode *next;
 } APINode;
 
-// API 목록
-APIEntry target_apis[] = {
-    {"fetch", "Network"}, {"new XMLHttpRequest", "Network"},
-    {"new WebSocket", "Network"}, {"navigator.sendBeacon", "Network"},
-    {"new RTCPeerConnection", "Network"}, {"chrome.webRequest.onBeforeRequest.addListener", "Network"},
-    {"chrome.webRequest.onHeadersReceived.addListener", "Network"},
-    {"document.createElement", "Rendering"}, {"document.appendChild", "Rendering"},
-    {"document.querySelector", "Rendering"}, {"document.getElementById", "Rendering"},
-    {"element.innerHTML", "Rendering"}, {"setTimeout", "Rendering"},
-    {"setInterval", "Rendering"}, {"chrome.tabs.executeScript", "Rendering"},
-    {"chrome.windows.create", "Rendering"}, {"chrome.tabs.create", "Rendering"},
-    {"chrome.notifications.create", "Rendering"}, {"window.open", "Rendering"},
-    {"window.alert", "User Interaction"}, {"window.confirm", "User Interaction"},
-    {"window.prompt", "User Interaction"}, {"chrome.permissions.request", "User Interaction"},
-    {"chrome.tabs.onActivated.addListener", "User Interaction"}
-};
-
-#define API_COUNT (sizeof(target_apis) / sizeof(target_apis[0]))
 #define HASH_TABLE_SIZE 1024
 
 APINode *api_table[HASH_TABLE_SIZE] = {0};
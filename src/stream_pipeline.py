@@ -0,0 +1,155 @@
+import argparse
+import csv
+import logging
+import os
+import queue
+import threading
+import time
+
+import extension_downloader
+from member_plan import DEFAULT_MAX_INFLATED, DEFAULT_MAX_MEMBERS
+from watchdog_pool import DEFAULT_TIMEOUT, STATUS_OK, STATUS_TIMEOUT, WatchdogPool
+
+# 📌 다운로드 → 분석 스트리밍 파이프라인
+# 다운로드 스레드들이 받은 ZIP bytes 를 크기 제한 큐에 넣으면, 분석 워커(WatchdogPool)가 곧바로 메모리에서 분석합니다.
+# 큐가 가득 차면 다운로드 스레드가 기다리므로 (backpressure) 메모리 사용량은 queue_size 개 아카이브로 묶입니다.
+
+_END = object()  # 모든 다운로드가 끝났음을 알리는 sentinel
+
+
+def read_extension_rows(csv_path):
+    """다운로드 대상 CSV(id, category 컬럼)에서 (extension_id, category) 목록을 읽습니다."""
+    rows = []
+    with open(csv_path, "r", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            extension_id = (row.get("id") or "").strip()
+            if not extension_id:
+                continue
+            rows.append((extension_id, (row.get("category") or "").strip() or "uncategorized"))
+    return rows
+
+
+def _download_archive(extension_id, category, file_type, persist_folder):
+    """최신 버전을 받아 (파일 이름, bytes) 를 반환합니다. persist_folder 가 있으면 저장도 하고,
+       이미 저장된 파일이 있으면 네트워크 대신 그 파일을 읽습니다."""
+    versions = extension_downloader.get_available_versions(extension_id)
+    if not versions:
+        return None
+    version = versions[0]["version"]
+    file_name = extension_downloader.extension_file_name(extension_id, version, file_type)
+
+    file_path = os.path.join(persist_folder, category, file_name) if persist_folder else None
+    if file_path and os.path.exists(file_path):
+        with open(file_path, "rb") as f:
+            return file_name, f.read()
+
+    data = extension_downloader.fetch_extension(extension_id, version, file_type)
+    if data is None:
+        return None
+    if file_path:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "wb") as f:
+            f.write(data)
+    return file_name, data
+
+
+def _download_worker(rows_queue, archive_queue, file_type, persist_folder, stats, lock):
+    while True:
+        try:
+            extension_id, category = rows_queue.get_nowait()
+        except queue.Empty:
+            return
+        try:
+            downloaded = _download_archive(extension_id, category, file_type, persist_folder)
+        except Exception as e:
+            logging.error(f"Download failed for {extension_id}: {e}")
+            downloaded = None
+        with lock:
+            stats["downloaded" if downloaded else "download_failed"] += 1
+            if downloaded:
+                stats["downloaded_bytes"] += len(downloaded[1])
+        if downloaded:
+            archive_queue.put(downloaded)  # 큐가 가득 차면 분석이 따라올 때까지 대기
+
+
+def stream_analyze(csv_path, persist_folder=None, file_type="ZIP", download_workers=4, workers=1, queue_size=16,
+                   timeout=DEFAULT_TIMEOUT, max_inflated=DEFAULT_MAX_INFLATED, max_members=DEFAULT_MAX_MEMBERS,
+                   skip_unreferenced=False, scan_budget=None, output_dir="."):
+    """CSV 의 익스텐션들을 내려받으면서 동시에 분석하고, 결과를 SAMPLE_RESULTS 에 쌓아 ZIP 이름순으로 output_dir 에 CSV 로 저장합니다."""
+    import analyzer_extension  # 분석할 때만 import (CLI 도움말/CSV 읽기에는 필요 없음)
+    from analyzer_extension import SAMPLE_RESULTS, error_record, save_to_csv
+    rows = read_extension_rows(csv_path)
+    if not rows:
+        logging.warning(f"No extension IDs found in {csv_path}")
+        return
+
+    rows_queue = queue.Queue()
+    for row in rows:
+        rows_queue.put(row)
+    archive_queue = queue.Queue(maxsize=queue_size)
+    stats = {"downloaded": 0, "download_failed": 0, "downloaded_bytes": 0, "analyzed": 0, "max_queue_depth": 0}
+    lock = threading.Lock()
+
+    downloaders = [
+        threading.Thread(target=_download_worker, args=(rows_queue, archive_queue, file_type, persist_folder, stats, lock), daemon=True)
+        for _ in range(max(1, download_workers))
+    ]
+
+    def close_queue():
+        for thread in downloaders:
+            thread.join()
+        archive_queue.put(_END)
+
+    started = time.monotonic()
+    for thread in downloaders:
+        thread.start()
+    threading.Thread(target=close_queue, daemon=True).start()
+
+    options = {"skip_unreferenced": skip_unreferenced, "scan_budget": scan_budget,
+               "max_inflated": max_inflated, "max_members": max_members}
+    print(f"Streaming {len(rows)} extensions ({download_workers} downloaders, {workers} analysis workers)...")
+    with WatchdogPool(analyzer_extension._analyze_task, workers, timeout, analyzer_extension._init_worker, (options,)) as pool:
+        for (name, _), status, value in pool.imap_queue(archive_queue, sentinel=_END):
+            if status == STATUS_OK:
+                SAMPLE_RESULTS.append(value)
+            else:
+                SAMPLE_RESULTS.append(error_record(name, "Timeout" if status == STATUS_TIMEOUT else "WorkerCrashed"))
+            stats["analyzed"] += 1
+            stats["max_queue_depth"] = max(stats["max_queue_depth"], archive_queue.qsize())
+            print(f"[{stats['analyzed']}/{len(rows)}] Analyzed: {name} ({status}), queue depth {archive_queue.qsize()}")
+
+    elapsed = time.monotonic() - started
+    print(f"Downloaded {stats['downloaded']} ({stats['downloaded_bytes'] / (1024 * 1024):.1f} MB), "
+          f"failed {stats['download_failed']}, analyzed {stats['analyzed']} in {elapsed:.1f}s "
+          f"(max queue depth {stats['max_queue_depth']}/{queue_size}).")
+
+    if SAMPLE_RESULTS:
+        # 완료 순서가 아니라 배치 분석과 같은 ZIP 이름순으로 저장 (실행마다, 배치 결과와도 비교 가능)
+        SAMPLE_RESULTS.sort(key=lambda record: record.zip)
+        os.makedirs(output_dir, exist_ok=True)
+        save_to_csv(output_dir)
+        print(f"CSV files saved in {output_dir}: summary.csv, detailed_analysis.csv")
+    return stats
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Download Chrome extensions and analyze them in memory as they arrive.")
+    parser.add_argument("csv_file", help="CSV with 'id' and 'category' columns (same input as extension_downloader).")
+    parser.add_argument("--output-dir", default=".", help="Where to write summary.csv and detailed_analysis.csv (default: current folder).")
+    parser.add_argument("--persist", default=None, help="Also save downloaded archives under this folder (<folder>/<category>/<id>_<version>.zip).")
+    parser.add_argument("--base-url", default=None, help="Override the chrome-stats API base URL (e.g. a local stub server).")
+    parser.add_argument("--download-workers", type=int, default=4, help="Number of concurrent download threads.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of analysis worker processes.")
+    parser.add_argument("--queue-size", type=int, default=16, help="Maximum number of downloaded archives held in memory awaiting analysis.")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Per-archive analysis wall-clock limit in seconds (default: %(default)s).")
+    args = parser.parse_args()
+
+    if args.base_url:
+        extension_downloader.BASE_URL = args.base_url.rstrip("/")
+    stream_analyze(args.csv_file, args.persist, download_workers=args.download_workers, workers=args.workers,
+                   queue_size=args.queue_size, timeout=args.timeout or None, output_dir=args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,22 @@
-import pandas as pd
+import argparse
+import os
+import sys
+
 import requests
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rule_pack import load_rule_pack
+
 CHROME_STATS_API = "https://chrome-stats.com/api/detail?id={extension_id}"
 API_KEY = ""  # ChromeStats API Key
 
-# 분석할 고위험 권한 목록
-suspicious_permissions = [
-    "webRequest", "webRequestBlocking", "clipboardRead", "clipboardWrite",
-    "nativeMessaging", "proxy", "debugger", "downloads", "management", 
-    "history", "cookies", "bookmarks"
-]
-
-# 권한 관련 키워드
-context_keywords = {
-    "webRequest": ["network", "traffic", "request"],
-    "clipboardRead": ["clipboard", "copy", "paste"],
-    "clipboardWrite": ["clipboard", "copy", "paste"],
-    "nativeMessaging": ["native", "host", "external", "desktop"],
-    "proxy": ["vpn", "proxy", "ip"],
-    "debugger": ["debug", "devtool"],
-    "downloads": ["download", "file", "pdf"],
-    "management": ["extension management", "enable", "disable"],
-    "history": ["history", "visit log"],
-    "cookies": ["cookie", "session", "login"],
-    "bookmarks": ["bookmark", "save page"]
-}
-
-def fetch_extension_info(extension_id):
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+INPUT_CSV = os.path.join(RESULTS_DIR, "update_sampling_permissions.csv")
+OUTPUT_CSV = os.path.join(RESULTS_DIR, "flagged_suspicious_permissions.csv")
+
+def fetch_extension_info(extension_id, api_key=API_KEY):
     try:
-        headers = {"x-api-key": API_KEY}
+        headers = {"x-api-key": api_key}
         url = CHROME_STATS_API.format(extension_id=extension_id)
         response = requests.get(url, headers=headers, timeout=10)
         if response.status_code == 200:
@@ -37,12 +25,13 @@ def fetch_extension_info(extension_id):
         print(f"[!] Error fetching info for {extension_id}: {e}")
     return None
 
-def is_permission_contextual(text, permission):
+def is_permission_contextual(text, permission, context_keywords):
     keywords = context_keywords.get(permission, [])
     return any(kw in text.lower() for kw in keywords)
 
-def analyze_permissions(extension_id, permissions):
-    info = fetch_extension_info(extension_id)
+# rules: 분석할 고위험 권한 목록과 권한 관련 키워드 (룰 팩의 suspicious_permissions / permission_keywords)
+def analyze_permissions(extension_id, permissions, rules, api_key=API_KEY):
+    info = fetch_extension_info(extension_id, api_key)
     if not info:
         return "Unknown", ""
 
@@ -51,7 +40,7 @@ def analyze_permissions(extension_id, permissions):
     flagged = []
     for p in permissions.split(","):
         p = p.strip()
-        if p in suspicious_permissions and not is_permission_contextual(context, p):
+        if p in rules.suspicious_permissions and not is_permission_contextual(context, p, rules.permission_keywords):
             flagged.append(p)
 
     if flagged:
@@ -59,16 +48,31 @@ def analyze_permissions(extension_id, permissions):
     else:
         return "Valid", ""
 
-# CSV 로드
-df = pd.read_csv("/Users/minhyuk/Desktop/csf/ChromeExtension_Analysis/src/suspicious_permissions_analysis/update_sampling_permissions.csv", encoding="utf-8-sig")
+def flag_csv(input_csv, output_csv, rules, api_key=API_KEY):
+    import pandas as pd  # flag 작업에서만 필요 (import 비용이 큼)
+
+    # CSV 로드
+    df = pd.read_csv(input_csv, encoding="utf-8-sig")
+
+    # 분석 실행
+    df[["Suspicious Permissions", "Suspicious Check"]] = df.apply(
+        lambda row: analyze_permissions(row["Extension ID"], row["Permissions"], rules, api_key) if pd.notna(row["Permissions"]) else ("None", ""),
+        axis=1, result_type="expand"
+    )
+
+    # 저장
+    df.to_csv(output_csv, index=False, encoding="utf-8-sig")
 
-# 분석 실행
-df[["Suspicious Permissions", "Suspicious Check"]] = df.apply(
-    lambda row: analyze_permissions(row["Extension ID"], row["Permissions"]) if pd.notna(row["Permissions"]) else ("None", ""),
-    axis=1, result_type="expand"
-)
+    print("✅ 'Suspicious Permissions'와 'Suspicious Check' 컬럼 추가 완료.")
 
-# 저장
-df.to_csv("/Users/minhyuk/Desktop/csf/ChromeExtension_Analysis/src/suspicious_permissions_analysis/flagged_suspicious_permissions.csv", index=False, encoding="utf-8-sig")
+def main():
+    parser = argparse.ArgumentParser(description="Flag suspicious permissions that an extension's store listing does not explain.")
+    parser.add_argument("input_csv", nargs="?", default=INPUT_CSV, help="update_extension_csv.py output (default: results/update_sampling_permissions.csv).")
+    parser.add_argument("output_csv", nargs="?", default=OUTPUT_CSV, help="Flagged CSV (default: results/flagged_suspicious_permissions.csv).")
+    parser.add_argument("--api-key", default=API_KEY, help="chrome-stats API key.")
+    parser.add_argument("--rules", default=None, help="Rule pack JSON (default: $EXTENSION_RULES or rules/default.json).")
+    args = parser.parse_args()
+    flag_csv(args.input_csv, args.output_csv, load_rule_pack(args.rules), args.api_key)
 
-print("✅ 'Suspicious Permissions'와 'Suspicious Check' 컬럼 추가 완료.")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
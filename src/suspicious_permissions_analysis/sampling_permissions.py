@@ -1,15 +1,13 @@
+import argparse
 import csv
 import json
 import os
 import random
+import sys
 import zipfile
 
-# Over-Permissioned 권한 목록
-OVER_PERMISSIONED = {
-    "webRequest", "webRequestBlocking", "clipboardRead",
-    "clipboardWrite", "nativeMessaging", "proxy", "debugger",
-    "downloads", "management", "history", "cookies", "bookmarks"
-}
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rule_pack import load_rule_pack
 
 SAMPLE_SIZE = 2000  # 랜덤 샘플링 개수
 
@@ -34,8 +32,8 @@ def extract_manifest_json(zip_path):
         return None
     return None
 
-# Over-Permissioned 권한 검사
-def check_permissions(manifest):
+# Over-Permissioned 권한 검사 (over_permissioned: 룰 팩의 suspicious_permissions)
+def check_permissions(manifest, over_permissioned):
     if not manifest:
         return []
     
@@ -46,21 +44,22 @@ def check_permissions(manifest):
     
     permissions = {p for p in permissions if isinstance(p, str)}
     
-    over_permitted = permissions.intersection(OVER_PERMISSIONED)
+    over_permitted = permissions.intersection(over_permissioned)
     return list(over_permitted)
 
-# 500개 랜덤 샘플링 후 분석
-def analyze_sampled_extensions(input_folder, output_csv):
+# sample_size 개 랜덤 샘플링 후 분석
+def analyze_sampled_extensions(input_folder, output_csv, sample_size=SAMPLE_SIZE, rules_path=None):
+    over_permissioned = load_rule_pack(rules_path).suspicious_permissions
     zip_files = get_zip_files(input_folder)
 
-    if len(zip_files) < SAMPLE_SIZE:
-        print(f"ZIP 파일이 2000개 미만입니다. ({len(zip_files)}개 발견됨)")
+    if len(zip_files) < sample_size:
+        print(f"ZIP 파일이 {sample_size}개 미만입니다. ({len(zip_files)}개 발견됨)")
         return
 
     # 랜덤 샘플링
-    sampled_files = random.sample(zip_files, SAMPLE_SIZE)
+    sampled_files = random.sample(zip_files, sample_size)
 
-    print("\n[샘플링된 2000개 익스텐션 분석 시작]\n")
+    print(f"\n[샘플링된 {sample_size}개 익스텐션 분석 시작]\n")
 
     # CSV 파일 저장
     with open(output_csv, "w", newline="") as csvfile:
@@ -70,14 +69,20 @@ def analyze_sampled_extensions(input_folder, output_csv):
         for zip_path in sampled_files:
             print(f"Analyzing: {zip_path}")
             manifest = extract_manifest_json(zip_path)
-            over_permissions = check_permissions(manifest)
+            over_permissions = check_permissions(manifest, over_permissioned)
             writer.writerow([zip_path, ", ".join(over_permissions) if over_permissions else "None"])
 
     print(f"\n[분석 완료] 결과 저장: {output_csv}")
 
+def main():
+    parser = argparse.ArgumentParser(description="Randomly sample extension archives and list the suspicious permissions their manifests declare.")
+    parser.add_argument("input_folder", help="Folder (searched recursively) with .zip extension archives.")
+    parser.add_argument("-o", "--output", default="sampling_permissions.csv", help="Output CSV (default: %(default)s).")
+    parser.add_argument("--sample-size", type=int, default=SAMPLE_SIZE, help="Number of archives to sample (default: %(default)s).")
+    parser.add_argument("--rules", default=None, help="Rule pack JSON (default: $EXTENSION_RULES or rules/default.json).")
+    args = parser.parse_args()
+    analyze_sampled_extensions(args.input_folder, args.output, args.sample_size, args.rules)
+
 # 실행
 if __name__ == "__main__":
-    INPUT_FOLDER = "/home/minhyuk/Desktop/Download_extension/Extensions"  # ZIP 파일이 있는 폴더
-    OUTPUT_CSV = "sampling_permissions.csv"
-
-    analyze_sampled_extensions(INPUT_FOLDER, OUTPUT_CSV)
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -1,10 +1,13 @@
+import argparse
 import csv
+import os
 import re
 
 import requests
 
-INPUT_CSV = "/Users/minhyuk/Desktop/csf/ChromeExtension_Analysis/src/suspicious_permissions_analysis/sampling_permissions.csv"
-OUTPUT_CSV = "/Users/minhyuk/Desktop/csf/ChromeExtension_Analysis/src/suspicious_permissions_analysis/update_sampling_permissions.csv"
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+INPUT_CSV = os.path.join(RESULTS_DIR, "sampling_permissions.csv")
+OUTPUT_CSV = os.path.join(RESULTS_DIR, "update_sampling_permissions.csv")
 API_KEY = ''  # ChromeStats API Key
 API_URL = 'https://chrome-stats.com/api/detail'
 
@@ -13,9 +16,9 @@ def extract_extension_id(path):
     match = re.search(r"/([a-p]{32})_[^/]+\.zip$", path)
     return match.group(1) if match else None
 
-def fetch_extension_info(extension_id):
+def fetch_extension_info(extension_id, api_key=API_KEY):
     """ChromeStats API로 확장 프로그램 정보 가져오기"""
-    headers = {'x-api-key': API_KEY}
+    headers = {'x-api-key': api_key}
     params = {'id': extension_id}
     try:
         response = requests.get(API_URL, headers=headers, params=params, timeout=10)
@@ -28,7 +31,7 @@ def fetch_extension_info(extension_id):
         print(f"[!] Error fetching {extension_id}: {e}")
         return "Unknown", "Unknown"
 
-def process_csv(input_csv, output_csv):
+def process_csv(input_csv, output_csv, api_key=API_KEY):
     """CSV를 처리하고 확장 프로그램 이름과 설명 추가"""
     with open(input_csv, "r", encoding="utf-8") as infile, open(output_csv, "w", newline="", encoding="utf-8-sig") as outfile:
         reader = csv.reader(infile)
@@ -44,11 +47,20 @@ def process_csv(input_csv, output_csv):
             extension_id = extract_extension_id(extension_path)
 
             if extension_id:
-                name, desc = fetch_extension_info(extension_id)
+                name, desc = fetch_extension_info(extension_id, api_key)
                 print(f"[+] {extension_id} → {name}")
                 writer.writerow([extension_path, extension_id, name, desc, permissions])
             else:
                 print(f"[!] Failed to parse ID from: {extension_path}")
                 writer.writerow([extension_path, "Unknown", "Unknown", "Unknown", permissions])
 
-process_csv(INPUT_CSV, OUTPUT_CSV)
\ No newline at end of file
+def main():
+    parser = argparse.ArgumentParser(description="Add chrome-stats names and descriptions to a sampling_permissions.py output CSV.")
+    parser.add_argument("input_csv", nargs="?", default=INPUT_CSV, help="sampling_permissions.py output (default: results/sampling_permissions.csv).")
+    parser.add_argument("output_csv", nargs="?", default=OUTPUT_CSV, help="Enriched CSV (default: results/update_sampling_permissions.csv).")
+    parser.add_argument("--api-key", default=API_KEY, help="chrome-stats API key.")
+    args = parser.parse_args()
+    process_csv(args.input_csv, args.output_csv, args.api_key)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import logging
+
+# 📌 2단계 분류 (tier 1: manifest 만 보고 판단, tier 2: 전체 JS 패턴 스캔)
+# 대부분의 익스텐션은 의심 권한을 하나도 선언하지 않으므로, manifest(와 중앙 디렉토리의 멤버 목록)만으로
+# 깊은 스캔이 필요한지 먼저 가려내고 필요한 것만 압축을 풀어 스캔합니다.
+
+TIER_MANIFEST = 1
+TIER_DEEP = 2
+
+# 모든 사이트에 접근할 수 있는 host 권한 패턴
+BROAD_HOST_PATTERNS = frozenset({"<all_urls>", "*://*/*", "http://*/*", "https://*/*", "*://*/", "file:///*"})
+HOST_PERMISSION_PREFIXES = ("<", "http:", "https:", "*:", "file:", "ws:", "wss:", "ftp:")
+
+REASON_PERMISSION = "permission"
+REASON_BROAD_HOST = "broad_host"
+REASON_MANIFEST_VERSION = "manifest_version"
+REASON_WASM = "wasm"
+
+
+class TriageCriteria:
+    """tier 1 에서 깊은 스캔(tier 2)으로 보낼 조건. 하나라도 해당하면 깊은 스캔합니다.
+
+       - permissions: 이 중 하나라도 선언하면 (보통 룰 팩의 suspicious_permissions, 빈 집합이면 권한 조건 사용 안 함)
+       - broad_hosts: 모든 사이트 host 권한(<all_urls>, *://*/* 등)을 선언하면
+       - manifest_versions: manifest_version 이 이 안에 있으면 (예: {2} → MV2 는 항상 깊은 스캔)
+       - wasm: .wasm 멤버가 있으면
+       워커 프로세스로 넘어가야 하므로 pickle 가능한 단순 클래스로 둡니다."""
+
+    def __init__(self, permissions, broad_hosts=True, manifest_versions=(), wasm=True):
+        self.permissions = frozenset(permissions)
+        self.broad_hosts = broad_hosts
+        self.manifest_versions = frozenset(manifest_versions)
+        self.wasm = wasm
+
+
+def declared_host_patterns(manifest):
+    """MV3 host_permissions/optional_host_permissions 와 MV2 permissions 안의 host 패턴, content_scripts matches 를 모읍니다."""
+    patterns = set()
+    for key in ("host_permissions", "optional_host_permissions", "permissions", "optional_permissions"):
+        values = manifest.get(key, [])
+        if isinstance(values, list):
+            patterns.update(v for v in values if isinstance(v, str) and v.startswith(HOST_PERMISSION_PREFIXES))
+    for script in manifest.get("content_scripts", []) if isinstance(manifest.get("content_scripts"), list) else []:
+        if isinstance(script, dict) and isinstance(script.get("matches"), list):
+            patterns.update(m for m in script["matches"] if isinstance(m, str))
+    return patterns
+
+
+def triage_manifest(manifest, plan, criteria):
+    """manifest(dict) 와 MemberPlan 만으로 깊은 스캔이 필요한지 판단합니다. (필요 여부, 사유 목록) 을 반환."""
+    reasons = []
+    permissions = manifest.get("permissions", []) if isinstance(manifest.get("permissions"), list) else []
+    matched = sorted(p for p in permissions if isinstance(p, str) and p in criteria.permissions)
+    if matched:
+        reasons.append(f"{REASON_PERMISSION}:{','.join(matched)}")
+    if criteria.broad_hosts and declared_host_patterns(manifest) & BROAD_HOST_PATTERNS:
+        reasons.append(REASON_BROAD_HOST)
+    if manifest.get("manifest_version") in criteria.manifest_versions:
+        reasons.append(f"{REASON_MANIFEST_VERSION}:{manifest.get('manifest_version')}")
+    if criteria.wasm and plan.wasm:
+        reasons.append(REASON_WASM)
+    return bool(reasons), reasons
+
+
+def triage_report(results):
+    """결과 레코드들의 triage 정보로 tier 별 개수와 절약된 시간(추정)을 계산합니다.
+
+       tier 1 에서 끝난 아카이브가 깊은 스캔을 했다면 걸렸을 시간은 tier 2 아카이브의 평균 스캔 시간으로 추정합니다."""
+    tiers = {TIER_MANIFEST: 0, TIER_DEEP: 0}
+    seconds = {TIER_MANIFEST: 0.0, TIER_DEEP: 0.0}
+    reasons = {}
+    for result in results:
+        triage = result.triage
+        if not triage:
+            continue
+        tiers[triage["tier"]] += 1
+        seconds[triage["tier"]] += triage["seconds"]
+        for reason in triage["reasons"]:
+            key = reason.split(":", 1)[0]
+            reasons[key] = reasons.get(key, 0) + 1
+    deep_average = seconds[TIER_DEEP] / tiers[TIER_DEEP] if tiers[TIER_DEEP] else 0.0
+    manifest_average = seconds[TIER_MANIFEST] / tiers[TIER_MANIFEST] if tiers[TIER_MANIFEST] else 0.0
+    return {
+        "tier1_only": tiers[TIER_MANIFEST],
+        "tier2": tiers[TIER_DEEP],
+        "tier1_seconds": round(seconds[TIER_MANIFEST], 3),
+        "tier2_seconds": round(seconds[TIER_DEEP], 3),
+        "deep_scan_reasons": reasons,
+        "estimated_seconds_saved": round(max(0.0, deep_average - manifest_average) * tiers[TIER_MANIFEST], 3),
+    }
+
+
+def log_triage_report(report):
+    total = report["tier1_only"] + report["tier2"]
+    if not total:
+        return
+    print(f"Triage: {report['tier2']}/{total} archives needed a deep scan "
+          f"(reasons: {', '.join(f'{k}={v}' for k, v in sorted(report['deep_scan_reasons'].items())) or 'none'}); "
+          f"{report['tier1_only']} settled from the manifest alone.")
+    print(f"Triage time: tier 1 {report['tier1_seconds']}s, tier 2 {report['tier2_seconds']}s, "
+          f"estimated {report['estimated_seconds_saved']}s saved.")
+    logging.info(f"Triage report: {report}")
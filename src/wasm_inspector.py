@@ -0,0 +1,211 @@
+import io
+import logging
+from collections import OrderedDict
+
+# 📌 WASM 바이너리 섹션 ID -> 이름 (https://webassembly.github.io/spec/core/binary/modules.html)
+SECTION_NAMES = {
+    0: "custom", 1: "type", 2: "import", 3: "function", 4: "table", 5: "memory",
+    6: "global", 7: "export", 8: "start", 9: "element", 10: "code", 11: "data",
+    12: "datacount", 13: "tag",
+}
+SECTION_IMPORT = 2
+SECTION_EXPORT = 7
+SECTION_CUSTOM = 0
+
+EXTERNAL_KINDS = {0: "func", 1: "table", 2: "memory", 3: "global", 4: "tag"}
+
+WASM_MAGIC = b"\x00asm"
+SKIP_CHUNK = 64 * 1024
+# import/export 섹션 payload 만 메모리에 올림. 비정상적으로 큰 경우는 파싱하지 않음
+MAX_TABLE_SECTION = 16 * 1024 * 1024
+
+# (CRC-32, 원본 크기, 압축 크기) -> 분석 결과. 같은 emscripten 런타임이 여러 익스텐션에 반복되므로 실행 중 재사용하되,
+# 키는 중앙 디렉토리 값이라 캐시 hit 에는 압축 해제가 필요 없음. miss 는 끝까지 읽으므로 CRC-32 도 그때 확인됨.
+# 장시간 실행(watch/stream)에서도 메모리가 늘지 않도록 최근 WASM_CACHE_SIZE 개만 유지 (LRU)
+WASM_CACHE = OrderedDict()
+WASM_CACHE_SIZE = 256
+
+
+class WasmFormatError(Exception):
+    pass
+
+
+def _read_exact(stream, size):
+    data = stream.read(size)
+    if len(data) != size:
+        raise WasmFormatError("unexpected end of module")
+    return data
+
+
+def read_uleb128(stream):
+    """스트림에서 unsigned LEB128 정수를 읽습니다."""
+    return _read_uleb128_sized(stream)[0]
+
+
+def _read_uleb128_sized(stream):
+    result = 0
+    shift = 0
+    consumed = 0
+    while True:
+        byte = _read_exact(stream, 1)[0]
+        consumed += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, consumed
+        shift += 7
+        if shift > 63:
+            raise WasmFormatError("LEB128 value too long")
+
+
+def _read_name(stream):
+    length = read_uleb128(stream)
+    return _read_exact(stream, length).decode("utf-8", errors="replace")
+
+
+def _skip_limits(stream):
+    flags = _read_exact(stream, 1)[0]
+    read_uleb128(stream)  # min
+    if flags & 0x01:
+        read_uleb128(stream)  # max
+
+
+def _skip(stream, size):
+    """섹션 payload를 SKIP_CHUNK 단위로 읽어 버립니다 (압축 스트림이라 seek 대신 사용)."""
+    while size > 0:
+        chunk = stream.read(min(size, SKIP_CHUNK))
+        if not chunk:
+            raise WasmFormatError("unexpected end of module")
+        size -= len(chunk)
+
+
+# 📌 import/export 섹션 파싱
+def parse_import_section(payload):
+    """import 섹션을 파싱해 [(module, field, kind)] 목록을 반환합니다."""
+    stream = io.BytesIO(payload)
+    imports = []
+    for _ in range(read_uleb128(stream)):
+        module = _read_name(stream)
+        field = _read_name(stream)
+        kind = _read_exact(stream, 1)[0]
+        if kind == 0:      # func: type index
+            read_uleb128(stream)
+        elif kind == 1:    # table: reftype + limits
+            _read_exact(stream, 1)
+            _skip_limits(stream)
+        elif kind == 2:    # memory: limits
+            _skip_limits(stream)
+        elif kind == 3:    # global: valtype + mutability
+            _read_exact(stream, 2)
+        elif kind == 4:    # tag: attribute + type index
+            _read_exact(stream, 1)
+            read_uleb128(stream)
+        else:
+            raise WasmFormatError(f"unknown import kind {kind}")
+        imports.append((module, field, EXTERNAL_KINDS[kind]))
+    return imports
+
+
+def parse_export_section(payload):
+    """export 섹션을 파싱해 [(name, kind)] 목록을 반환합니다."""
+    stream = io.BytesIO(payload)
+    exports = []
+    for _ in range(read_uleb128(stream)):
+        name = _read_name(stream)
+        kind = _read_exact(stream, 1)[0]
+        read_uleb128(stream)  # index
+        exports.append((name, EXTERNAL_KINDS.get(kind, str(kind))))
+    return exports
+
+
+# 📌 WASM 모듈 스트리밍 분석
+def inspect_wasm_stream(stream):
+    """열린 WASM 파일 객체를 앞에서부터 한 번 읽으며 섹션 크기와 import/export 테이블을 추출합니다.
+       code/data 등 큰 섹션은 메모리에 올리지 않고 건너뜁니다."""
+    info = {"valid": False, "version": None, "imports": {}, "exports": [], "section_sizes": {}, "custom_sections": [], "code_size": 0}
+    try:
+        header = stream.read(8)
+        if len(header) != 8 or header[:4] != WASM_MAGIC:
+            raise WasmFormatError("not a WebAssembly module")
+        info["version"] = int.from_bytes(header[4:], "little")
+
+        while True:
+            first = stream.read(1)
+            if not first:
+                break
+            section_id = first[0]
+            size = read_uleb128(stream)
+            name = SECTION_NAMES.get(section_id, f"unknown_{section_id}")
+            info["section_sizes"][name] = info["section_sizes"].get(name, 0) + size
+
+            if section_id in (SECTION_IMPORT, SECTION_EXPORT) and size <= MAX_TABLE_SECTION:
+                payload = _read_exact(stream, size)
+                if section_id == SECTION_IMPORT:
+                    for module, field, kind in parse_import_section(payload):
+                        info["imports"].setdefault(module, []).append(field if kind == "func" else f"{field} ({kind})")
+                else:
+                    info["exports"] = [export_name for export_name, _ in parse_export_section(payload)]
+            elif section_id == SECTION_CUSTOM:
+                # custom 섹션은 이름만 기록 (name, producers, sourceMappingURL 등)
+                name_len, len_size = _read_uleb128_sized(stream)
+                if len_size + name_len > size:
+                    raise WasmFormatError("custom section name exceeds section size")
+                custom_name = _read_exact(stream, name_len).decode("utf-8", errors="replace")
+                info["custom_sections"].append(custom_name)
+                consumed = len_size + name_len
+                _skip(stream, size - consumed)
+            else:
+                _skip(stream, size)
+
+        info["code_size"] = info["section_sizes"].get("code", 0)
+        info["valid"] = True
+    except WasmFormatError as e:
+        info["error"] = str(e)
+    return info
+
+
+def _member_key(zip_info):
+    """캐시 키: 중앙 디렉토리에서 바로 읽을 수 있는 (CRC-32, 원본 크기, 압축 크기)."""
+    return zip_info.CRC, zip_info.file_size, zip_info.compress_size
+
+
+def _failed_info(error):
+    return {"valid": False, "error": error, "imports": {}, "exports": [], "section_sizes": {}, "custom_sections": [], "code_size": 0}
+
+
+def inspect_wasm_member(z, zip_info):
+    """ZIP 멤버(.wasm)를 분석합니다. CRC-32/크기가 같은 모듈은 압축을 풀지 않고 캐시된 결과를 반환합니다."""
+    key = _member_key(zip_info)
+    cached = WASM_CACHE.get(key)
+    if cached is not None:
+        WASM_CACHE.move_to_end(key)
+        logging.debug(f"WASM cache hit for {zip_info.filename}")
+        return cached
+    try:
+        with z.open(zip_info) as f:
+            info = inspect_wasm_stream(f)
+    except Exception as e:
+        logging.error(f"Error reading WASM member {zip_info.filename}: {e}")
+        return _failed_info(type(e).__name__)
+    WASM_CACHE[key] = info
+    if len(WASM_CACHE) > WASM_CACHE_SIZE:
+        WASM_CACHE.popitem(last=False)
+    return info
+
+
+def summarize_wasm_modules(module_infos):
+    """익스텐션 내 WASM 모듈 분석 결과들을 CSV 컬럼용 요약 dict 로 합칩니다."""
+    imports = {}
+    exports = set()
+    code_size = 0
+    for info in module_infos:
+        for module, fields in info.get("imports", {}).items():
+            imports.setdefault(module, set()).update(fields)
+        exports.update(info.get("exports", []))
+        code_size += info.get("code_size", 0)
+    return {
+        "modules": len(module_infos),
+        "invalid_modules": sum(1 for info in module_infos if not info.get("valid")),
+        "imports": {module: sorted(fields) for module, fields in sorted(imports.items())},
+        "exports": sorted(exports),
+        "code_size": code_size,
+    }
@@ -0,0 +1,363 @@
+import argparse
+import csv
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+from member_plan import DEFAULT_MAX_INFLATED, DEFAULT_MAX_MEMBERS
+from results_db import ResultsDB
+from shard_merge import add_record, empty_aggregate, write_aggregate
+from watchdog_pool import DEFAULT_TIMEOUT, STATUS_OK, STATUS_TIMEOUT, WatchdogPool
+
+# 📌 watch(데몬) 모드
+# 크롤러가 코퍼스 폴더에 새 아카이브를 떨어뜨리면 그것만 분석해 detailed_analysis.csv 에 반영하고,
+# summary.csv / aggregate.json 은 전체를 다시 계산하지 않고 증분으로 갱신합니다.
+# 아카이브는 코퍼스 폴더 기준 상대 경로로 구분하고, 행의 "ZIP File" 칸에도 그 경로를 씁니다
+# (카테고리 폴더마다 같은 이름의 파일이 있어도 CSV/결과 DB 에서 섞이지 않음).
+
+STATE_FILE = "watch_state.json"
+STATUS_FILE = "watch_status.json"
+ARCHIVE_EXTENSIONS = (".zip", ".crx")
+STATE_VERSION = 3
+
+
+class CorpusWatcher:
+    """코퍼스 폴더를 scandir 로 폴링해 새로 생기거나 바뀌거나 사라진 아카이브를 찾습니다.
+
+       디렉토리별 mtime 을 watermark 로 저장해 두고, mtime 이 그대로인 디렉토리는 다시 나열하지 않습니다
+       (파일이 추가/삭제되면 디렉토리 mtime 이 바뀜). 제자리에서 덮어쓴 파일은 디렉토리 mtime 을 바꾸지 않으므로
+       full_rescan_every 번째 폴링마다 전체를 다시 훑습니다. 쓰는 중인 파일은 settle 초 동안 mtime 이 그대로일 때만 넘깁니다.
+
+       scan 은 state_lock 없이 실행됩니다. state["archives"] 는 읽기만 하고, state["dirs"] 는 복사본을 고친 뒤
+       끝에서 통째로 바꿔 넣으므로 flush 가 저장하는 dirs 는 항상 완성된 폴링 결과입니다."""
+
+    def __init__(self, corpus_dir, state, settle=5.0, full_rescan_every=10):
+        self.corpus_dir = os.path.abspath(corpus_dir)
+        self.state = state
+        self.settle_ns = int(settle * 1e9)
+        self.full_rescan_every = max(1, full_rescan_every)
+        self.polls = 0
+
+    def path_of(self, rel_path):
+        return os.path.join(self.corpus_dir, *rel_path.split("/"))
+
+    def _prefix(self, directory):
+        if directory == self.corpus_dir:
+            return ""
+        return os.path.relpath(directory, self.corpus_dir).replace(os.sep, "/") + "/"
+
+    def scan(self, pending):
+        """(새/변경 아카이브 [(상대 경로, size, mtime_ns)], 사라진 아카이브 [상대 경로]) 를 반환합니다.
+           pending(분석 대기/진행 중) 경로는 둘 다에서 제외합니다."""
+        self.polls += 1
+        full = self.polls % self.full_rescan_every == 1 or self.full_rescan_every == 1
+        archives = self.state["archives"]
+        dirs = dict(self.state["dirs"])
+        now_ns = time.time_ns()
+        found = []
+        removed = []
+        stack = [self.corpus_dir]
+        while stack:
+            directory = stack.pop()
+            cached = dirs.get(directory)
+            try:
+                dir_mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                # 디렉토리가 사라지면 그 안의 아카이브와 하위 디렉토리도 사라진 것으로 처리
+                dirs.pop(directory, None)
+                if cached:
+                    removed.extend(rel for rel in cached[2] if rel in archives and rel not in pending)
+                    stack.extend(cached[1])
+                continue
+            if not full and cached and cached[0] == dir_mtime:
+                stack.extend(cached[1])
+                continue
+
+            prefix = self._prefix(directory)
+            subdirs = []
+            files = []
+            unsettled = False
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                            continue
+                        if not entry.name.endswith(ARCHIVE_EXTENSIONS):
+                            continue
+                        rel = prefix + entry.name
+                        files.append(rel)
+                        if rel in pending:
+                            continue
+                        st = entry.stat()
+                        if now_ns - st.st_mtime_ns < self.settle_ns:
+                            unsettled = True  # 아직 쓰는 중일 수 있음 → 다음 폴링에서 다시 확인
+                            continue
+                        if archives.get(rel) != [st.st_size, st.st_mtime_ns]:
+                            found.append((rel, st.st_size, st.st_mtime_ns))
+            except OSError as e:
+                logging.warning(f"Cannot list {directory}: {e}")
+                continue
+            if cached:
+                current = set(files)
+                removed.extend(rel for rel in cached[2] if rel not in current and rel in archives and rel not in pending)
+                stack.extend(set(cached[1]) - set(subdirs))  # 사라진 하위 디렉토리도 확인
+            # 쓰는 중인 파일이 있으면 mtime 을 기록하지 않아 다음 폴링에서 다시 나열
+            dirs[directory] = [None if unsettled else dir_mtime, subdirs, files]
+            stack.extend(subdirs)
+        self.state["dirs"] = dirs
+        return found, removed
+
+
+class DetailedRows:
+    """detailed_analysis.csv 의 행을 아카이브 상대 경로("ZIP File" 칸)별로 메모리에 들고 있는 색인.
+
+       파일의 행 순서는 watch 상태의 archives 순서와 같습니다. 새 아카이브 행은 flush 때 파일 끝에 덧붙이고,
+       다시 분석했거나 사라진 아카이브가 있을 때만 파일 전체를 다시 씁니다 (같은 아카이브의 행이 쌓이지 않음)."""
+
+    def __init__(self, path, header):
+        self.path = path
+        self.header = header
+        self.rows = {}
+        self._appended = []
+        self._rewrite = True
+
+    def load(self, archives, signature):
+        """파일의 행을 archives(상대 경로 목록, 파일 순서)에 맞춥니다. 파일이 상태 저장 시점(signature)과 같고
+           행이 모두 맞으면 True, 아니면 맞는 행만 남기고 False (호출하는 쪽은 집계를 행에서 다시 계산)."""
+        with open(self.path, newline="", encoding="utf-8") as csvfile:
+            reader = csv.reader(csvfile)
+            next(reader, None)
+            rows = [row for row in reader if row]
+        if self.signature() == signature and [row[0] for row in rows] == archives:
+            self.rows = dict(zip(archives, rows))
+            self._rewrite = False
+            return True
+        by_path = {row[0]: row for row in rows}
+        self.rows = {rel: by_path[rel] for rel in archives if rel in by_path}
+        return False
+
+    def signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return [st.st_size, st.st_mtime_ns]
+
+    def get(self, rel_path):
+        return self.rows.get(rel_path)
+
+    def put(self, rel_path, row):
+        if rel_path in self.rows:
+            self._rewrite = True  # 기존 행 교체
+        else:
+            self._appended.append(row)
+        self.rows[rel_path] = row
+
+    def remove(self, rel_path):
+        if self.rows.pop(rel_path, None) is not None:
+            self._rewrite = True
+
+    def write(self):
+        """바뀐 내용을 파일에 반영하고 파일 signature([size, mtime_ns])를 반환합니다."""
+        if self._rewrite:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", newline="", encoding="utf-8") as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(self.header)
+                writer.writerows(self.rows.values())
+            os.replace(tmp_path, self.path)
+        elif self._appended:
+            with open(self.path, "a", newline="", encoding="utf-8") as csvfile:
+                csv.writer(csvfile).writerows(self._appended)
+        self._appended = []
+        self._rewrite = False
+        return self.signature()
+
+
+def load_state(output_dir, rules_fingerprint):
+    """저장된 watch 상태를 읽습니다. 없거나, 버전/룰 팩 fingerprint 가 다르면 빈 상태를 만들고 (state, True) 를 반환합니다.
+       빈 상태이면 모든 아카이브를 다시 분석하므로 호출하는 쪽은 이전 detailed_analysis.csv 도 새로 시작해야 합니다."""
+    path = os.path.join(output_dir, STATE_FILE)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("version") != STATE_VERSION:
+            logging.warning(f"Ignoring {path} written by an incompatible version.")
+        elif state.get("rules") != rules_fingerprint:
+            logging.warning(f"Rule pack changed since {path} was written; re-analyzing the whole corpus.")
+        else:
+            return state, False
+    return {"version": STATE_VERSION, "rules": rules_fingerprint, "archives": {}, "dirs": {}, "detailed": None,
+            "aggregate": _empty_watch_aggregate(rules_fingerprint)}, True
+
+
+def _empty_watch_aggregate(rules_fingerprint):
+    aggregate = empty_aggregate()
+    aggregate["rules"] = [rules_fingerprint]
+    return aggregate
+
+
+def _write_json_atomic(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def watch(corpus_dir, output_dir=".", interval=30.0, settle=5.0, full_rescan_every=10, workers=1, timeout=DEFAULT_TIMEOUT,
+          max_inflated=DEFAULT_MAX_INFLATED, max_members=DEFAULT_MAX_MEMBERS, skip_unreferenced=False, scan_budget=None,
+          once=False, results_db=None):
+    """corpus_dir 를 interval 초마다 폴링하며 새 아카이브를 분석합니다. once=True 면 현재 있는 것만 처리하고 끝납니다.
+       results_db(SQLite 경로)가 주어지면 flush 할 때마다 바뀐 행을 결과 DB 에 반영합니다."""
+    import analyzer_extension  # 분석을 시작할 때만 import (CLI 도움말/상태 파일 도구에는 필요 없음)
+    from analyzer_extension import detailed_row, error_record, record_from_detailed_row, write_summary_csv
+    rules = analyzer_extension.get_rules()
+    api_table, fingerprint = rules.api_table, rules.rules.fingerprint
+    os.makedirs(output_dir, exist_ok=True)
+    state, fresh = load_state(output_dir, fingerprint)
+    watcher = CorpusWatcher(corpus_dir, state, settle, full_rescan_every)
+    detailed = DetailedRows(os.path.join(output_dir, "detailed_analysis.csv"), rules.detailed_header)
+    if not fresh and os.path.exists(detailed.path):
+        if not detailed.load(list(state["archives"]), state.get("detailed")):
+            # 상태와 CSV 가 어긋남 (저장 도중 중단 등) → CSV 에 남은 행으로 집계를 다시 만들고 나머지는 다시 분석
+            logging.warning(f"{detailed.path} does not match {STATE_FILE}; rebuilding the aggregate from its rows.")
+            state["archives"] = {rel: state["archives"][rel] for rel in detailed.rows}
+            state["aggregate"] = _empty_watch_aggregate(fingerprint)
+            for row in detailed.rows.values():
+                add_record(state["aggregate"], record_from_detailed_row(row), api_table)
+    elif state["archives"]:
+        state["archives"] = {}
+        state["aggregate"] = _empty_watch_aggregate(fingerprint)
+    aggregate = state["aggregate"]
+    state_lock = threading.Lock()
+    task_queue = queue.Queue()
+    pending = {}  # 상대 경로 -> (size, mtime_ns), 큐에 들어갔거나 분석 중인 아카이브
+    stop = threading.Event()
+    done = object()
+    counters = {"discovered": 0, "analyzed": 0, "removed": 0, "errors": 0, "analyzed_bytes": 0, "polls": 0, "last_scan_seconds": 0.0}
+
+    def forget(rel_path):
+        """사라진 아카이브의 결과를 집계와 CSV 에서 뺍니다. state_lock 을 잡은 상태에서 호출."""
+        previous = detailed.get(rel_path)
+        if previous:
+            add_record(aggregate, record_from_detailed_row(previous), api_table, sign=-1)
+        detailed.remove(rel_path)
+        state["archives"].pop(rel_path, None)
+        counters["removed"] += 1
+
+    def poll_loop():
+        while not stop.is_set():
+            started = time.monotonic()
+            # 디렉토리 탐색은 느릴 수 있으므로 lock 밖에서 실행 (그동안 결과 반영/flush 가 막히지 않음).
+            # 분석 중인 아카이브는 pending 스냅샷으로 제외해, 탐색 도중 끝난 결과를 새 아카이브로 다시 잡지 않음
+            with state_lock:
+                in_flight = set(pending)
+            found, removed = watcher.scan(in_flight)
+            with state_lock:
+                for rel_path, size, mtime_ns in found:
+                    pending[rel_path] = (size, mtime_ns)
+                for rel_path in removed:
+                    if rel_path in state["archives"]:
+                        forget(rel_path)
+            for rel_path, _, _ in found:
+                task_queue.put(watcher.path_of(rel_path))
+            counters["discovered"] += len(found)
+            counters["polls"] += 1
+            counters["last_scan_seconds"] = round(time.monotonic() - started, 4)
+            if found or removed:
+                logging.info(f"Poll found {len(found)} new or changed and {len(removed)} removed archives.")
+            if once:
+                task_queue.put(done)
+                return
+            stop.wait(interval)
+
+    def flush(started):
+        with state_lock:
+            # CSV 를 먼저 쓰고 그 signature 를 상태에 남겨, 다음 실행에서 둘이 어긋났는지 확인할 수 있도록 함
+            state["detailed"] = detailed.write()
+            state["aggregate"] = aggregate
+            _write_json_atomic(os.path.join(output_dir, STATE_FILE), state)
+            write_summary_csv(aggregate["api_totals"], os.path.join(output_dir, "summary.csv"))
+            write_aggregate(aggregate, output_dir)
+        if results_db:
+            with ResultsDB(results_db) as db:
+                db.load_detailed_csv(detailed.path)
+        elapsed = max(time.monotonic() - started, 1e-9)
+        status = dict(counters, queue_depth=task_queue.qsize(), in_flight=len(pending) - task_queue.qsize(),
+                      uptime_seconds=round(elapsed, 1), archives_per_minute=round(counters["analyzed"] * 60 / elapsed, 2),
+                      mb_per_second=round(counters["analyzed_bytes"] / elapsed / (1024 * 1024), 3))
+        _write_json_atomic(os.path.join(output_dir, STATUS_FILE), status)
+        print(f"[watch] analyzed {status['analyzed']} ({status['archives_per_minute']}/min), queue depth {status['queue_depth']}, "
+              f"in flight {status['in_flight']}, removed {status['removed']}, errors {status['errors']}")
+
+    options = {"skip_unreferenced": skip_unreferenced, "scan_budget": scan_budget,
+               "max_inflated": max_inflated, "max_members": max_members}
+    poller = threading.Thread(target=poll_loop, daemon=True)
+    started = time.monotonic()
+    last_flush = started
+    print(f"Watching {os.path.abspath(corpus_dir)} every {interval}s; results in {os.path.abspath(output_dir)}")
+    poller.start()
+    try:
+        with WatchdogPool(analyzer_extension._analyze_task, workers, timeout, analyzer_extension._init_worker, (options,)) as pool:
+            for path, status, value in pool.imap_queue(task_queue, sentinel=done):
+                if status == STATUS_OK:
+                    record = value
+                else:
+                    record = error_record(path, "Timeout" if status == STATUS_TIMEOUT else "WorkerCrashed")
+                rel_path = os.path.relpath(path, watcher.corpus_dir).replace(os.sep, "/")
+                record.zip = rel_path  # 다른 폴더의 같은 이름 아카이브와 구분되도록 행에는 상대 경로를 씀
+                with state_lock:
+                    size, mtime_ns = pending.pop(rel_path)
+                    if not os.path.exists(path):
+                        # 분석하는 동안 지워진 아카이브
+                        if rel_path in state["archives"]:
+                            forget(rel_path)
+                        continue
+                    # 같은 경로를 다시 분석한 경우 이전 결과를 빼고 새 결과로 행을 교체
+                    previous = detailed.get(rel_path)
+                    if previous:
+                        add_record(aggregate, record_from_detailed_row(previous), api_table, sign=-1)
+                    add_record(aggregate, record, api_table)
+                    detailed.put(rel_path, detailed_row(record))
+                    state["archives"][rel_path] = [size, mtime_ns]
+                counters["analyzed"] += 1
+                counters["analyzed_bytes"] += size
+                if record.is_error:
+                    counters["errors"] += 1
+                if time.monotonic() - last_flush >= interval:
+                    flush(started)
+                    last_flush = time.monotonic()
+    except KeyboardInterrupt:
+        print("Stopping watch mode...")
+    finally:
+        stop.set()
+        # 분석을 마치지 못한 아카이브는 상태에 기록하지 않으므로 다음 실행에서 다시 잡힘
+        with state_lock:
+            pending.clear()
+        flush(started)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Continuously analyze new or changed extension archives in a corpus folder.")
+    parser.add_argument("corpus_dir", help="Folder (searched recursively) where the crawler stores .zip/.crx archives.")
+    parser.add_argument("--output-dir", default=".", help="Folder for detailed_analysis.csv, summary.csv, aggregate.json and watch state/status files.")
+    parser.add_argument("--interval", type=float, default=30.0, help="Seconds between polls and between summary/status flushes (default: %(default)s).")
+    parser.add_argument("--settle", type=float, default=5.0, help="Only pick up files whose mtime is at least this many seconds old (default: %(default)s).")
+    parser.add_argument("--full-rescan-every", type=int, default=10, help="Re-list every directory on every Nth poll to catch in-place rewrites (default: %(default)s).")
+    parser.add_argument("--workers", type=int, default=1, help="Number of analysis worker processes.")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Per-archive wall-clock limit in seconds (default: %(default)s).")
+    parser.add_argument("--once", action="store_true", help="Process what is currently in the corpus and exit.")
+    parser.add_argument("--results-db", default=None, help="SQLite results database (results_db.py) to update incrementally on every flush.")
+    args = parser.parse_args()
+    if not os.path.isdir(args.corpus_dir): print(f"Error: Folder not found - {args.corpus_dir}"); raise SystemExit(1)
+    watch(args.corpus_dir, args.output_dir, args.interval, args.settle, args.full_rescan_every, args.workers,
+          args.timeout or None, once=args.once, results_db=args.results_db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+import logging
+import multiprocessing
+import queue
+import time
+from multiprocessing.connection import wait
+
+# 📌 워커가 반환하는 상태 코드
+STATUS_OK = "ok"
+STATUS_TIMEOUT = "timeout"
+STATUS_CRASHED = "crashed"
+
+POLL_INTERVAL = 0.2  # imap_queue 에서 새 작업/timeout 을 확인하는 주기 (초)
+DEFAULT_TIMEOUT = 300  # 초, 아카이브 하나당 벽시계 시간 (분석 CLI 들의 기본값)
+_NO_TASK = object()
+
+
+def _task_label(task):
+    """로그용 작업 이름. (이름, 데이터) 튜플 작업은 데이터 대신 이름만 출력."""
+    return task[0] if isinstance(task, tuple) and task else task
+
+
+def _worker_loop(conn, func, initializer, initargs):
+    """워커 프로세스 본체: 작업을 하나씩 받아 func(task) 결과를 돌려보냅니다. None 을 받으면 종료."""
+    if initializer is not None:
+        initializer(*initargs)
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        task_id, task = message
+        try:
+            conn.send((task_id, STATUS_OK, func(task)))
+        except Exception as e:
+            conn.send((task_id, STATUS_CRASHED, f"{type(e).__name__}: {e}"))
+    conn.close()
+
+
+class _Worker:
+    def __init__(self, ctx, func, initializer, initargs):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_loop, args=(child_conn, func, initializer, initargs), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.task_id = None
+        self.task = None
+        self.deadline = None
+
+    def submit(self, task_id, task, timeout):
+        self.task_id = task_id
+        self.task = task
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.conn.send((task_id, task))
+
+    def clear(self):
+        self.task_id = self.task = self.deadline = None
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+        self.conn.close()
+
+
+# 📌 작업별 제한 시간을 감시하는 프로세스 풀
+class WatchdogPool:
+    """multiprocessing.Pool 과 달리 작업 하나가 timeout 초를 넘기면 그 워커만 kill 하고 새 워커로 교체합니다.
+       워커가 비정상 종료(segfault, OOM kill 등)해도 같은 방식으로 복구합니다.
+
+       imap_unordered(tasks) 는 (task, status, value) 를 완료 순서대로 yield 합니다.
+       status 가 STATUS_OK 이면 value 는 func(task) 의 반환값, 그 외에는 None 또는 오류 메시지입니다."""
+
+    def __init__(self, func, workers=1, timeout=None, initializer=None, initargs=()):
+        self.func = func
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.initializer = initializer
+        self.initargs = initargs
+        self.restarts = 0
+        self._ctx = multiprocessing.get_context()
+        self._pool = []
+
+    def __enter__(self):
+        self._pool = [self._spawn() for _ in range(self.workers)]
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        for worker in self._pool:
+            if worker.task_id is not None:
+                worker.kill()
+            else:
+                worker.stop()
+        self._pool = []
+
+    def _spawn(self):
+        return _Worker(self._ctx, self.func, self.initializer, self.initargs)
+
+    def _replace(self, worker):
+        worker.kill()
+        self.restarts += 1
+        index = self._pool.index(worker)
+        self._pool[index] = self._spawn()
+
+    def imap_unordered(self, tasks):
+        """tasks(iterable)를 유휴 워커가 생길 때마다 하나씩 꺼내 실행합니다 (전체를 미리 list 로 만들지 않음)."""
+        iterator = iter(tasks)
+
+        def next_task(block):
+            return next(iterator)
+
+        return self._run(next_task)
+
+    def imap_queue(self, task_queue, sentinel=None):
+        """queue.Queue 에서 작업을 꺼내 실행합니다. sentinel 을 꺼내면 남은 작업만 마치고 끝납니다.
+           큐가 비어 있는 동안에도 POLL_INTERVAL 마다 깨어나 완료 결과 수거와 timeout 감시를 계속합니다."""
+
+        def next_task(block):
+            try:
+                task = task_queue.get(timeout=POLL_INTERVAL) if block else task_queue.get_nowait()
+            except queue.Empty:
+                return _NO_TASK
+            if task is sentinel:
+                raise StopIteration
+            return task
+
+        return self._run(next_task)
+
+    def _run(self, next_task):
+        exhausted = False
+        next_id = 0
+        while True:
+            for worker in self._pool:
+                if exhausted or worker.task_id is not None:
+                    continue
+                all_idle = all(w.task_id is None for w in self._pool)
+                try:
+                    task = next_task(all_idle)
+                except StopIteration:
+                    exhausted = True
+                    break
+                if task is _NO_TASK:
+                    break
+                worker.submit(next_id, task, self.timeout)
+                next_id += 1
+
+            busy = [worker for worker in self._pool if worker.task_id is not None]
+            if not busy:
+                if exhausted:
+                    return
+                continue
+
+            deadlines = [worker.deadline for worker in busy if worker.deadline is not None]
+            wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            if not exhausted:
+                # 새 작업이 들어올 수 있으므로 너무 오래 잠들지 않음
+                wait_for = POLL_INTERVAL if wait_for is None else min(wait_for, POLL_INTERVAL)
+            ready = wait([worker.conn for worker in busy], timeout=wait_for)
+
+            for worker in busy:
+                if worker.conn in ready:
+                    task = worker.task
+                    try:
+                        _, status, value = worker.conn.recv()
+                    except (EOFError, OSError):
+                        logging.error(f"Worker {worker.process.pid} died while processing {_task_label(task)}; restarting.")
+                        self._replace(worker)
+                        yield task, STATUS_CRASHED, None
+                        continue
+                    worker.clear()
+                    yield task, status, value
+                elif worker.deadline is not None and time.monotonic() >= worker.deadline:
+                    task = worker.task
+                    logging.error(f"Worker {worker.process.pid} exceeded {self.timeout}s on {_task_label(task)}; killing and restarting.")
+                    self._replace(worker)
+                    yield task, STATUS_TIMEOUT, None
@@ -0,0 +1,73 @@
+import io
+import json
+import os
+import sys
+import zipfile
+
+import pytest
+
+# 📌 src/ 의 평면 모듈들을 스크립트와 같은 방식으로 import 할 수 있도록 경로 추가
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+
+def build_zip(files, compression=zipfile.ZIP_DEFLATED):
+    """{멤버 이름: str/bytes} 로 ZIP bytes 를 만듭니다."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression) as z:
+        for name, content in files.items():
+            z.writestr(name, content)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def make_zip():
+    return build_zip
+
+
+@pytest.fixture
+def write_zip(tmp_path):
+    """{멤버 이름: 내용} 을 tmp_path/<name> ZIP 파일로 쓰고 경로를 반환합니다."""
+    def write(name, files, directory=None):
+        path = (directory or tmp_path) / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(build_zip(files))
+        return path
+    return write
+
+
+def extension_files(permissions, script, host_permissions=()):
+    """manifest(background service worker 하나) 와 bg.js 로 된 익스텐션 멤버 dict."""
+    manifest = {"manifest_version": 3, "name": "test", "permissions": list(permissions),
+                "host_permissions": list(host_permissions), "background": {"service_worker": "bg.js"}}
+    return {"manifest.json": json.dumps(manifest), "bg.js": script}
+
+
+SAMPLE_EXTENSIONS = {
+    "aaaa_1.0.zip": extension_files(["tabs", "storage"], "chrome.tabs.query({});", ["https://*.example.com/*"]),
+    "bbbb_2.1.zip": extension_files(["cookies"], "chrome.cookies.getAll({}); chrome.cookies.getAll({});", ["<all_urls>"]),
+    "cccc_0.3.zip": extension_files(["tabs", "history"], "chrome.history.search({}); chrome.tabs.create({});"),
+    "dddd_5.zip": extension_files([], "console.log('hi');"),
+    "eeee_1.2.zip": extension_files(["storage", "alarms"], "chrome.storage.local.get(); chrome.alarms.create();",
+                                    ["https://mail.example.com/*"]),
+}
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """SAMPLE_EXTENSIONS 를 담은 아카이브 폴더."""
+    folder = tmp_path / "corpus"
+    folder.mkdir()
+    for name, files in SAMPLE_EXTENSIONS.items():
+        (folder / name).write_bytes(build_zip(files))
+    return folder
+
+
+@pytest.fixture
+def sample_results():
+    """analyzer_extension.SAMPLE_RESULTS 를 비운 상태로 테스트하고 끝나면 다시 비웁니다."""
+    from analyzer_extension import SAMPLE_RESULTS
+    SAMPLE_RESULTS.clear()
+    yield SAMPLE_RESULTS
+    SAMPLE_RESULTS.clear()
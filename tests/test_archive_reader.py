@@ -0,0 +1,59 @@
+import struct
+import zipfile
+
+import pytest
+
+from archive_reader import ArchiveReader, CENTRAL_SIGNATURE
+from conftest import build_zip
+
+FILES = {"manifest.json": '{"name": "x"}', "js/app.js": "chrome.tabs.query({});" * 50, "empty.txt": ""}
+
+
+def corrupt_crc(data, name):
+    """중앙 디렉토리에서 name 항목의 CRC-32 를 바꾼 ZIP bytes."""
+    data = bytearray(data)
+    pos = data.find(CENTRAL_SIGNATURE)
+    while pos != -1:
+        name_len = struct.unpack_from("<H", data, pos + 28)[0]
+        if data[pos + 46:pos + 46 + name_len] == name.encode():
+            struct.pack_into("<L", data, pos + 16, struct.unpack_from("<L", data, pos + 16)[0] ^ 1)
+        pos = data.find(CENTRAL_SIGNATURE, pos + 4)
+    return bytes(data)
+
+
+@pytest.mark.parametrize("compression", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+def test_matches_zipfile(tmp_path, compression):
+    path = tmp_path / "a.zip"
+    path.write_bytes(build_zip(FILES, compression))
+    with ArchiveReader(str(path)) as z, zipfile.ZipFile(path) as reference:
+        assert z.namelist() == reference.namelist()
+        for name in reference.namelist():
+            assert bytes(z.read(name)) == reference.read(name)
+            with z.open(name) as f:
+                assert f.read() == reference.read(name)
+
+
+def test_stored_member_is_zero_copy(make_zip):
+    z = ArchiveReader(make_zip(FILES, zipfile.ZIP_STORED))
+    assert isinstance(z.read("js/app.js"), memoryview)
+
+
+@pytest.mark.parametrize("compression", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+def test_bad_crc_is_rejected(make_zip, compression):
+    z = ArchiveReader(corrupt_crc(make_zip(FILES, compression), "js/app.js"))
+    with pytest.raises(zipfile.BadZipFile, match="CRC"):
+        z.read("js/app.js")
+    with pytest.raises(zipfile.BadZipFile, match="CRC"):
+        with z.open("js/app.js") as f:
+            f.read()
+    assert bytes(z.read("manifest.json")) == FILES["manifest.json"].encode()
+
+
+def test_not_a_zip():
+    with pytest.raises(zipfile.BadZipFile):
+        ArchiveReader(b"not a zip file at all, definitely")
+
+
+def test_missing_member(make_zip):
+    with pytest.raises(KeyError):
+        ArchiveReader(make_zip(FILES)).read("nope.js")
@@ -0,0 +1,71 @@
+import importlib.util
+import os
+import subprocess
+import sys
+
+import pytest
+
+import cli
+from conftest import SRC_DIR
+
+NO_SIDE_EFFECTS = """
+import logging, os, sys
+import {modules}
+assert not logging.getLogger().handlers, "logging configured on import"
+assert "analyzer_extension" not in sys.modules or sys.modules["analyzer_extension"]._RULES is None, "rules loaded on import"
+print("analyzer_extension" in sys.modules)
+"""
+
+
+def _run(code, tmp_path):
+    env = dict(os.environ, HOME=str(tmp_path), PYTHONPATH=SRC_DIR)
+    return subprocess.run([sys.executable, "-c", code], env=env, cwd=tmp_path, capture_output=True, text=True)
+
+
+@pytest.mark.parametrize("modules, loads_analyzer", [
+    ("analyzer_extension", True),
+    ("watch_mode", False),
+    ("results_db, rule_pack, host_index, cli", False),
+])
+def test_import_has_no_side_effects(tmp_path, modules, loads_analyzer):
+    result = _run(NO_SIDE_EFFECTS.format(modules=modules), tmp_path)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == str(loads_analyzer)
+    assert os.listdir(tmp_path) == []  # 작업 폴더/HOME 에 아무것도 쓰지 않음
+
+
+def test_rules_are_loaded_once_on_first_use():
+    import analyzer_extension
+    rules = analyzer_extension.get_rules()
+    assert analyzer_extension.get_rules() is rules
+    assert analyzer_extension.API_TABLE is rules.api_table  # 예전 모듈 전역 이름
+    assert analyzer_extension.DETAILED_HEADER[-2:] == ["Scan Tier", "Obfuscated Members"]
+    with pytest.raises(AttributeError):
+        analyzer_extension.NOT_A_RULE
+
+
+@pytest.mark.parametrize("command", sorted(cli.COMMANDS))
+def test_command_modules_exist(command):
+    assert importlib.util.find_spec(cli.COMMANDS[command][0]) is not None
+
+
+def test_command_help(tmp_path):
+    result = _run("import cli, sys; sys.argv = ['cli.py', 'analyze', '--help']; cli.main()", tmp_path)
+    assert result.returncode == 0, result.stderr
+    assert "cli.py analyze" in result.stdout and "--no-obfuscation-check" in result.stdout
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize("argv, timeout", [
+    ([], None),  # 단일 워커는 현재 프로세스에서 분석
+    (["--workers", "4"], 300),
+    (["--workers", "4", "--timeout", "0"], None),
+    (["--timeout", "5"], 5),
+])
+def test_analyze_timeout_default(corpus, monkeypatch, argv, timeout):
+    import analyzer_extension
+    calls = []
+    monkeypatch.setattr(analyzer_extension, "sampling_analyze", lambda *args, **kwargs: calls.append(kwargs))
+    monkeypatch.setattr(sys, "argv", ["analyzer_extension.py", str(corpus)] + argv)
+    analyzer_extension.main()
+    assert calls[0]["timeout"] == timeout
@@ -0,0 +1,69 @@
+import os
+
+from corpus_store import (MODE_COPY, MODE_HARDLINK, MODE_SYMLINK, SELECTION_MANIFEST, CorpusStore, build_working_set,
+                          read_selection_manifest, sha256_file)
+
+
+def write(path, data):
+    """새 파일로 씁니다 (저장소 객체와 inode 를 공유하는 원본을 제자리에서 덮어쓰지 않도록)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        os.remove(path)
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_add_deduplicates_content(tmp_path):
+    store = CorpusStore(str(tmp_path / "store"))
+    first = write(tmp_path / "a" / "x_1.zip", b"same")
+    second = write(tmp_path / "b" / "y_1.zip", b"same")
+    results = store.add_many([first, second])
+    assert results[0][1] == results[1][1] == sha256_file(first)
+    assert sorted(store.names(results[0][1])) == ["x_1.zip", "y_1.zip"]  # 스레드 풀이라 기록 순서는 정해지지 않음
+    # hardlink 로 저장 (두 스레드가 동시에 넣으면 어느 원본과 연결될지는 정해지지 않음)
+    assert any(os.path.samefile(store.object_path(results[0][1]), source) for source in (first, second))
+
+
+def test_selection_manifest_records_materialized_names(tmp_path):
+    sources = [write(tmp_path / "a" / "x_1.zip", b"one"), write(tmp_path / "b" / "x_1.zip", b"two"),
+               write(tmp_path / "c" / "z_1.zip", b"one")]
+    created = build_working_set(sources, str(tmp_path / "store"), str(tmp_path / "work"))
+    two = sha256_file(sources[1])
+    renamed = f"x_1_{two[:8]}.zip"
+    assert sorted(created) == ["x_1.zip", renamed]
+    rows = read_selection_manifest(str(tmp_path / "work" / SELECTION_MANIFEST))
+    assert [name for name, _ in rows] == ["x_1.zip", renamed, "x_1.zip"]  # z_1.zip 은 x_1.zip 과 같은 내용
+    assert all((tmp_path / "work" / name).exists() for name, _ in rows)
+
+
+def test_rebuild_replaces_stale_store_links(tmp_path):
+    source = tmp_path / "src" / "x_1.zip"
+    for mode in (MODE_HARDLINK, MODE_SYMLINK):
+        work = tmp_path / f"work_{mode}"
+        write(source, b"old")
+        build_working_set([str(source)], str(tmp_path / "store"), str(work), mode)
+        write(source, b"new")  # 크롤러가 새 버전을 같은 이름으로 다시 받은 경우
+        created = build_working_set([str(source)], str(tmp_path / "store"), str(work), mode)
+        assert list(created) == ["x_1.zip"]
+        assert (work / "x_1.zip").read_bytes() == b"new"
+        assert sorted(os.listdir(work)) == [SELECTION_MANIFEST, "x_1.zip"]
+
+
+def test_copy_mode_rebuild_is_idempotent(tmp_path):
+    sources = [write(tmp_path / "src" / "a_1.zip", b"one"), write(tmp_path / "src" / "b_1.zip", b"two")]
+    work = tmp_path / "work"
+    build_working_set(sources, str(tmp_path / "store"), str(work), MODE_COPY)
+    manifest = (work / SELECTION_MANIFEST).read_bytes()
+    created = build_working_set(sources, str(tmp_path / "store"), str(work), MODE_COPY)
+    assert created == {"a_1.zip": (sha256_file(sources[0]), "existing"), "b_1.zip": (sha256_file(sources[1]), "existing")}
+    assert sorted(os.listdir(work)) == ["a_1.zip", "b_1.zip", SELECTION_MANIFEST]
+    assert (work / SELECTION_MANIFEST).read_bytes() == manifest
+
+
+def test_files_outside_store_are_kept(tmp_path):
+    work = tmp_path / "work"
+    write(work / "x_1.zip", b"hand-made")
+    source = write(tmp_path / "src" / "x_1.zip", b"stored")
+    created = build_working_set([source], str(tmp_path / "store"), str(work))
+    (name,) = created
+    assert name.startswith("x_1_") and (work / "x_1.zip").read_bytes() == b"hand-made"
@@ -0,0 +1,64 @@
+import pytest
+
+from host_index import HOST_INDEX_FILE, HostIndex, load_host_index, parse_match_pattern, write_host_index
+
+
+@pytest.fixture
+def index():
+    index = HostIndex()
+    index.add("all.zip", ["<all_urls>", "storage"])
+    index.add("google.zip", ["*://*.google.com/*"])
+    index.add("mail.zip", ["https://mail.google.com/mail/*"])
+    index.add("exact.zip", ["http://example.com/*"])
+    index.add("plain.zip", ["tabs", "storage"])
+    return index
+
+
+@pytest.mark.parametrize("pattern, host, subdomains", [
+    ("<all_urls>", None, False),
+    ("*://*/*", None, False),
+    ("https://*.google.com/*", "google.com", True),
+    ("http://user@Example.com:8080/a/*", "example.com", False),
+    ("file:///home/*", None, False),
+])
+def test_parse_match_pattern(pattern, host, subdomains):
+    parsed = parse_match_pattern(pattern)
+    assert (parsed.host, parsed.subdomains) == (host, subdomains)
+
+
+@pytest.mark.parametrize("pattern", ["tabs", "https://www.*.com/*", "gopher://example.com/*", "https://example.com", None])
+def test_parse_rejects_non_patterns(pattern):
+    assert parse_match_pattern(pattern) is None
+
+
+def test_who_can_access(index):
+    assert index.who_can_access("https://mail.google.com/mail/u/0") == ["all.zip", "google.zip", "mail.zip"]
+    assert index.who_can_access("https://mail.google.com/calendar") == ["all.zip", "google.zip"]
+    assert index.who_can_access("https://google.com/") == ["all.zip", "google.zip"]  # *.google.com 은 google.com 도 포함
+    assert index.who_can_access("https://notgoogle.com/") == ["all.zip"]
+    assert index.who_can_access("https://example.com/") == ["all.zip"]  # http 만 허용
+    assert index.who_can_access("http://sub.example.com/") == ["all.zip"]
+    assert index.who_can_access("http://example.com/x", include_all_hosts=False) == ["exact.zip"]
+    assert index.who_can_access("file:///etc/passwd", include_all_hosts=False) == []
+
+
+def test_domain_exposure(index):
+    assert index.all_hosts_count() == 1
+    assert index.domain_exposure() == [("mail.google.com", 3, 2), ("example.com", 2, 1), ("google.com", 2, 1)]
+    assert index.domain_exposure(top=1) == [("mail.google.com", 3, 2)]
+
+
+def test_round_trip(index, tmp_path):
+    write_host_index(index, tmp_path)
+    loaded = load_host_index(tmp_path / HOST_INDEX_FILE)
+    assert loaded.patterns == index.patterns
+    assert "plain.zip" not in loaded.patterns
+    assert loaded.who_can_access("https://mail.google.com/mail/") == index.who_can_access("https://mail.google.com/mail/")
+    assert loaded.domain_exposure() == index.domain_exposure()
+
+
+def test_load_rejects_other_versions(tmp_path):
+    path = tmp_path / HOST_INDEX_FILE
+    path.write_text('{"version": 0, "patterns": {}}', encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_host_index(path)
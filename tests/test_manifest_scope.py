@@ -0,0 +1,74 @@
+import json
+
+from archive_reader import ArchiveReader
+from manifest_scope import (CONTEXT_BACKGROUND, CONTEXT_CONTENT_SCRIPT, CONTEXT_UNREFERENCED,
+                            extract_script_imports, iter_scan_units)
+from member_plan import SKIP_OVER_BUDGET, plan_members
+
+
+def scan(make_zip, files, **kwargs):
+    z = ArchiveReader(make_zip(files))
+    plan = plan_members(z.infolist(), kwargs.pop("scan_budget", None))
+    contexts = {}
+    units = [name for name, _, _ in iter_scan_units(z, plan, json.loads(files["manifest.json"]), contexts, **kwargs)]
+    return units, contexts, plan
+
+
+def test_extract_script_imports_finds_es_and_worker_imports():
+    content = ('importScripts("a.js", \'b.js\');import{x}from"./c.js";import "./d.js";'
+               'const m = await import("./e.js"); export * from \'./f.js\';')
+    assert sorted(extract_script_imports(content)) == ["./c.js", "./d.js", "./e.js", "./f.js", "a.js", "b.js"]
+
+
+def test_extract_script_imports_ignores_identifiers_containing_keywords():
+    content = "Array.from('x'); reimport('y'); var fromage = 'z'; obj.import('w');"
+    assert extract_script_imports(content) == []
+
+
+def test_imported_referenced_file_keeps_its_context(make_zip):
+    files = {
+        "manifest.json": json.dumps({"background": {"service_worker": "bg.js"}}),
+        "bg.js": "import './lib.js';",
+        "lib.js": "chrome.tabs.query({});",
+        "unused.js": "import './lib.js';",
+    }
+    units, contexts, _ = scan(make_zip, files)
+    assert units[:2] == ["bg.js", "lib.js"]
+    assert contexts["lib.js"] == {CONTEXT_BACKGROUND}
+    assert contexts["unused.js"] == {CONTEXT_UNREFERENCED}
+
+
+def test_context_propagates_to_nested_imports(make_zip):
+    files = {
+        "manifest.json": json.dumps({"background": {"scripts": ["bg.js"]},
+                                     "content_scripts": [{"js": ["cs.js"], "matches": ["<all_urls>"]}]}),
+        "bg.js": "importScripts('shared.js');",
+        "cs.js": "import './shared.js';",
+        "shared.js": "import './deep.js';",
+        "deep.js": "",
+    }
+    _, contexts, _ = scan(make_zip, files)
+    assert contexts["deep.js"] == {CONTEXT_BACKGROUND, CONTEXT_CONTENT_SCRIPT}
+
+
+def test_scan_budget_prefers_referenced_code(make_zip):
+    files = {
+        "manifest.json": json.dumps({"content_scripts": [{"js": ["cs.js"], "matches": ["<all_urls>"]}],
+                                     "background": {"service_worker": "bg.js"}}),
+        "bg.js": "a" * 100,
+        "cs.js": "b" * 100,
+        "big_unused.js": "c" * 150,
+    }
+    units, _, plan = scan(make_zip, files, scan_budget=250)
+    assert units == ["bg.js", "cs.js"]
+    assert plan.skipped["big_unused.js"] == SKIP_OVER_BUDGET
+
+    units, _, _ = scan(make_zip, files, scan_budget=150)
+    assert units == ["bg.js"]  # background 가 content script 보다 먼저 예산을 씀
+
+
+def test_skip_unreferenced(make_zip):
+    files = {"manifest.json": json.dumps({"background": {"service_worker": "bg.js"}}),
+             "bg.js": "", "other.js": ""}
+    units, _, _ = scan(make_zip, files, skip_unreferenced=True)
+    assert units == ["bg.js"]
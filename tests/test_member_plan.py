@@ -0,0 +1,53 @@
+import zipfile
+
+from member_plan import (KIND_HTML, KIND_MANIFEST, KIND_OTHER, KIND_SCRIPT, KIND_SKIP, KIND_WASM, SKIP_IGNORED,
+                         SKIP_OVER_BUDGET, classify_member, plan_members)
+
+
+def infos(sizes):
+    members = []
+    for name, size in sizes.items():
+        info = zipfile.ZipInfo(name)
+        info.file_size = size
+        members.append(info)
+    return members
+
+
+def test_classify_member():
+    assert classify_member("manifest.json") == KIND_MANIFEST
+    assert classify_member("js/app.MJS") == KIND_SCRIPT
+    assert classify_member("popup.html") == KIND_HTML
+    assert classify_member("lib/module.wasm") == KIND_WASM
+    assert classify_member("icons/icon.png") == KIND_OTHER
+    assert classify_member("__MACOSX/._app.js") == KIND_SKIP
+
+
+def test_plan_members_single_pass():
+    plan = plan_members(infos({
+        "ext/manifest.json": 10, "ext/node_modules/pkg/manifest.json": 5, "ext/small.js": 1, "ext/big.js": 9,
+        "ext/popup.html": 3, "ext/a.wasm": 4, "__MACOSX/._x.js": 2,
+    }))
+    assert plan.manifest.filename == "ext/manifest.json"
+    assert plan.root_dir == "ext"
+    assert [m.filename for m in plan.scripts] == ["ext/big.js", "ext/small.js"]
+    assert [m.filename for m in plan.wasm] == ["ext/a.wasm"]
+    assert "ext/node_modules/pkg/manifest.json" in plan.member_names()
+    assert plan.skipped == {"__MACOSX/._x.js": SKIP_IGNORED}
+    assert plan.total_size == 32
+    assert plan.unreferenced_candidates() == ["ext/big.js", "ext/popup.html", "ext/small.js"]
+
+
+def test_take_budget():
+    plan = plan_members(infos({"manifest.json": 1, "a.js": 60, "b.js": 50, "c.js": 30}), scan_budget=100)
+    assert plan.take_budget("a.js")
+    assert not plan.take_budget("b.js")
+    assert plan.take_budget("c.js")
+    assert plan.scan_size == 90
+    assert plan.skipped == {"b.js": SKIP_OVER_BUDGET}
+    assert plan.over_budget_count() == 1
+
+
+def test_no_budget():
+    plan = plan_members(infos({"a.js": 10 ** 9}))
+    assert plan.manifest is None and plan.root_dir == ""
+    assert plan.take_budget("a.js")
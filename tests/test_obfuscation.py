@@ -0,0 +1,71 @@
+import json
+import random
+
+import pytest
+
+import obfuscation
+from obfuscation import (PACKED_ENTROPY_THRESHOLD, REASON_ESCAPES, REASON_EVAL_DECODER, REASON_HEX_IDENTIFIERS, REASON_PACKED,
+                         _ascii_entropy_bound, byte_statistics, find_dynamic_apis, inspect_member)
+
+PLAIN = b"function update(tab) {\n  chrome.tabs.query({active: true}, function (tabs) { render(tabs); });\n}\n" * 20
+MINIFIED = b"".join(b"function f%d(a,b){return a.value+b.items.length*%d;}" % (i, i) for i in range(200))
+HEX_OBFUSCATED = b"var _0x1a2b=['tabs','query'];" + b"".join(b"_0x1a2b[0x%x];" % i for i in range(200))
+ASCII_ESCAPED = b"var s='" + b"".join(b"\\x%02x" % ord(c) for c in "chrome.tabs.query" * 20) + b"';"
+# ensure_ascii JSON (다국어 문구) 와 UTF-8 코드 페이지 표: 이스케이프/고엔트로피가 아님
+CJK_JSON = json.dumps({"k": "传统布鞋手工" * 200}).encode()
+CODEPAGE = ("var t='" + "".join(chr(c) for c in range(0x4e00, 0x5e00)) + "';").encode()
+random.seed(1)
+PACKED = b"var p='" + bytes(random.choice(b"!#$%&()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ[]^_`abcdefghijklmnopqrstuvwxyz{|}~")
+                             for _ in range(20000)) + b"';"
+EVAL = b"eval(atob('Y2hyb21lLnRhYnMucXVlcnkoKQ=='));" + b"\n// padding" * 60
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "bytes"])
+def stats_path(request, monkeypatch):
+    if not request.param:
+        monkeypatch.setattr(obfuscation, "_numpy", False)
+    elif not obfuscation._load_numpy():
+        pytest.skip("NumPy is not installed")
+
+
+@pytest.mark.parametrize("data, reasons", [
+    (PLAIN, None),
+    (MINIFIED, None),
+    (CJK_JSON, None),
+    (CODEPAGE, None),
+    (HEX_OBFUSCATED, [REASON_HEX_IDENTIFIERS]),
+    (ASCII_ESCAPED, [REASON_ESCAPES]),
+    (PACKED, [REASON_PACKED]),
+    (EVAL, [REASON_EVAL_DECODER]),
+], ids=["plain", "minified", "cjk-json", "codepage", "hex", "escapes", "packed", "eval"])
+def test_inspect_member(stats_path, data, reasons):
+    flagged = inspect_member(data)
+    assert (flagged[0] if flagged else None) == reasons
+    assert inspect_member(memoryview(data)) == flagged
+
+
+def test_eval_needs_word_boundary():
+    assert inspect_member(b"myeval(atob(x));" + b" " * 600) is None
+
+
+def test_statistics():
+    stats = byte_statistics(b"ab\ncdef\n" + b"x" * 1200)
+    assert (stats["size"], stats["max_line"]) == (1208, 1200)
+    assert stats["identifier_density"] == round(1206 / 1208, 3)
+    assert byte_statistics(b"short line")["entropy"] is None  # 긴 줄이 없으면 계산하지 않음
+
+
+@pytest.mark.parametrize("data", [MINIFIED, CODEPAGE, PACKED], ids=["minified", "codepage", "packed"])
+def test_entropy_bound_is_an_upper_bound(monkeypatch, data):
+    monkeypatch.setattr(obfuscation, "_numpy", False)
+    monkeypatch.setattr(obfuscation, "PACKED_ENTROPY_THRESHOLD", 0.0)  # 상한과 관계없이 정확한 값을 계산
+    exact = byte_statistics(data)["entropy"]
+    assert exact is not None and _ascii_entropy_bound(data) >= exact - 1e-3
+    assert (exact >= PACKED_ENTROPY_THRESHOLD) == (data is PACKED)
+
+
+def test_find_dynamic_apis():
+    patterns = {"chrome.tabs.query", "chrome.storage.local", "chrome.cookies.getAll"}
+    content = "chrome['ta'+'bs']['\\x71uery']({});eval(atob('Y2hyb21lLnN0b3JhZ2UubG9jYWw='));"
+    assert find_dynamic_apis(content, patterns) == {"chrome.tabs.query", "chrome.storage.local"}
+    assert find_dynamic_apis("chrome.tabs.query()", patterns) == set()
@@ -0,0 +1,53 @@
+import pickle
+from array import array
+
+import pytest
+
+import result_record
+from result_record import AnalysisRecord, ApiTable
+
+CATEGORIES = {"Tabs": ["chrome.tabs.query", "chrome.tabs.create"], "Storage": ["chrome.storage", "chrome.tabs.query"]}
+
+
+@pytest.fixture
+def table():
+    return ApiTable(CATEGORIES)
+
+
+def test_table_layout_skips_duplicate_apis(table):
+    assert table.names == ("chrome.tabs.query", "chrome.tabs.create", "chrome.storage")
+    assert table.category_of == ("Tabs", "Tabs", "Storage")
+
+
+def test_count_pack_and_nested_round_trip(table):
+    counts = table.new_counts()
+    table.count_into("chrome.tabs.query(); chrome.tabs.query(); chrome.storage.local", counts)
+    packed = table.pack(counts)
+    assert packed.typecode == "B" and list(packed) == [2, 0, 1]
+    nested = table.nested(packed)
+    assert nested == {"Tabs": {"chrome.tabs.query": 2}, "Storage": {"chrome.storage": 1}}
+    assert table.counts_from_nested(nested) == packed
+    assert table.pack(table.new_counts()) is None
+    assert table.pack(array("Q", [0, 70000, 1])).typecode == "I"
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_sum_counts(table, monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(result_record, "_numpy", False)
+    elif not result_record._load_numpy():
+        pytest.skip("NumPy is not installed")
+    records = [AnalysisRecord("a", [], [], counts=array("B", [1, 0, 255])),
+               AnalysisRecord("b", [], [], counts=array("I", [70000, 0, 1])),
+               AnalysisRecord("c", [], []),
+               AnalysisRecord("d", [], [], counts=array("Q", [2 ** 40, 3, 0]))]
+    totals = table.sum_counts(records)
+    assert totals.typecode == "q"
+    assert list(totals) == [1 + 70000 + 2 ** 40, 3, 256]
+
+
+def test_record_is_small_and_picklable():
+    record = AnalysisRecord("a_1.zip", ["tabs"], [], obfuscated={"bg.js": {"reasons": ["eval_decoder"], "recovered": []}})
+    assert not hasattr(record, "__dict__")
+    assert pickle.loads(pickle.dumps(record)) == record
+    assert AnalysisRecord("x", ["Error: Timeout"], []).is_error
@@ -0,0 +1,154 @@
+import csv
+import json
+import os
+import sqlite3
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import results_db
+from results_db import MAX_PAGE_SIZE, ResultsDB
+
+HEADER = ["ZIP File", "Permissions (manifest)", "Over Permissions", "WASM Exist", "Tabs", "Unknown", "API Contexts", "Scan Tier"]
+
+
+def _row(index):
+    return [f"{index:04d}_1.0.zip", json.dumps(["cookies", "tabs"]), json.dumps(["cookies"] if index % 2 else []), "X",
+            json.dumps({"chrome.tabs.query": index}), "{}", "{}", ""]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    csv_path = tmp_path / "detailed_analysis.csv"
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(_row(index) for index in range(25))
+    path = str(tmp_path / "r.sqlite")
+    with ResultsDB(path) as db:
+        assert db.load([str(tmp_path)]) == 25
+    return path
+
+
+def test_paging(db_path):
+    with ResultsDB(db_path) as db:
+        first = db.over_permission("cookies", limit=5)
+        assert (first["total"], first["next_offset"]) == (12, 5)
+        assert [item["zip"] for item in first["items"]] == ["0001_1.0.zip", "0003_1.0.zip", "0005_1.0.zip", "0007_1.0.zip", "0009_1.0.zip"]
+        last = db.over_permission("cookies", limit=5, offset=10)
+        assert [item["zip"] for item in last["items"]] == ["0021_1.0.zip", "0023_1.0.zip"] and last["next_offset"] is None
+        assert db.over_permission("cookies", offset=100)["items"] == []
+
+        ranked = db.top_api("chrome.tabs.query", limit=3, offset=1)
+        assert [item["count"] for item in ranked["items"]] == [23, 22, 21] and ranked["total"] == 25
+        assert db.with_permission("tabs", limit=MAX_PAGE_SIZE + 1)["limit"] == MAX_PAGE_SIZE
+        for limit, offset in ((0, 0), (5, -1)):
+            with pytest.raises(ValueError):
+                db.with_permission("tabs", limit=limit, offset=offset)
+
+
+def test_read_only_connection_does_not_write(db_path):
+    with ResultsDB(db_path, read_only=True) as db:
+        assert db.stats()["archives"] == 25
+        assert db.over_permission_counts() == [{"permission": "cookies", "extensions": 12}]
+        with open(os.path.join(os.path.dirname(db_path), "detailed_analysis.csv"), "a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow(_row(30))
+        with pytest.raises(sqlite3.OperationalError):
+            db.load([os.path.dirname(db_path)])
+    with ResultsDB(db_path) as db:
+        assert db.conn.execute("SELECT COUNT(*) FROM aggregate_cache").fetchone()[0] == 0
+
+
+def test_read_only_rejects_missing_database(tmp_path):
+    with pytest.raises(sqlite3.OperationalError):
+        ResultsDB(str(tmp_path / "missing.sqlite"), read_only=True)
+    assert not os.path.exists(tmp_path / "missing.sqlite")
+
+
+@pytest.fixture
+def server(db_path):
+    server = results_db.make_server(db_path, port=0, connections=2)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    server.pool.close()
+
+
+def _get(server, path):
+    with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}{path}") as response:
+        return json.load(response)
+
+
+def test_serve_pages(db_path, server):
+    page = _get(server, "/over-permission/cookies?limit=4&offset=8")
+    assert [item["zip"] for item in page["items"]] == ["0017_1.0.zip", "0019_1.0.zip", "0021_1.0.zip", "0023_1.0.zip"]
+    assert page["next_offset"] is None
+    assert _get(server, "/stats")["archives"] == 25
+    with pytest.raises(urllib.error.HTTPError) as error:
+        _get(server, "/permission/tabs?limit=0")
+    assert error.value.code == 400
+    with ResultsDB(db_path) as db:
+        assert db.conn.execute("SELECT COUNT(*) FROM aggregate_cache").fetchone()[0] == 0
+
+
+def test_serve_reuses_connections_and_aggregates(db_path, server):
+    expected = [{"permission": "cookies", "extensions": 12}]
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(_get(server, "/aggregates/over-permissions"))) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [expected] * 6
+    assert server.pool.opened <= 2  # 요청 스레드마다 새 연결을 열지 않음
+
+    # 두 번째부터는 서버 공용 캐시에서 응답 (표시해 둔 값이 그대로 돌아옴)
+    with ResultsDB(db_path, read_only=True) as db:
+        server.pool.cache.put("over_permission_counts", db.generation, ["cached"])
+    assert _get(server, "/aggregates/over-permissions") == ["cached"]
+
+    # 새 행을 적재하면 generation 이 바뀌어 다시 계산
+    with open(os.path.join(os.path.dirname(db_path), "detailed_analysis.csv"), "a", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerow(_row(101))
+    with ResultsDB(db_path) as db:
+        db.load([os.path.dirname(db_path)])
+    assert _get(server, "/aggregates/over-permissions") == [{"permission": "cookies", "extensions": 13}]
+
+
+def _rewrite_csv(path, rows):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(rows)
+    os.replace(tmp_path, path)
+
+
+def test_rewritten_middle_row_is_reloaded(db_path):
+    csv_path = os.path.join(os.path.dirname(db_path), "detailed_analysis.csv")
+    with ResultsDB(db_path) as db:
+        assert db.load_detailed_csv(csv_path) == 0  # 바뀌지 않았으면 읽지 않음
+
+        # 가운데 행을 같은 길이의 다른 행으로 제자리에서 교체 (끝부분은 그대로)
+        data = open(csv_path, "rb").read()
+        old, new = b'"{""chrome.tabs.query"": 12}"', b'"{""chrome.tabs.query"": 99}"'
+        assert data.count(old) == 1
+        with open(csv_path, "r+b") as f:
+            f.seek(data.index(old))
+            f.write(new)
+        assert db.load_detailed_csv(csv_path) == 25
+        assert db.extension("0012")[0]["api_counts"] == {"Tabs": {"chrome.tabs.query": 99}}
+
+        # 끝부분이 같은 새 파일로 교체 (os.replace) 하면서 앞쪽 행을 뺌
+        _rewrite_csv(csv_path, [_row(index) for index in range(1, 25)])
+        assert db.load_detailed_csv(csv_path) == 24
+        assert db.stats()["archives"] == 24 and db.extension("0000") == []
+
+        # 덧붙인 행만 읽음
+        with open(csv_path, "a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow(_row(30))
+        assert db.load_detailed_csv(csv_path) == 1
+        assert db.stats()["archives"] == 25
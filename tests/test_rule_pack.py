@@ -0,0 +1,50 @@
+import json
+import os
+
+import pytest
+
+from rule_pack import CompiledRules, RulePack, compile_rules, fingerprint_rules, load_rule_pack
+
+RULES = {
+    "name": "test",
+    "version": 1,
+    "api_categories": {"Storage": ["chrome.storage.local"], "Tabs": ["chrome.tabs.query"]},
+    "permission_to_apis": {"storage": ["chrome.storage.local"], "tabs": ["chrome.tabs.query"], "favicon": []},
+    "suspicious_permissions": ["tabs"],
+}
+
+
+def test_fingerprint_ignores_formatting_and_descriptions():
+    reordered = json.loads(json.dumps(RULES, indent=4, sort_keys=True))
+    reordered["description"] = "changed"
+    reordered["version"] = 2
+    assert fingerprint_rules(reordered) == fingerprint_rules(RULES)
+
+
+def test_fingerprint_changes_with_rules():
+    changed = json.loads(json.dumps(RULES))
+    changed["suspicious_permissions"].append("storage")
+    assert fingerprint_rules(changed) != fingerprint_rules(RULES)
+
+
+def test_load_rule_pack(tmp_path, monkeypatch):
+    path = tmp_path / "custom.json"
+    path.write_text(json.dumps(RULES), encoding="utf-8")
+    monkeypatch.setenv("EXTENSION_RULES", str(path))
+    rules = load_rule_pack()
+    assert (rules.name, rules.fingerprint) == ("test", fingerprint_rules(RULES))
+    assert list(rules.api_categories) == ["Storage", "Tabs"]
+    with pytest.raises(ValueError):
+        RulePack({"api_categories": {}})
+
+
+def test_default_rule_pack_compiles():
+    compiled = CompiledRules(load_rule_pack(os.path.join(os.path.dirname(__file__), "..", "src", "rules", "default.json")))
+    assert len(compiled.api_table) and compiled.search_patterns == tuple(sorted(compiled.api_to_permissions))
+
+
+def test_compile_rules():
+    compiled = compile_rules(RulePack(RULES))
+    assert compiled.fingerprint == fingerprint_rules(RULES)
+    assert compiled.api_to_permissions == {"chrome.storage.local": frozenset({"storage"}), "chrome.tabs.query": frozenset({"tabs"})}
+    assert compiled.search_patterns == ("chrome.storage.local", "chrome.tabs.query")
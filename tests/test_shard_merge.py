@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from analyzer_extension import merge_shard_outputs, sampling_analyze
+from shard_merge import extension_id_from_name, merge_aggregates, missing_shards, parse_shard, shard_of
+
+OUTPUTS = ("summary.csv", "detailed_analysis.csv", "host_index.json")
+
+
+def test_parse_shard():
+    assert parse_shard("1/4") == (1, 4)
+    for spec in ("4/4", "x", "1/0"):
+        with pytest.raises(ValueError):
+            parse_shard(spec)
+
+
+def test_shard_of_uses_extension_id():
+    assert extension_id_from_name("/x/abcd_1.2.zip") == "abcd"
+    assert shard_of("abcd_1.2.zip", 7) == shard_of("abcd_9.zip", 7)
+
+
+def test_missing_shards():
+    assert missing_shards(["0/3", "2/3"]) == [1]
+    with pytest.raises(ValueError):
+        missing_shards(["0/2", "0/3"])
+
+
+def test_merge_aggregates_adds_totals():
+    a = {"shards": ["0/2"], "rules": ["r"], "archives": 2, "errors": 0,
+         "api_totals": {"Tabs": {"chrome.tabs.query": 1}}, "over_permission_counts": {"tabs": 1}}
+    b = {"shards": ["1/2"], "rules": ["r"], "archives": 1, "errors": 1,
+         "api_totals": {"Tabs": {"chrome.tabs.query": 2}}, "over_permission_counts": {"tabs": 1, "storage": 1}}
+    merged = merge_aggregates([a, b])
+    assert merged["archives"] == 3 and merged["errors"] == 1 and merged["rules"] == ["r"]
+    assert merged["api_totals"] == {"Tabs": {"chrome.tabs.query": 3}}
+    assert merged["over_permission_counts"] == {"tabs": 2, "storage": 1}
+
+
+def test_merged_shards_match_single_run(corpus, tmp_path, sample_results):
+    sampling_analyze(str(corpus), output_dir=str(tmp_path / "single"), timeout=None)
+    shard_dirs = []
+    for index in range(3):
+        sample_results.clear()
+        shard_dir = tmp_path / f"shard{index}"
+        sampling_analyze(str(corpus), output_dir=str(shard_dir), timeout=None, shard=(index, 3))
+        if (shard_dir / "aggregate.json").exists():
+            shard_dirs.append(str(shard_dir))
+
+    merged = merge_shard_outputs(shard_dirs, str(tmp_path / "merged"))
+    assert merged["archives"] == 5
+    for name in OUTPUTS:
+        assert (tmp_path / "merged" / name).read_bytes() == (tmp_path / "single" / name).read_bytes(), name
+    patterns = json.loads((tmp_path / "merged" / "host_index.json").read_text(encoding="utf-8"))["patterns"]
+    assert patterns["bbbb_2.1.zip"] == ["<all_urls>"]
@@ -0,0 +1,93 @@
+import csv
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from conftest import build_zip
+
+pytest.importorskip("requests")
+import extension_downloader  # noqa: E402
+import stream_pipeline  # noqa: E402
+from analyzer_extension import SAMPLE_RESULTS  # noqa: E402
+
+ARCHIVE = build_zip({
+    "manifest.json": json.dumps({"manifest_version": 3, "permissions": ["tabs", "storage"],
+                                 "background": {"service_worker": "bg.js"}}),
+    "bg.js": "chrome.tabs.query({}, () => {});",
+})
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """chrome-stats API 를 흉내 내는 로컬 서버: hang 은 응답하지 않고, missing 은 404."""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        extension_id = parse_qs(url.query).get("id", [""])[0]
+        if extension_id == "hang":
+            time.sleep(3)
+        if extension_id == "missing":
+            self.send_response(404); self.end_headers(); return
+        if url.path.endswith("/list-versions"):
+            body = json.dumps({"downloads": {"allVersions": [{"version": "1.0"}]}}).encode()
+        else:
+            body = ARCHIVE
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(extension_downloader, "BASE_URL", f"http://127.0.0.1:{server.server_address[1]}/api")
+    monkeypatch.setattr(extension_downloader, "REQUEST_TIMEOUT", (1, 0.5))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_stream_analyze_end_to_end(tmp_path, stub_server):
+    ids = tmp_path / "ids.csv"
+    ids.write_text("id,category\nbbb,\naaa,tools\nhang,tools\nmissing,tools\n", encoding="utf-8")
+    SAMPLE_RESULTS.clear()
+    try:
+        stats = stream_pipeline.stream_analyze(str(ids), persist_folder=str(tmp_path / "persist"), download_workers=2,
+                                               workers=1, queue_size=1, output_dir=str(tmp_path / "out"))
+    finally:
+        SAMPLE_RESULTS.clear()
+
+    assert stats["downloaded"] == 2 and stats["download_failed"] == 2  # timeout 과 404 는 실패로 집계
+    assert (tmp_path / "persist" / "uncategorized" / "bbb_1.0.zip").read_bytes() == ARCHIVE
+    with open(tmp_path / "out" / "detailed_analysis.csv", newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["ZIP File"] for row in rows] == ["aaa_1.0.zip", "bbb_1.0.zip"]  # 완료 순서와 관계없이 ZIP 이름순
+    assert all(json.loads(row["Over Permissions"]) == ["storage"] for row in rows)
+    assert (tmp_path / "out" / "summary.csv").exists()
+
+
+def test_api_keys_rotate_evenly_across_threads(monkeypatch):
+    monkeypatch.setattr(extension_downloader, "API_KEYS", ["k0", "k1", "k2"])
+    monkeypatch.setattr(extension_downloader, "api_key_index", 0)
+    shared = dict(extension_downloader.HEADERS)
+    used = []
+
+    def take():
+        used.extend(extension_downloader.request_headers()["x-api-key"] for _ in range(300))
+
+    threads = [threading.Thread(target=take) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(used.count(key) for key in ("k0", "k1", "k2")) == [400, 400, 400]
+    assert extension_downloader.HEADERS == shared  # 요청별 헤더는 공유 dict 를 바꾸지 않음
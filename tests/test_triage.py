@@ -0,0 +1,53 @@
+import csv
+import json
+
+from analyzer_extension import record_from_detailed_row, sampling_analyze
+from member_plan import plan_members
+from result_record import AnalysisRecord
+from results_db import ResultsDB
+from shard_merge import add_record, empty_aggregate
+from triage import TIER_DEEP, TIER_MANIFEST, TriageCriteria, triage_manifest
+
+CRITERIA = TriageCriteria({"cookies", "history"})
+
+
+def test_triage_manifest_reasons():
+    plan = plan_members([])
+    assert triage_manifest({"permissions": ["storage"]}, plan, CRITERIA) == (False, [])
+    needs, reasons = triage_manifest({"permissions": ["history", "cookies"], "host_permissions": ["<all_urls>"]}, plan, CRITERIA)
+    assert needs and len(reasons) == 2
+    assert triage_manifest({"manifest_version": 2}, plan, TriageCriteria((), manifest_versions={2}))[0]
+
+
+def test_tier1_records_are_not_counted_as_clean(corpus, tmp_path, sample_results):
+    out = tmp_path / "out"
+    sampling_analyze(str(corpus), output_dir=str(out), timeout=None, triage=CRITERIA)
+    with open(out / "detailed_analysis.csv", newline="", encoding="utf-8") as f:
+        rows = {row[0]: row for row in csv.reader(f)}
+    tier = {name: int(row[-2]) for name, row in rows.items() if name != "ZIP File"}
+    assert tier == {"aaaa_1.0.zip": TIER_MANIFEST, "bbbb_2.1.zip": TIER_DEEP, "cccc_0.3.zip": TIER_DEEP,
+                    "dddd_5.zip": TIER_MANIFEST, "eeee_1.2.zip": TIER_MANIFEST}
+    assert rows["eeee_1.2.zip"][2] == "null"
+    assert record_from_detailed_row(rows["eeee_1.2.zip"]).over_permissions is None
+
+    aggregate = empty_aggregate()
+    for result in sample_results:
+        add_record(aggregate, result, _table())
+    assert aggregate["archives"] == 5 and aggregate["over_permission_archives"] == 2
+    assert aggregate["over_permission_counts"] == {}  # aaaa/eeee 의 storage 는 판정하지 않았으므로 세지 않음
+
+    with ResultsDB(str(tmp_path / "r.sqlite")) as db:
+        db.load([str(out)])
+        assert db.stats()["over_permission_archives"] == 2
+        assert db.over_permission("storage")["total"] == 0
+        assert db.extension("eeee")[0]["over_permissions"] is None
+
+
+def test_error_records_are_not_judged():
+    aggregate = add_record(empty_aggregate(), AnalysisRecord("x_1.zip", ["Error: Timeout"], []), _table())
+    assert aggregate["errors"] == 1 and aggregate["over_permission_archives"] == 0
+
+
+def _table():
+    from analyzer_extension import get_rules
+    return get_rules().api_table
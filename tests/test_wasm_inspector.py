@@ -0,0 +1,87 @@
+import io
+
+import pytest
+
+import wasm_inspector
+from archive_reader import ArchiveReader
+from wasm_inspector import inspect_wasm_member, inspect_wasm_stream, summarize_wasm_modules
+
+HEADER = b"\x00asm\x01\x00\x00\x00"
+
+
+def name(text):
+    data = text.encode()
+    return bytes([len(data)]) + data
+
+
+def section(section_id, payload):
+    return bytes([section_id, len(payload)]) + payload
+
+
+def module(*sections):
+    return HEADER + b"".join(sections)
+
+
+IMPORTS = section(2, b"\x02" + name("env") + name("fd_write") + b"\x00\x00"
+                  + name("env") + name("memory") + b"\x02\x00\x01")
+EXPORTS = section(7, b"\x01" + name("main") + b"\x00\x00")
+CODE = section(10, b"\x00" * 5)
+
+
+def test_inspect_wasm_stream_reads_tables_and_sizes():
+    info = inspect_wasm_stream(io.BytesIO(module(section(0, name("producers") + b"xx"), IMPORTS, EXPORTS, CODE)))
+    assert info["valid"]
+    assert info["imports"] == {"env": ["fd_write", "memory (memory)"]}
+    assert info["exports"] == ["main"]
+    assert info["custom_sections"] == ["producers"]
+    assert info["code_size"] == 5
+
+
+def test_custom_section_name_longer_than_section_is_rejected():
+    # name_len(10) 가 섹션 크기(3) 를 넘으면 뒤 섹션까지 읽어 정렬이 어긋나지 않고 오류로 처리
+    bad = module(section(0, b"\x0aab"), EXPORTS)
+    info = inspect_wasm_stream(io.BytesIO(bad))
+    assert not info["valid"]
+    assert "exceeds" in info["error"]
+
+
+def test_not_wasm():
+    assert inspect_wasm_stream(io.BytesIO(b"hello"))["valid"] is False
+
+
+@pytest.fixture
+def small_cache(monkeypatch):
+    monkeypatch.setattr(wasm_inspector, "WASM_CACHE", wasm_inspector.OrderedDict())
+    monkeypatch.setattr(wasm_inspector, "WASM_CACHE_SIZE", 2)
+    return wasm_inspector
+
+
+def test_cache_is_keyed_by_content_and_bounded(make_zip, small_cache):
+    first, second, third = module(EXPORTS), module(IMPORTS), module(CODE)
+    z = ArchiveReader(make_zip({"a.wasm": first, "b.wasm": first, "c.wasm": second, "d.wasm": third}))
+    a = inspect_wasm_member(z, z.getinfo("a.wasm"))
+    assert inspect_wasm_member(z, z.getinfo("b.wasm")) is a
+    inspect_wasm_member(z, z.getinfo("c.wasm"))
+    inspect_wasm_member(z, z.getinfo("d.wasm"))
+    assert len(small_cache.WASM_CACHE) == 2
+    assert inspect_wasm_member(z, z.getinfo("a.wasm")) is not a  # 가장 오래된 항목은 밀려남
+
+
+def test_cache_hit_does_not_inflate_member(make_zip, small_cache, monkeypatch):
+    # 크기는 같고 내용만 다른 모듈은 CRC-32 가 달라 별도 항목
+    same_size = module(section(7, b"\x01" + name("mein") + b"\x00\x00"))
+    z = ArchiveReader(make_zip({"a.wasm": module(EXPORTS), "b.wasm": module(EXPORTS), "c.wasm": same_size}))
+    a = inspect_wasm_member(z, z.getinfo("a.wasm"))
+    assert inspect_wasm_member(z, z.getinfo("c.wasm"))["exports"] == ["mein"]
+
+    def no_open(*args, **kwargs):
+        raise AssertionError("cache hit must not read the member")
+    monkeypatch.setattr(z, "open", no_open)
+    assert inspect_wasm_member(z, z.getinfo("b.wasm")) is a
+
+
+def test_summarize_wasm_modules():
+    infos = [inspect_wasm_stream(io.BytesIO(module(IMPORTS, CODE))), {"valid": False}]
+    summary = summarize_wasm_modules(infos)
+    assert summary["modules"] == 2 and summary["invalid_modules"] == 1
+    assert summary["code_size"] == 5
@@ -0,0 +1,77 @@
+import csv
+import json
+import os
+
+from conftest import SAMPLE_EXTENSIONS, build_zip, extension_files
+from results_db import ResultsDB
+from watch_mode import STATE_FILE, watch
+
+
+def run_once(corpus, output_dir, results_db=None):
+    watch(str(corpus), str(output_dir), settle=0, timeout=None, once=True, results_db=results_db)
+    with open(output_dir / "detailed_analysis.csv", newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    with open(output_dir / "aggregate.json", encoding="utf-8") as f:
+        aggregate = json.load(f)
+    return rows, aggregate
+
+
+def test_watch_replaces_rows_and_subtracts_deleted(corpus, tmp_path):
+    out = tmp_path / "out"
+    rows, aggregate = run_once(corpus, out)
+    assert sorted(row["ZIP File"] for row in rows) == sorted(SAMPLE_EXTENSIONS)
+    assert aggregate["archives"] == len(SAMPLE_EXTENSIONS)
+
+    # 같은 이름의 파일이 다른 폴더에 있으면 따로 분석
+    (corpus / "mirror").mkdir()
+    (corpus / "mirror" / "aaaa_1.0.zip").write_bytes(build_zip(SAMPLE_EXTENSIONS["aaaa_1.0.zip"]))
+    # 제자리에서 바뀐 아카이브는 이전 행을 교체
+    changed = corpus / "cccc_0.3.zip"
+    changed.write_bytes(build_zip(extension_files(["tabs"], "chrome.tabs.create({});")))
+    os.remove(corpus / "bbbb_2.1.zip")
+
+    rows, aggregate = run_once(corpus, out)
+    names = [row["ZIP File"] for row in rows]
+    assert sorted(names) == ["aaaa_1.0.zip", "cccc_0.3.zip", "dddd_5.zip", "eeee_1.2.zip", "mirror/aaaa_1.0.zip"]
+    assert json.loads(next(row for row in rows if row["ZIP File"] == "cccc_0.3.zip")["Permissions (manifest)"]) == ["tabs"]
+    assert aggregate["archives"] == 5
+    assert "cookies" not in aggregate["over_permission_counts"]
+
+    # 증분 결과가 처음부터 다시 돌린 결과와 같아야 함
+    fresh_rows, fresh_aggregate = run_once(corpus, tmp_path / "fresh")
+    assert aggregate["api_totals"] == fresh_aggregate["api_totals"]
+    assert aggregate["over_permission_counts"] == fresh_aggregate["over_permission_counts"]
+    assert sorted(map(str, rows)) == sorted(map(str, fresh_rows))
+    assert (out / "summary.csv").read_bytes() == (tmp_path / "fresh" / "summary.csv").read_bytes()
+
+    # 아무것도 바뀌지 않으면 다시 분석하지 않음
+    status_before = json.loads((out / STATE_FILE).read_text(encoding="utf-8"))["archives"]
+    rows_again, _ = run_once(corpus, out)
+    assert rows_again == rows
+    assert json.loads((out / STATE_FILE).read_text(encoding="utf-8"))["archives"] == status_before
+    assert json.loads((out / "watch_status.json").read_text(encoding="utf-8"))["analyzed"] == 0
+
+
+def test_watch_recovers_from_csv_out_of_sync(corpus, tmp_path):
+    out = tmp_path / "out"
+    run_once(corpus, out)
+    with open(out / "detailed_analysis.csv", "a", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerow(["zzzz_1.zip", "[]", "[]", "X"])  # 상태에 없는 행 (저장 도중 중단된 경우)
+    rows, aggregate = run_once(corpus, out)
+    assert sorted(row["ZIP File"] for row in rows) == sorted(SAMPLE_EXTENSIONS)
+    assert aggregate["archives"] == len(SAMPLE_EXTENSIONS)
+
+
+def test_same_name_in_category_folders_kept_apart(tmp_path):
+    corpus = tmp_path / "corpus"
+    for category, permissions in (("tools", ["tabs"]), ("social", ["cookies"])):
+        (corpus / category).mkdir(parents=True)
+        (corpus / category / "aaaa_1.0.zip").write_bytes(build_zip(extension_files(permissions, "")))
+    out = tmp_path / "out"
+    run_once(corpus, out, results_db=str(tmp_path / "results.db"))
+    rows, aggregate = run_once(corpus, out)  # 다시 읽어도 두 행이 서로 덮어쓰지 않음
+    assert {row["ZIP File"]: json.loads(row["Permissions (manifest)"]) for row in rows} == {
+        "social/aaaa_1.0.zip": ["cookies"], "tools/aaaa_1.0.zip": ["tabs"]}
+    assert aggregate["archives"] == 2
+    with ResultsDB(str(tmp_path / "results.db")) as db:
+        assert [e["zip"] for e in db.extension("aaaa")] == ["social/aaaa_1.0.zip", "tools/aaaa_1.0.zip"]
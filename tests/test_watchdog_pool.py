@@ -0,0 +1,40 @@
+import os
+import queue
+import time
+
+from watchdog_pool import STATUS_CRASHED, STATUS_OK, STATUS_TIMEOUT, WatchdogPool
+
+_STATE = {}
+
+
+def _init(prefix):
+    _STATE["prefix"] = prefix
+
+
+def _work(task):
+    if task == "slow":
+        time.sleep(30)
+    if task == "exit":
+        os._exit(1)
+    if task == "raise":
+        raise ValueError("bad task")
+    return _STATE["prefix"] + task
+
+
+def test_results_timeouts_and_crashes():
+    with WatchdogPool(_work, workers=2, timeout=1, initializer=_init, initargs=("ok-",)) as pool:
+        results = {task: (status, value) for task, status, value in pool.imap_unordered(["a", "slow", "exit", "raise", "b"])}
+        assert pool.restarts == 2
+    assert results["a"] == (STATUS_OK, "ok-a")
+    assert results["b"] == (STATUS_OK, "ok-b")
+    assert results["slow"] == (STATUS_TIMEOUT, None)
+    assert results["exit"] == (STATUS_CRASHED, None)
+    assert results["raise"] == (STATUS_CRASHED, "ValueError: bad task")
+
+
+def test_imap_queue_stops_at_sentinel():
+    tasks = queue.Queue()
+    for task in ("x", "y", None, "never"):
+        tasks.put(task)
+    with WatchdogPool(_work, workers=1, initializer=_init, initargs=("",)) as pool:
+        assert sorted(value for _, _, value in pool.imap_queue(tasks)) == ["x", "y"]